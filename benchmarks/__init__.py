@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Benchmarks of the hot paths of the library.  Each module is run from the
+root of the source tree with ``python -m``, such as
+``python -m benchmarks.suite``; see ``benchmarks/README.md``.'''
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Measures the end-to-end throughput of assessments, from the first request
+to the finished :class:`ssllabs.host.Host`, without the network.
+
+Every request is answered by a :class:`ssllabs.transport.ReplayTransport`,
+from a recording taken with :class:`ssllabs.transport.RecordTransport` or
+from a synthetic one, and every host of it is run through a
+:class:`ssllabs.scheduler.Scheduler` that never waits between polls.  Unless
+a latency is simulated, what is left is the time spent by the client itself:
+building requests, decoding responses, and scheduling.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+from collections import OrderedDict
+import io
+import json
+import time
+
+from ssllabs.client import Client
+from ssllabs.polling import Polling
+from ssllabs.scheduler import Scheduler
+from ssllabs.transport import ReplayTransport
+
+from benchmarks.payloads import recording
+
+#: The ways hosts are analyzed, as keyword arguments of
+#: :meth:`ssllabs.client.Client.analyze`
+MODES = OrderedDict((
+    ('plain', {}),
+    ('stream', {'stream': True}),
+    ('skip sims and PEM', {'skip': ['details.sims', 'details.chain.certs.raw']}),
+    ('grade fields only', {'fields': ['grade', 'gradeTrustIgnored', 'details.cert.notAfter']}),
+    ))
+
+def hosts(exchanges):
+    '''The hosts whose assessments are started in a recording, in order.'''
+    return [exchange['query']['host'] for exchange in exchanges if exchange['endpoint'] == 'analyze' and exchange['query'].get('startNew') == 'on']
+
+def run(exchanges, names, latency=0, **kwargs):
+    '''Runs an assessment of every host against a recording.
+
+    :returns: the time taken, in seconds
+    :rtype: float
+    '''
+    client = Client(transport=ReplayTransport(exchanges, latency=latency))
+    scheduler = Scheduler(client, polling=Polling(0, 0), sleep=lambda seconds: None)
+    start = time.time()
+    for name, result in scheduler.run(names, **kwargs):
+        if isinstance(result, Exception):
+            raise result
+    return time.time() - start
+
+def measure(path=None, count=200, latency=0, rounds=3):
+    '''Measures the end-to-end throughput of every mode, as the best of a
+    number of rounds.
+
+    :returns: the hosts finished per second in each mode, by name
+    :rtype: collections.OrderedDict
+    '''
+    if path is None:
+        exchanges, names = recording(count)
+    else:
+        with io.open(path, 'r', encoding='utf-8') as file:
+            exchanges = [json.loads(line) for line in file if line.strip()]
+        names = hosts(exchanges)[:count]
+
+    results = OrderedDict()
+    for mode, kwargs in MODES.items():
+        results[mode] = len(names) / min(run(exchanges, names, latency, **kwargs) for _ in range(rounds))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the end-to-end throughput of ssllabs.client.Client.analyze against a replayed recording')
+    parser.add_argument('-r', '--recording', help='A recording taken with ssllabs.transport.RecordTransport; a synthetic one is used if not set')
+    parser.add_argument('-n', '--hosts', help='The number of hosts to analyze (default %(default)s)', type=int, default=200)
+    parser.add_argument('-l', '--latency', help='The simulated latency of every request, in seconds (default %(default)s)', type=float, default=0)
+    parser.add_argument('-R', '--rounds', help='The number of rounds, of which the fastest is reported (default %(default)s)', type=int, default=3)
+    args = parser.parse_args()
+
+    for mode, rate in measure(args.recording, args.hosts, args.latency, args.rounds).items():
+        print('{:24} {:12.1f} hosts/s'.format(mode, rate))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Load tests scheduling, retries and connection reuse against a local
+:class:`ssllabs.stub.Stub`.
+
+Every host is assessed through one :class:`ssllabs.scheduler.Scheduler`,
+with as many assessments running at once as the stub allows, while the stub
+injects 503 and 529 responses that the client retries with short backoffs.
+Reported are the throughput, the requests and connections the stub saw, and
+the retries the client made.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+import time
+
+from ssllabs import errors
+from ssllabs.client import Client
+from ssllabs.polling import Polling
+from ssllabs.retry import Backoff, Retry
+from ssllabs.scheduler import Scheduler
+from ssllabs.stub import Stub
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test ssllabs.scheduler.Scheduler against a local stub of the API')
+    parser.add_argument('-n', '--hosts', help='The number of hosts to analyze (default %(default)s)', type=int, default=2000)
+    parser.add_argument('-m', '--max-assessments', help='The number of assessments the stub runs at once (default %(default)s)', type=int, default=1000)
+    parser.add_argument('-d', '--duration', help='The time each assessment takes, in seconds (default %(default)s)', type=float, default=5.0)
+    parser.add_argument('-i', '--interval', help='The time between polls of each assessment, in seconds (default %(default)s)', type=float, default=1.0)
+    parser.add_argument('-e', '--errors', help='The fraction of requests the stub fails, half with 503 and half with 529 (default %(default)s)', type=float, default=0.01)
+    parser.add_argument('--sims', help='The number of handshake simulations of each endpoint (default %(default)s)', type=int, default=60)
+    args = parser.parse_args()
+
+    stub = Stub(maxAssessments=args.max_assessments, cooloff=0, dns=0, duration=args.duration, sims=args.sims, unavailable=args.errors / 2, overloaded=args.errors / 2, seed=0).start()
+    retry = Retry({
+        errors.RequestRate: Backoff(tries=8, base=0.1, cap=1),
+        errors.ServiceNotAvailable: Backoff(tries=8, base=0.1, cap=1),
+        errors.ServiceOverloaded: Backoff(tries=8, base=0.1, cap=1),
+        })
+    scheduler = Scheduler(Client(stub.url, retry=retry), polling=Polling(args.interval, args.interval), ratewait=0.1)
+
+    start = time.time()
+    finished = 0
+    failed = 0
+    for host, result in scheduler.run('host{}.example.com'.format(i) for i in range(args.hosts)):
+        if isinstance(result, Exception):
+            failed += 1
+        else:
+            finished += 1
+    elapsed = time.time() - start
+    stub.stop()
+
+    print('{:16} {:10}'.format('hosts finished', finished))
+    print('{:16} {:10}'.format('hosts failed', failed))
+    print('{:16} {:10.1f} hosts/s'.format('throughput', args.hosts / elapsed))
+    print('{:16} {:10}'.format('requests', stub.requests))
+    print('{:16} {:10}'.format('connections', stub.connections))
+    print('{:16} {:10}'.format('retries', retry.retries))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Measures the memory taken by a snapshot of many finished hosts.
+
+The hosts are loaded from a directory of recorded analyze results (one JSON
+file per host), or synthesized if none is given.  Reported are the bytes per
+host of the decoded JSON alone, of the model objects with everything decoded
+and the raw data kept, and of the same objects after
+:meth:`ssllabs.object.Object.compact`, if this tree has it.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+from collections import OrderedDict
+import gc
+import tracemalloc
+
+from ssllabs.host import Host
+from ssllabs.object import Object
+
+from benchmarks.payloads import load
+
+def decode(obj):
+    '''Reads every property of an object and the objects nested in it, so
+    that nothing is left undecoded.'''
+    for name in dir(type(obj)):
+        if name != 'rawdata' and isinstance(getattr(type(obj), name), property):
+            value = getattr(obj, name)
+            for item in (value if isinstance(value, list) else (value,)):
+                if isinstance(item, Object) or type(item).__module__.startswith('ssllabs.'):
+                    decode(item)
+
+def used(start):
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - start
+
+def measure(directory=None, count=10000):
+    '''Measures the memory taken by hosts.
+
+    :returns: the bytes per host of each form, by name
+    :rtype: collections.OrderedDict
+    '''
+    tracemalloc.start()
+    try:
+        start = used(0)
+
+        raw = load(directory, count)
+        count = len(raw)
+        rawsize = used(start)
+
+        hosts = [Host(data) for data in raw]
+        for host in hosts:
+            decode(host)
+        fullsize = used(start)
+
+        results = OrderedDict()
+        results['decoded JSON'] = rawsize / count
+        results['objects with raw data'] = fullsize / count
+        results['objects alone'] = (fullsize - rawsize) / count
+
+        if hasattr(Object, 'compact'):
+            del raw
+            for host in hosts:
+                host.compact()
+            results['objects after compact()'] = used(start) / count
+        return results
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the memory taken by ssllabs.host.Host objects')
+    parser.add_argument('-d', '--directory', help='A directory of recorded analyze results, one JSON file per host; synthetic results are used if not set')
+    parser.add_argument('-n', '--hosts', help='The number of hosts to load (default %(default)s)', type=int, default=10000)
+    args = parser.parse_args()
+
+    for name, size in measure(args.directory, args.hosts).items():
+        print('{:32} {:12.0f} bytes/host'.format(name, size))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Measures how fast finished analyze results are parsed.
+
+Each result is parsed from its JSON text: by :func:`json.loads` alone, into
+a :class:`ssllabs.host.Host` that is then decoded completely with
+:meth:`ssllabs.object.Object.compact`, and into a :class:`ssllabs.host.Host`
+built with only the fields a grade check needs.
+The details of each endpoint are also parsed on their own into
+:class:`ssllabs.endpointdetails.EndpointDetails`.  Reported is the best of a
+number of rounds.
+
+What streaming with :class:`ssllabs.stream.Stream` is meant to buy is
+measured too, against joining the body and decoding it with
+:func:`json.loads`: the latency until the first endpoint of a host is
+decoded, as the body arrives in chunks over a link of a given bandwidth,
+and the peak memory taken while decoding a whole body.  The transfer time
+is added up rather than slept, so the latency is the time spent decoding
+plus the time the bytes read so far would take to arrive.  The peak memory
+needs Python 3.4 or newer, for :mod:`tracemalloc`.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+from collections import OrderedDict
+import json
+import time
+
+from ssllabs.client import CHUNKSIZE
+from ssllabs.endpointdetails import EndpointDetails
+from ssllabs.host import Host
+from ssllabs.stream import Stream
+
+from benchmarks.payloads import load
+
+#: The fields built by the projected parse
+FIELDS = ('grade', 'gradeTrustIgnored', 'details.cert.notAfter')
+
+#: The parts of each endpoint left out by the streamed parse with skip
+SKIP = ('details.sims', 'details.chain.certs.raw')
+
+
+clock = time.perf_counter if hasattr(time, 'perf_counter') else time.time
+
+def best(function, rounds):
+    '''The shortest time a function takes, in seconds.'''
+    times = []
+    for _ in range(rounds):
+        start = clock()
+        function()
+        times.append(clock() - start)
+    return min(times)
+
+def _joined(chunks):
+    return json.loads(b''.join(chunks).decode('utf-8'))
+
+#: The ways a body is decoded by the streaming benchmark, as functions
+#: taking an iterator of its chunks and returning an iterator of its
+#: endpoints, which are all decoded once the iterator is done
+DECODERS = OrderedDict((
+    ('json.loads', lambda chunks: iter(_joined(chunks).get('endpoints', ()))),
+    ('Stream', lambda chunks: iter(Stream(chunks))),
+    ('Stream, skip sims and PEM', lambda chunks: iter(Stream(chunks, SKIP))),
+    ))
+
+def _first(chunks, decode, bandwidth):
+    '''The time until the first endpoint of a body is decoded, in seconds.'''
+    transfer = [0]
+
+    def arriving():
+        for chunk in chunks:
+            transfer[0] += len(chunk) / bandwidth
+            yield chunk
+
+    start = clock()
+    next(decode(arriving()), None)
+    return clock() - start + transfer[0]
+
+def _peak(chunks, decode):
+    '''The most memory taken at once while decoding a whole body, in
+    bytes, the decoded endpoints included.'''
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        endpoints = list(decode(iter(chunks)))
+        peak = tracemalloc.get_traced_memory()[1]
+        del endpoints
+        return peak
+    finally:
+        tracemalloc.stop()
+
+def streaming(directory=None, count=100, bandwidth=2e6, chunksize=CHUNKSIZE, endpoints=2):
+    '''Measures the first-endpoint latency and peak memory of decoding the
+    bodies of hosts whole and streamed.
+
+    :param float bandwidth: The speed the body arrives at, in bytes per second
+    :param int chunksize: The size of the chunks the body arrives in, in bytes
+    :param int endpoints: The number of endpoints of each synthetic host
+    :returns: the mean latency in milliseconds, and the mean peak memory in bytes, of each decoder, by name
+    :rtype: tuple
+    '''
+    bodies = [json.dumps(data).encode('utf-8') for data in load(directory, count, endpoints=endpoints)]
+    bodies = [[body[start:start + chunksize] for start in range(0, len(body), chunksize)] for body in bodies]
+
+    latency = OrderedDict()
+    memory = OrderedDict()
+    for name, decode in DECODERS.items():
+        latency[name] = sum(_first(chunks, decode, bandwidth) for chunks in bodies) / len(bodies) * 1000
+        try:
+            memory[name] = sum(_peak(chunks, decode) for chunks in bodies) / len(bodies)
+        except ImportError:
+            pass
+    return latency, memory
+
+def measure(directory=None, count=1000, rounds=5):
+    '''Measures the parse throughput of hosts.
+
+    :returns: the hosts (or endpoint details) parsed per second of each form, by name
+    :rtype: collections.OrderedDict
+    '''
+    texts = [json.dumps(data) for data in load(directory, count)]
+    details = [json.dumps(endpoint['details']) for text in texts for endpoint in json.loads(text).get('endpoints', ()) if 'details' in endpoint]
+
+    def full():
+        for text in texts:
+            Host(json.loads(text)).compact()
+
+    def projected():
+        for text in texts:
+            host = Host(json.loads(text), fields=FIELDS)
+            for endpoint in host.endpoints:
+                endpoint.details.cert.notAfter
+
+    def endpointdetails():
+        for text in details:
+            EndpointDetails(json.loads(text)).compact()
+
+    results = OrderedDict()
+    results['json.loads'] = len(texts) / best(lambda: [json.loads(text) for text in texts], rounds)
+    results['Host, everything decoded'] = len(texts) / best(full, rounds)
+    results['Host, grade fields only'] = len(texts) / best(projected, rounds)
+    if details:
+        results['EndpointDetails, everything decoded'] = len(details) / best(endpointdetails, rounds)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parse throughput of ssllabs.host.Host and ssllabs.endpointdetails.EndpointDetails')
+    parser.add_argument('-d', '--directory', help='A directory of recorded analyze results, one JSON file per host; synthetic results are used if not set')
+    parser.add_argument('-n', '--hosts', help='The number of hosts to parse (default %(default)s)', type=int, default=1000)
+    parser.add_argument('-r', '--rounds', help='The number of rounds, of which the fastest is reported (default %(default)s)', type=int, default=5)
+    parser.add_argument('-b', '--bandwidth', help='The speed response bodies arrive at in the streaming benchmark, in bytes per second (default %(default)s)', type=float, default=2e6)
+    parser.add_argument('-e', '--endpoints', help='The number of endpoints of each synthetic host in the streaming benchmark (default %(default)s)', type=int, default=2)
+    args = parser.parse_args()
+
+    for name, rate in measure(args.directory, args.hosts, args.rounds).items():
+        print('{:36} {:12.0f} /s'.format(name, rate))
+    latency, memory = streaming(args.directory, args.hosts, args.bandwidth, endpoints=args.endpoints)
+    for name, milliseconds in latency.items():
+        print('{:36} {:12.2f} ms to the first endpoint'.format(name, milliseconds))
+    for name, size in memory.items():
+        print('{:36} {:12.0f} bytes peak per host'.format(name, size))
+
+if __name__ == '__main__':
+    main()
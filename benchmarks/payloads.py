@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Synthetic analyze results, shaped like real ``all=done`` responses, and
+synthetic recordings of whole assessments, for benchmarking without recorded
+data.  The results themselves are built by :func:`ssllabs.stub.host`.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import io
+import json
+import os
+
+from ssllabs.stub import host
+
+def load(path=None, count=10000, **kwargs):
+    '''Loads recorded host results, one JSON file each, from a directory, or
+    builds synthetic ones if no directory is given.
+
+    :param str path: The directory of recorded results
+    :param int count: The number of results to load or build
+    :param kwargs: Other arguments passed to :func:`ssllabs.stub.host` for synthetic results
+    :returns: the raw data of each host
+    :rtype: list
+    '''
+    if path is None:
+        # Round-tripped through JSON, so that nothing is shared between hosts
+        # that wouldn't be shared in decoded responses
+        return [json.loads(json.dumps(host(index, **kwargs))) for index in range(count)]
+
+    data = []
+    for name in sorted(os.listdir(path))[:count]:
+        with io.open(os.path.join(path, name), 'r', encoding='utf-8') as file:
+            data.append(json.load(file))
+    return data
+
+def exchange(endpoint, query, body, maxAssessments=25, currentAssessments=0):
+    '''Builds one exchange of a recording, as read by
+    :class:`ssllabs.transport.ReplayTransport`.'''
+    return {
+        'endpoint': endpoint,
+        'query': query,
+        'status': 200,
+        'reason': 'OK',
+        'headers': {
+            'Content-Type': 'application/json',
+            'X-Max-Assessments': str(maxAssessments),
+            'X-Current-Assessments': str(currentAssessments),
+            },
+        'body': json.dumps(body),
+        }
+
+def recording(count=100, polls=3, **kwargs):
+    '''Builds a recording of the info and getStatusCodes calls and of a new
+    assessment of each of a number of hosts, as made by
+    :class:`ssllabs.client.Client` with its default arguments.
+
+    :param int count: The number of hosts
+    :param int polls: The number of responses of each assessment that are still in progress, the first of which answers the request that starts it
+    :param kwargs: Other arguments passed to :func:`host`
+    :returns: the exchanges, and the names of the hosts
+    :rtype: tuple
+    '''
+    exchanges = [
+        exchange('info', {}, {'engineVersion': '1.30.8', 'criteriaVersion': '2009p', 'maxAssessments': 25, 'currentAssessments': 0, 'newAssessmentCoolOff': 0, 'messages': []}),
+        exchange('getStatusCodes', {}, {'statusDetails': {'TESTING_PROTOCOL_INTOLERANCE_399': 'Testing Protocol Intolerance (TLS 1.152)'}}),
+        ]
+    names = []
+    for index in range(count):
+        data = host(index, **kwargs)
+        name = data['host']
+        names.append(name)
+        query = {'host': name, 'all': 'done'}
+        for poll in range(polls + 1):
+            if poll < polls:
+                body = {
+                    'host': name,
+                    'port': 443,
+                    'protocol': 'HTTP',
+                    'isPublic': False,
+                    'status': 'IN_PROGRESS',
+                    'startTime': data['startTime'],
+                    'engineVersion': data['engineVersion'],
+                    'criteriaVersion': data['criteriaVersion'],
+                    'endpoints': [{
+                        'ipAddress': endpoint['ipAddress'],
+                        'serverName': endpoint['serverName'],
+                        'statusMessage': 'In progress',
+                        'statusDetails': 'TESTING_PROTOCOL_INTOLERANCE_399',
+                        'statusDetailsMessage': 'Testing Protocol Intolerance (TLS 1.152)',
+                        'progress': 100 * poll // polls,
+                        'eta': 30,
+                        'delegation': 1,
+                        } for endpoint in data['endpoints']],
+                    }
+            else:
+                body = data
+            exchanges.append(exchange('analyze', dict(query, startNew='on') if poll == 0 else query, body))
+    return exchanges, names
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Compares a keep-alive pooled session against one connection per request.
+
+A small stub of the API is started on localhost, which counts every accepted
+connection.  Against the real API over HTTPS, every one of these connections
+is a TCP and a TLS handshake.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+import json
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+from ssllabs.client import Client
+from ssllabs.transport import newsession
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, polls):
+        BaseHTTPServer.HTTPServer.__init__(self, address, Handler)
+        self.polls = polls
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def get_request(self):
+        request = BaseHTTPServer.HTTPServer.get_request(self)
+        with self.lock:
+            self.connections += 1
+        return request
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.endswith('/info'):
+            data = {'version': 'stub', 'maxAssessments': 25, 'currentAssessments': 0, 'newAssessmentCoolOff': 1000}
+        else:
+            # Every host is reported in progress a fixed number of times
+            with self.server.lock:
+                self.server.polls -= 1
+                status = 'IN_PROGRESS' if self.server.polls % 10 else 'READY'
+            data = {'host': 'example.com', 'status': status, 'endpoints': [{'ipAddress': '127.0.0.1', 'progress': 50}]}
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.headers.get('Connection', '').lower() == 'close':
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def run(hosts, keepalive):
+    server = Server(('127.0.0.1', 0), hosts * 10)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    client = Client('http://127.0.0.1:{}/api/v2'.format(server.server_address[1]), session=newsession(keepalive=keepalive))
+    start = time.time()
+    client.info()
+    for host in range(hosts):
+        for data in client.analyze('example.com'):
+            pass
+    elapsed = time.time() - start
+
+    server.shutdown()
+    server.server_close()
+    return server.connections, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark connection reuse of ssllabs.client.Client against a local stub server')
+    parser.add_argument('-n', '--hosts', help='The number of hosts to analyze (default %(default)s)', type=int, default=200)
+    args = parser.parse_args()
+
+    requests = args.hosts * 10 + 1
+    for name, keepalive in (('per-request', False), ('pooled', True)):
+        connections, elapsed = run(args.hosts, keepalive)
+        print('{:12} {:6} requests {:6} connections {:8.3f}s {:8.3f}ms/request'.format(name, requests, connections, elapsed, elapsed * 1000 / requests))
+
+if __name__ == '__main__':
+    main()
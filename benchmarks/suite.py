@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Runs the parse, end-to-end and memory benchmarks together, to catch
+regressions in the hot paths.
+
+The results may be saved as a baseline, and later runs compared against it;
+any result that is worse than the baseline by more than the tolerance is
+reported, and makes the suite exit with 1::
+
+    python -m benchmarks.suite --save baseline.json
+    # ... change things ...
+    python -m benchmarks.suite --compare baseline.json
+'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+from collections import OrderedDict
+import io
+import json
+import sys
+
+from benchmarks import analyze, memory, parse
+
+def measure(count):
+    '''Runs every benchmark.
+
+    :param int count: The number of hosts each benchmark works through
+    :returns: each result by name, as a (value, unit, higher is better) tuple
+    :rtype: collections.OrderedDict
+    '''
+    results = OrderedDict()
+    for name, rate in parse.measure(count=count).items():
+        results['parse: ' + name] = (rate, '/s', True)
+    latency, peak = parse.streaming(count=min(count, 100))
+    for name, milliseconds in latency.items():
+        results['first endpoint: ' + name] = (milliseconds, 'ms', False)
+    for name, size in peak.items():
+        results['peak: ' + name] = (size, 'bytes/host', False)
+    for name, rate in analyze.measure(count=count).items():
+        results['analyze: ' + name] = (rate, 'hosts/s', True)
+    for name, size in memory.measure(count=count).items():
+        results['memory: ' + name] = (size, 'bytes/host', False)
+    return results
+
+def compare(results, baseline, tolerance):
+    '''Finds the results that are worse than their baseline by more than the
+    tolerance.
+
+    :returns: the names of the regressed results
+    :rtype: list
+    '''
+    regressions = []
+    for name, (value, unit, higher) in results.items():
+        if name not in baseline:
+            continue
+        change = (value - baseline[name]) / baseline[name]
+        if (-change if higher else change) > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Run every ssllabs benchmark, optionally comparing against a saved baseline')
+    parser.add_argument('-n', '--hosts', help='The number of hosts each benchmark works through (default %(default)s)', type=int, default=500)
+    parser.add_argument('-s', '--save', help='Save the results as a baseline to this file')
+    parser.add_argument('-c', '--compare', help='Compare the results against the baseline in this file')
+    parser.add_argument('-t', '--tolerance', help='The fraction a result may be worse than its baseline before it counts as a regression (default %(default)s)', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = measure(args.hosts)
+
+    baseline = {}
+    if args.compare is not None:
+        with io.open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline, args.tolerance)
+
+    for name, (value, unit, higher) in results.items():
+        line = '{:48} {:14.1f} {:10}'.format(name, value, unit)
+        if name in baseline:
+            line += ' {:+7.1%}'.format((value - baseline[name]) / baseline[name])
+        if name in regressions:
+            line += '  REGRESSION'
+        print(line)
+
+    if args.save is not None:
+        with io.open(args.save, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(OrderedDict((name, value) for name, (value, unit, higher) in results.items()), indent=4))
+
+    if regressions:
+        print('{} of {} results regressed by more than {:.0%}'.format(len(regressions), len(results), args.tolerance), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
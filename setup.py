@@ -20,6 +20,8 @@ setup(
     entry_points={
         'console_scripts': [
             'ssllabs-gradecheck = ssllabs.__main__:gradecheck',
+            'ssllabs-rescan = ssllabs.rescan:main',
+            'ssllabs-stub = ssllabs.stub:main',
             ]
         },
     packages=[
@@ -30,7 +32,13 @@ setup(
         'requests',
         'enum34',
         'tqdm',
+        'futures; python_version < "3"',
         ],
+    extras_require={
+        'aio': ['aiohttp'],
+        'opentelemetry': ['opentelemetry-api'],
+        'prometheus': ['prometheus_client'],
+        },
     classifiers=[
         'Intended Audience :: Developers',
         'Intended Audience :: System Administrators',
@@ -6,9 +6,11 @@
 from __future__ import division, absolute_import, print_function, unicode_literals
 
 import argparse
+import csv
+import io
+import json
 import locale
 import six
-from time import sleep
 import sys
 from datetime import timedelta, datetime
 
@@ -16,56 +18,165 @@ from tqdm import tqdm
 
 from ssllabs.__init__ import __version__
 from ssllabs.client import Client
-
-__GRADE = (
-    'A+', 'A', 'A-',
-    'B+', 'B', 'B-',
-    'C+', 'C', 'C-',
-    'D+', 'D', 'D-',
-    'E+', 'E', 'E-',
-    'F+', 'F', 'F-',
-    'T', 'M', 'EMPTY',
-    )
+from ssllabs.policy import GRADES, Policy, load
+from ssllabs.polling import AdaptivePolling
+from ssllabs.scheduler import Scheduler
+from ssllabs.util import readhosts
 
 def parsegrade(string):
-    return __GRADE.index(string)
+    if string not in GRADES:
+        raise ValueError('Unknown grade: {}'.format(string))
+    return string
 
 def average(numbers):
     return int(float(sum(numbers)) / max(len(numbers), 1))
 
+def record(name, result, policy):
+    '''Builds the machine-readable result of one host, as a dict.'''
+    if isinstance(result, Exception):
+        return {
+            'host': name,
+            'result': 'error',
+            'grade': None,
+            'expires': None,
+            'daysleft': None,
+            'reasons': None,
+            'error': '{}: {}'.format(type(result).__name__, result),
+            }
+    verdict = policy.check(result)
+    return {
+        'host': name,
+        'result': 'pass' if verdict.passed else 'fail',
+        'grade': verdict.grade,
+        'expires': verdict.expires.isoformat() if verdict.expires is not None else None,
+        'daysleft': (verdict.expires - datetime.utcnow()).days if verdict.expires is not None else None,
+        'reasons': verdict.reasons,
+        'error': None,
+        }
+
+class Writer(object):
+    '''Writes per-host records as JSON Lines or CSV.'''
+
+    FIELDS = ('host', 'result', 'grade', 'expires', 'daysleft', 'reasons', 'error')
+
+    def __init__(self, file, format):
+        self.__file = file
+        self.__format = format
+        if format == 'csv':
+            self.__writer = csv.DictWriter(file, self.FIELDS)
+            self.__writer.writeheader()
+
+    def write(self, record):
+        if self.__format == 'csv':
+            self.__writer.writerow(dict(record, reasons='; '.join(record['reasons'] or ())))
+        else:
+            self.__file.write(json.dumps(record, sort_keys=True) + '\n')
+        self.__file.flush()
+
+def fleetcheck(c, hosts, args, policy, writer):
+    '''Checks many hosts at once, as many as the API allows, with a single
+    progress bar for all of them.
+
+    :returns: the exit code: 0 if every host passed, 1 if any failed, or 2 if any couldn't be assessed
+    '''
+    counts = {'pass': 0, 'fail': 0, 'error': 0}
+    scheduler = Scheduler(c, polling=AdaptivePolling())
+
+    progress = tqdm(desc='hosts', total=len(hosts), unit='host', disable=args.quiet)
+    try:
+        for name, result in scheduler.run(hosts, fields=policy.fields, lightweight=True):
+            data = record(name, result, policy)
+            counts[data['result']] += 1
+            writer.write(data)
+            progress.update(1)
+            progress.set_postfix(counts)
+    finally:
+        progress.close()
+
+    if not args.quiet:
+        print('{pass} passed, {fail} failed, {error} errors'.format(**counts), file=sys.stderr)
+
+    if counts['error']:
+        return 2
+    if counts['fail']:
+        return 1
+    return 0
+
 def gradecheck():
     locale.setlocale(locale.LC_ALL, '')
-    parser = argparse.ArgumentParser(description='Do a grade check of a server.  For multi-endpoint setups, the worst grade of the cluster will be considered.  Exits 0 for a passing grade, and 1 for a failing grade.  By using this tool, you are bound by the SSL Labs terms of use: https://www.ssllabs.com/about/terms.html.  This program sends data through the SSL Labs remote servers.')
+    parser = argparse.ArgumentParser(description='Do a grade check of a server, or of a list of servers.  For multi-endpoint setups, the worst grade of the cluster will be considered.  Exits 0 for a passing grade, and 1 for a failing grade.  With a list of servers, they are checked at once, as many as the API allows, and the exit code is 0 if all of them passed, 1 if any failed, and 2 if any could not be checked.  By using this tool, you are bound by the SSL Labs terms of use: https://www.ssllabs.com/about/terms.html.  This program sends data through the SSL Labs remote servers.')
     parser.add_argument('-V', '--version', action='version', version=__version__)
     parser.add_argument('-g', '--grade', help='The minimum acceptable grade (default %(default)s)', type=parsegrade, default='A+')
+    parser.add_argument('-p', '--policy', help='A JSON file of the rules to check, as described for ssllabs.policy, in place of the grade, trust, empty and expiry options')
     parser.add_argument('-T', '--ignoretrust', help='If this is set, Trust will be ignored and the trust-ignored grade will be used', action='store_true')
     parser.add_argument('-e', '--allowempty', help='If this is set, a test with 0 endpoints will be considered successful, rather than always unsuccessful', action='store_true')
     parser.add_argument('-x', '--expiretime', help='If this is set, set a time to warn for soon expiry (must be a number in days)', type=lambda s: timedelta(int(s)))
+    parser.add_argument('-f', '--file', help='A file listing the hosts to check, one per line, or - for stdin')
+    parser.add_argument('-o', '--output', help='Write a machine-readable result for each host to this file, or - for stdout; hosts checked from a list are written to stdout if not set')
+    parser.add_argument('-F', '--format', help='The format of the results (default jsonl, or csv if the output file name ends in .csv)', choices=('jsonl', 'csv'))
     group = parser.add_mutually_exclusive_group()
     #group.add_argument('-v', '--verbose', help='More output', action='store_true')
     group.add_argument('-q', '--quiet', help='Less output', action='store_true')
-    parser.add_argument('host', help='The host to check')
+    parser.add_argument('host', help='The host to check', nargs='?')
 
     args = parser.parse_args()
 
-    grade = None
-    expiretime = None
+    hosts = []
+    if args.file is not None:
+        hosts.extend(readhosts(args.file))
+    if args.host is not None:
+        hosts.append(args.host)
+    if not hosts:
+        parser.error('a host or a file of hosts is required')
+
+    if args.policy is not None:
+        try:
+            policy = load(args.policy)
+        except (IOError, ValueError) as e:
+            parser.error('could not load policy {}: {}'.format(args.policy, e))
+    else:
+        policy = Policy(grade=args.grade, ignoreTrust=args.ignoretrust, allowEmpty=args.allowempty, expiry=args.expiretime.days if args.expiretime is not None else None)
+
+    fleet = args.file is not None
+    output = args.output
+    if output is None and fleet:
+        output = '-'
+    format = args.format
+    if format is None:
+        format = 'csv' if output is not None and output.endswith('.csv') else 'jsonl'
+
+    writer = None
+    outfile = None
+    if output is not None:
+        outfile = sys.stdout if output == '-' else io.open(output, 'w', encoding='utf-8', newline='' if six.PY3 else None)
+        writer = Writer(outfile, format)
 
     c = Client()
 
     if not args.quiet:
         messagelist = '\n'.join(c.info().messages)
         if messagelist:
-            print(messagelist)
-            print()
-
+            print(messagelist, file=sys.stderr if fleet else sys.stdout)
+            print(file=sys.stderr if fleet else sys.stdout)
+
+    try:
+        if fleet:
+            return fleetcheck(c, hosts, args, policy, writer)
+        return hostcheck(c, hosts[0], args, policy, writer)
+    finally:
+        if outfile is not None and outfile is not sys.stdout:
+            outfile.close()
+
+def hostcheck(c, host, args, policy, writer):
+    '''Checks a single host, with a progress bar for each endpoint.
+
+    :returns: the exit code: 0 if the host passed, or 1 if it failed
+    '''
     progress = None
     endpoints = list()
 
-    for data in c.analyze(args.host):
-        if data.status == 'DNS':
-            sleep(1)
-        else:
+    for data in c.analyze(host, polling=AdaptivePolling(), lightweight=True):
+        if data.status != 'DNS':
             if not args.quiet:
                 if progress is None:
                     progress = [0, tqdm(desc="full scan", total=100, unit='%')]
@@ -82,7 +193,6 @@ def gradecheck():
                 diff = newaverage - progress[0]
                 progress[1].update(diff)
                 progress[0] = newaverage
-            sleep(3)
 
     if progress is not None:
         progress[1].close()
@@ -90,39 +200,24 @@ def gradecheck():
         endpoint[1].close()
 
     data = c.host
+    verdict = policy.check(data)
 
-    getgrade = lambda endpoint: parsegrade(endpoint.gradeTrustIgnored if args.ignoretrust else endpoint.grade)
-
-    for endpoint in data.endpoints:
-        if endpoint.grade is not None:
-            endpointgrade = getgrade(endpoint)
-            endpointexpiretime = endpoint.details.cert.notAfter
-            if grade is None or grade < endpointgrade:
-                grade = endpointgrade
-            if expiretime is None or expiretime > endpointexpiretime:
-                expiretime = endpointexpiretime
-
-    timeleft = expiretime - datetime.utcnow()
-
-    if grade is None:
-        if args.allowempty:
-            grade = parsegrade('A+')
-        else:
-            grade = parsegrade('EMPTY')
+    if writer is not None:
+        writer.write(record(host, data, policy))
 
     if not args.quiet:
-        print('Needed grade of {}, got grade of {}'.format(__GRADE[args.grade], __GRADE[grade]))
+        print('Needed grade of {}, got grade of {}'.format(policy.grade, verdict.grade))
 
-        if args.expiretime is not None:
-            print('Needed expire time at least {.days} days away, {.days} days left, expiring on {:%c}'.format(args.expiretime, timeleft, expiretime))
+        if policy.expiry is not None and verdict.expires is not None:
+            timeleft = verdict.expires - datetime.utcnow()
+            print('Needed expire time at least {} days away, {.days} days left, expiring on {:%c}'.format(policy.expiry, timeleft, verdict.expires))
 
-    if grade > args.grade:
-        return 1
-
-    if args.expiretime is not None and timeleft <= args.expiretime:
-        return 1
+        for reason in verdict.reasons:
+            print(reason)
 
-    return 0
+    if verdict.passed:
+        return 0
+    return 1
 
 if __name__ == '__main__':
     sys.exit(gradecheck())
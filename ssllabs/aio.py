@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''An asyncio version of :class:`ssllabs.client.Client`.
+
+This module needs Python 3.5 or newer and the aiohttp package, which may be
+installed with the ``aio`` extra (``pip install ssllabs[aio]``).'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import asyncio
+import json
+
+import aiohttp
+
+from ssllabs import errors
+from ssllabs.host import Host
+from ssllabs.info import Info
+from ssllabs.polling import Polling
+from ssllabs.statuscodes import StatusCodes
+
+class AsyncClient(object):
+    '''A client that runs every API call on non-blocking HTTP.
+
+    It mirrors :class:`ssllabs.client.Client`, returning the same objects,
+    but every call is a coroutine, and :meth:`analyze` does its own waiting
+    between polls, so that many assessments can run in the same event loop.
+
+    The client should be closed when done, either by calling :meth:`close` or
+    by using it as an async context manager::
+
+        async with AsyncClient() as client:
+            hosts = await client.analyze_many(['example.com', 'example.org'])
+    '''
+
+    def __init__(self, entrypoint='https://api.ssllabs.com/api/v2', session=None, timeout=None, polling=None, retry=None, pool=None):
+        '''initializes the client object.
+
+        :param str entrypoint: The entrypoint URL for the API; usually shouldn't be changed
+        :param aiohttp.ClientSession session: The session used for every request.  If not set, one is opened on the first request and closed by :meth:`close`.
+        :param float timeout: The total timeout for every request, in seconds.  None waits forever.
+        :param ssllabs.polling.Polling polling: The policy deciding how long to wait between polls of each assessment; a fixed :class:`ssllabs.polling.Polling` if not set
+        :param ssllabs.retry.Retry retry: The retry engine deciding which failed requests are retried.  If not set, every error is raised at once.
+        :param ssllabs.pool.ParsePool pool: A pool of processes that analyze responses larger than its threshold are decoded in, so that decoding them doesn't hold up the event loop.  The hosts returned are built as the pool says, with its skip, fields and compact settings.
+        '''
+        self.__entrypoint = entrypoint.rstrip('/')
+        self.__session = session
+        self.__ownsession = session is None
+        self.__timeout = aiohttp.ClientTimeout(total=timeout)
+        self.__polling = polling if polling is not None else Polling()
+        self.__retry = retry
+        self.__pool = pool
+        self.__started = None
+        self.__startlock = None
+
+    @property
+    def entrypoint(self):
+        '''Returns the entrypoint URL.'''
+        return self.__entrypoint
+
+    @property
+    def retry(self):
+        '''The :class:`ssllabs.retry.Retry` engine, or None'''
+        return self.__retry
+
+    @property
+    def pool(self):
+        '''The :class:`ssllabs.pool.ParsePool`, or None'''
+        return self.__pool
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.close()
+
+    async def close(self):
+        '''Closes the session, if it was opened by this client.'''
+        if self.__ownsession and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __get(self, endpoint, query=None, raw=False, retryquery=None):
+        '''Runs a request, returning its decoded JSON body, or its body as
+        bytes if raw is set.
+
+        Failed requests are retried as the retry engine decides, sending
+        retryquery if it is given, or the same query again, as
+        :class:`ssllabs.client.Client` does.'''
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession()
+
+        url = '/'.join((self.__entrypoint, endpoint))
+        attempt = 0
+        while True:
+            try:
+                async with self.__session.get(url, params=query, timeout=self.__timeout) as response:
+                    if response.status in errors.codes:
+                        raise errors.codes[response.status](response.reason)
+                    response.raise_for_status()
+                    if raw:
+                        return await response.read()
+                    return await response.json()
+            except Exception as e:
+                delay = self.__retry.backoff(e, attempt) if self.__retry is not None else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                if retryquery is not None and not isinstance(e, errors.RequestRate):
+                    # The start may have been begun before it failed, so it
+                    # is followed by polling, rather than started again
+                    query = retryquery
+
+    async def info(self):
+        '''Calls the info API endpoint.
+
+        :returns: the info data
+        :rtype: ssllabs.info.Info
+        '''
+        return Info(await self.__get('info'))
+
+    async def statusCodes(self):
+        '''Calls the getStatusCodes API endpoint.
+
+        :returns: the StatusCodes data
+        :rtype: ssllabs.statuscodes.StatusCodes
+        '''
+        return StatusCodes(await self.__get('getStatusCodes'))
+
+    async def analyze(self, host, publish=False, ignoreMismatch=False, callback=None):
+        '''Runs an assessment of a host to completion and returns its result.
+
+        Unlike :meth:`ssllabs.client.Client.analyze`, this waits between polls
+        on its own.  The incomplete data from each poll may be watched through
+        callback, which is called with the :class:`ssllabs.host.Host` object
+        of every poll, and may be used to drive a progress display.
+
+        If the client has a retry engine, a start that fails is retried as a
+        poll, as with :meth:`ssllabs.client.Client.analyze`; only a start
+        refused with :class:`ssllabs.errors.RequestRate` is sent again as a
+        start.
+
+        :raises ssllabs.errors.ResponseError: subclass if an error was encountered with a known code
+        :raises aiohttp.ClientResponseError: if an error was encountered that isn't a known code
+        :param str host: The host to test
+        :param bool publish: Whether to publish the results on the Qualys SSL Labs site
+        :param bool ignoreMismatch: Proceed with assessments even when the server certificate doesn't match the assessment hostname
+        :param callback: A callable taking the incomplete host of each poll
+        :returns: The host object
+        :rtype: ssllabs.host.Host
+        '''
+        return await self.__analyze(host, publish, ignoreMismatch, callback)
+
+    async def __analyze(self, host, publish=False, ignoreMismatch=False, callback=None, start=None):
+        '''Runs an assessment as :meth:`analyze` does, making the request
+        that starts it with the start coroutine function, if given, which
+        takes its query and the query to retry it with.'''
+        query = {'host': host, 'all': 'done'}
+        if publish:
+            query['publish'] = 'on'
+
+        if ignoreMismatch:
+            query['ignoreMismatch'] = 'on'
+
+        startnewquery = {'startNew': 'on'}
+        startnewquery.update(query)
+
+        data = await (start if start is not None else self.__poll)(startnewquery, query)
+        try:
+            while data.status in {'IN_PROGRESS', 'DNS'}:
+                if callback is not None:
+                    callback(data)
+                await asyncio.sleep(self.__polling.delay(data))
+                data = await self.__poll(query)
+        finally:
+            self.__polling.reset(data.host or host)
+        return data
+
+    async def __poll(self, query, retryquery=None):
+        '''Calls analyze once, decoding the response in the pool if it is
+        large enough to be worth it.'''
+        if self.__pool is None:
+            return Host(await self.__get('analyze', query, retryquery=retryquery))
+        body = await self.__get('analyze', query, raw=True, retryquery=retryquery)
+        if len(body) < self.__pool.threshold:
+            return self.__pool.build(json.loads(body.decode('utf-8')))
+        return self.__pool.build(await asyncio.wrap_future(self.__pool.submit(body)))
+
+    async def analyze_many(self, hosts, concurrency=None, ratewait=15, **kwargs):
+        '''Runs assessments of many hosts at once.
+
+        New assessments are started no faster than the cool-off reported by
+        :meth:`info` allows, timed from when the API answered the last start,
+        and no more than concurrency of them are run at any time.  A start
+        refused with :class:`ssllabs.errors.RequestRate` is tried again,
+        after the cool-off at first, and after twice as long with every
+        refusal in a row, up to ratewait.  A failure of one host does not
+        stop the others; its exception is put in the result list in place of
+        the host.
+
+        :param hosts: An iterable of hosts to test
+        :param int concurrency: The maximum number of assessments run at once; defaults to :meth:`ssllabs.info.Info.maxAssessments`
+        :param float ratewait: The longest time to wait before trying a refused start again, in seconds
+        :param kwargs: Other arguments passed to :meth:`analyze`
+        :returns: The host objects or exceptions, in the same order as hosts
+        :rtype: list
+        '''
+        info = await self.info()
+        if concurrency is None:
+            concurrency = info.maxAssessments or 1
+        cooloff = info.newAssessmentCoolOff.total_seconds() if info.newAssessmentCoolOff is not None else 0
+
+        semaphore = asyncio.Semaphore(concurrency)
+        if self.__startlock is None:
+            self.__startlock = asyncio.Lock()
+
+        async def start(query, retryquery):
+            # Space out the starts of new assessments by the cool-off, which
+            # the API times from when it accepted the last one
+            async with self.__startlock:
+                loop = asyncio.get_event_loop()
+                if self.__started is not None:
+                    await asyncio.sleep(self.__started + cooloff - loop.time())
+                refused = 0
+                while True:
+                    try:
+                        data = await self.__poll(query, retryquery)
+                        break
+                    except errors.RequestRate:
+                        # The assessment was never started
+                        await asyncio.sleep(min(max(cooloff, 0.1) * 2 ** refused, max(cooloff, ratewait)))
+                        refused += 1
+                self.__started = loop.time()
+                return data
+
+        async def run(host):
+            async with semaphore:
+                return await self.__analyze(host, start=start, **kwargs)
+
+        return await asyncio.gather(*(run(host) for host in hosts), return_exceptions=True)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from collections import OrderedDict
+from datetime import timedelta
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+class Cache(object):
+    '''A persistent local cache of API results, which may be given to
+    :class:`ssllabs.client.Client`.
+
+    Results are stored as their :meth:`ssllabs.object.Object.rawdata`, one
+    JSON file per key, in a directory.  Entries expire after the ttl, and the
+    oldest entries are evicted once there are more than maxsize of them.
+    Finished hosts are also dropped once the API reports a different
+    :meth:`ssllabs.host.Host.engineVersion` or
+    :meth:`ssllabs.host.Host.criteriaVersion` than the one they were graded
+    with, because their grades may no longer hold.
+
+    The entries are listed once, when the cache is opened, and kept in order
+    of writing in memory from then on, so that storing one doesn't list the
+    directory.  Expired and stale entries are dropped lazily, as they are
+    read or evicted, rather than by scanning every file.
+
+    Any object with the same :meth:`get`, :meth:`put` and :meth:`versions`
+    methods may be used by a client in place of this one.
+    '''
+
+    def __init__(self, path, ttl=timedelta(hours=1), maxsize=10000, clock=time.time):
+        '''initializes the cache, creating its directory if needed.
+
+        :param str path: The directory the cache is kept in
+        :param datetime.timedelta ttl: The time an entry is kept for
+        :param int maxsize: The number of entries kept before the oldest are evicted
+        :param clock: The function used to tell the time, returning seconds
+        '''
+        self.__path = path
+        self.__ttl = ttl.total_seconds()
+        self.__maxsize = maxsize
+        self.__clock = clock
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        # The file of every entry, oldest first
+        self.__index = OrderedDict((filename, None) for filename in sorted(self.__entries(), key=self.__mtime))
+
+        self.__engineVersion = None
+        self.__criteriaVersion = None
+        versions = self.__read(os.path.join(path, 'versions.json'))
+        if versions is not None:
+            self.__engineVersion = versions.get('engineVersion')
+            self.__criteriaVersion = versions.get('criteriaVersion')
+
+    @property
+    def path(self):
+        '''The directory the cache is kept in'''
+        return self.__path
+
+    @staticmethod
+    def key(entrypoint, host, publish=False, ignoreMismatch=False):
+        '''Builds the key of an analyze result.
+
+        Results are kept apart by the entrypoint they came from, so that
+        clients of different APIs may share a cache.
+
+        :param str entrypoint: The entrypoint URL of the API
+        :param str host: The assessment host
+        :param bool publish: Whether the results are published
+        :param bool ignoreMismatch: Whether the assessment went on despite a certificate mismatch
+        :returns: the key
+        :rtype: tuple
+        '''
+        return ('analyze', entrypoint.rstrip('/'), host.lower(), bool(publish), bool(ignoreMismatch))
+
+    def __len__(self):
+        '''The number of entries held, including any not yet found expired'''
+        return len(self.__index)
+
+    def __file(self, key):
+        name = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.__path, name + '.json')
+
+    @staticmethod
+    def __read(filename):
+        try:
+            with io.open(filename, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def __write(self, filename, data):
+        # Written aside and renamed, so that readers never see half of a file
+        fd, temporary = tempfile.mkstemp(dir=self.__path, suffix='.tmp')
+        with io.open(fd, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(data, ensure_ascii=False))
+        getattr(os, 'replace', os.rename)(temporary, filename)
+
+    def __stale(self, entry):
+        '''Whether an entry was graded by another engine or criteria version
+        than the current ones'''
+        return ((self.__engineVersion is not None and entry.get('engineVersion') not in {None, self.__engineVersion})
+            or (self.__criteriaVersion is not None and entry.get('criteriaVersion') not in {None, self.__criteriaVersion}))
+
+    def get(self, key):
+        '''Gets the raw data of an entry.
+
+        :param tuple key: The key of the entry; ('statusCodes', entrypoint), or one built with :meth:`key`
+        :returns: the raw data, or None if there is no live entry
+        :rtype: dict
+        '''
+        filename = self.__file(key)
+        entry = self.__read(filename)
+        if entry is None:
+            return None
+        if self.__clock() - entry['time'] > self.__ttl or self.__stale(entry):
+            self.__remove(filename)
+            return None
+        return entry['data']
+
+    def put(self, key, data):
+        '''Stores the raw data of an entry, evicting the oldest entries if the
+        cache is full.
+
+        :param tuple key: The key of the entry
+        :param dict data: The raw data to store
+        '''
+        entry = {
+            'time': self.__clock(),
+            'data': data,
+            'engineVersion': data.get('engineVersion'),
+            'criteriaVersion': data.get('criteriaVersion'),
+            }
+        filename = self.__file(key)
+        self.__write(filename, entry)
+        self.__index.pop(filename, None)
+        self.__index[filename] = None
+
+        while len(self.__index) > self.__maxsize:
+            self.__remove(self.__index.popitem(last=False)[0])
+
+    def versions(self, engineVersion=None, criteriaVersion=None):
+        '''Sets the current engine and criteria versions, as last reported by
+        the API.  The entries graded with other versions are no longer
+        served, and are dropped as they are read.
+
+        :param str engineVersion: The engine version, or None to leave it as is
+        :param str criteriaVersion: The criteria version, or None to leave it as is
+        '''
+        changed = False
+        if engineVersion is not None and engineVersion != self.__engineVersion:
+            self.__engineVersion = engineVersion
+            changed = True
+        if criteriaVersion is not None and criteriaVersion != self.__criteriaVersion:
+            self.__criteriaVersion = criteriaVersion
+            changed = True
+        if not changed:
+            return
+
+        self.__write(os.path.join(self.__path, 'versions.json'), {
+            'engineVersion': self.__engineVersion,
+            'criteriaVersion': self.__criteriaVersion,
+            })
+
+    def clear(self):
+        '''Removes every entry.'''
+        for filename in self.__entries():
+            self.__remove(filename)
+        self.__index.clear()
+
+    def __entries(self):
+        return [os.path.join(self.__path, name) for name in os.listdir(self.__path) if name.endswith('.json') and name != 'versions.json']
+
+    @staticmethod
+    def __mtime(filename):
+        try:
+            return os.path.getmtime(filename)
+        except OSError:
+            return 0
+
+    def __remove(self, filename):
+        self.__index.pop(filename, None)
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
@@ -8,23 +8,104 @@ from __future__ import division, absolute_import, print_function, unicode_litera
 from six.moves.urllib.parse import urlsplit, urlunsplit, urlencode
 import six
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import math
+import time
+
 import requests
 
 from ssllabs import errors
+from ssllabs.endpoint import Endpoint
 from ssllabs.host import Host
 from ssllabs.info import Info
+from ssllabs.progress import Progress
+from ssllabs.retry import Wait
 from ssllabs.statuscodes import StatusCodes
+from ssllabs.stream import Stream
+from ssllabs.transport import SessionTransport, newsession
+
+#: The size of the pieces streamed responses are read in, in bytes
+CHUNKSIZE = 65536
+
+#: The number of endpoints whose details are fetched at once by an
+#: incremental analyze
+FETCHES = 4
+
+class _Deferred(Exception):
+    '''Raised in place of waiting before a retry, carrying the
+    :class:`ssllabs.retry.Wait` and the number of retries done.'''
+
+    def __init__(self, wait, attempt):
+        super(_Deferred, self).__init__(wait.error)
+        self.wait = wait
+        self.attempt = attempt
 
 class Client(object):
     '''The main entry point of this module, used to run analysis and get data'''
 
-    def __init__(self, entrypoint='https://api.ssllabs.com/api/v2'):
+    def __init__(self, entrypoint='https://api.ssllabs.com/api/v2', session=None, timeout=None, retry=None, cache=None, transport=None, hooks=None):
         '''initializes the client object.
 
         :param str entrypoint: The entrypoint URL for the API; usually shouldn't be changed
+        :param requests.Session session: The session used for every request.  If not set, a new one is built with :func:`ssllabs.transport.newsession`.  Pass the same session to several clients to share its connection pool.
+        :param timeout: The timeout for every request, either in seconds or as a (connect, read) tuple, as accepted by requests.  None waits forever.
+        :param ssllabs.retry.Retry retry: The retry engine deciding which failed requests are retried.  If not set, every error is raised at once.
+        :param ssllabs.cache.Cache cache: A local cache that finished results are stored in and served from, while they are live
+        :param transport: The transport every request is sent through, from :mod:`ssllabs.transport`; a :class:`ssllabs.transport.SessionTransport` over the session if not set.  May not be given along with a session.
+        :param ssllabs.telemetry.Hooks hooks: The telemetry hooks told about every API call and assessment.  If not set, nothing is measured.
         '''
+        if session is not None and transport is not None:
+            raise ValueError('Only one of session and transport may be given')
         self.entrypoint = entrypoint
+        self.__transport = transport if transport is not None else SessionTransport(session)
+        self.__timeout = timeout
+        self.__retry = retry
+        self.__cache = cache
+        self.__hooks = hooks
+        self.__maxAssessments = None
+        self.__currentAssessments = None
         self.__host = None
+        # Hosts whose assessment was last seen in progress, and the testTime
+        # of the last finished result of each host, for the 'auto' mode
+        self.__running = set()
+        self.__tested = {}
+
+    @property
+    def transport(self):
+        '''The transport every request of this client is sent through'''
+        return self.__transport
+
+    @property
+    def session(self):
+        '''The :class:`requests.Session` used for every request of this
+        client, or None if its transport doesn't use one.'''
+        return getattr(self.__transport, 'session', None)
+
+    @property
+    def retry(self):
+        '''The :class:`ssllabs.retry.Retry` engine, or None'''
+        return self.__retry
+
+    @property
+    def cache(self):
+        '''The :class:`ssllabs.cache.Cache`, or None'''
+        return self.__cache
+
+    @property
+    def hooks(self):
+        '''The :class:`ssllabs.telemetry.Hooks`, or None'''
+        return self.__hooks
+
+    @property
+    def timeout(self):
+        '''The per-request timeout, in seconds or as a (connect, read) tuple'''
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self.__timeout = value
 
     @property
     def entrypoint(self):
@@ -54,31 +135,140 @@ class Client(object):
         self.__netloc = parts.netloc
         self.__path = parts.path.rstrip('/')
 
+    @property
+    def maxAssessments(self):
+        '''The maximum number of concurrent assessments this client may run,
+        as last reported by the API in a response header or by :meth:`info`,
+        or None if it hasn't been reported yet.'''
+        return self.__maxAssessments
+
+    @property
+    def currentAssessments(self):
+        '''The number of ongoing assessments of this client, as last reported
+        by the API in a response header or by :meth:`info`, or None if it
+        hasn't been reported yet.'''
+        return self.__currentAssessments
+
+    def __get(self, endpoint, query=None, stream=False, attempt=0, defer=False, retryquery=None):
+        '''Runs a request against an API endpoint, recording the capacity
+        headers of the response.
+
+        Errors with a known status code are raised as their
+        :mod:`ssllabs.errors` class.  If a retry engine is set, failed
+        requests whose errors it has a backoff for are retried as it
+        decides, sending retryquery if it is given, or the same query again;
+        other errors are raised at once.  If defer is set, the wait before a
+        retry isn't slept here, but raised as :class:`_Deferred` for the
+        caller to wait and call again with the attempt it carries.  If
+        stream is set, the body is left to be read, and the response must
+        be closed by the caller.  Calls that fail for good are reported to
+        the hooks here; the caller reports the rest, once it has decoded the
+        body.
+
+        :returns: the request and the number of retries done
+        :rtype: tuple
+        '''
+        path = '/'.join((self.__path, endpoint))
+        url = urlunsplit((self.__scheme, self.__netloc, path, urlencode(query) if query else '', ''))
+        retryable = tuple(self.__retry.policies) if self.__retry is not None else ()
+        if self.__hooks is not None:
+            start = time.time()
+        while True:
+            request = None
+            try:
+                request = self.__transport.get(url, timeout=self.__timeout, stream=stream)
+                if 'X-Max-Assessments' in request.headers:
+                    self.__maxAssessments = int(request.headers['X-Max-Assessments'])
+                if 'X-Current-Assessments' in request.headers:
+                    self.__currentAssessments = int(request.headers['X-Current-Assessments'])
+                try:
+                    request.raise_for_status()
+                except requests.HTTPError as e:
+                    if e.response.status_code in errors.codes:
+                        raise errors.codes[e.response.status_code](e.response.reason)
+                    else:
+                        raise e
+                return request, attempt
+            except Exception as e:
+                delay = None
+                # A refused start wasn't begun, and is left to a deferring
+                # caller, which spaces out its starts on its own
+                if isinstance(e, retryable) and not (defer and retryquery is not None and isinstance(e, errors.RequestRate)):
+                    delay = self.__retry.backoff(e, attempt)
+                if delay is None and self.__hooks is not None:
+                    status = request.status_code if request is not None else None
+                    size = len(request.content) if request is not None else None
+                    self.__hooks.request(endpoint, start, status, time.time() - start, size, attempt, None, e)
+                if request is not None:
+                    # Give the connection of a failed streamed response back
+                    request.close()
+                if delay is None:
+                    raise
+                attempt += 1
+                if defer:
+                    raise _Deferred(Wait(delay, e), attempt)
+                time.sleep(delay)
+                if retryquery is not None and not isinstance(e, errors.RequestRate):
+                    # The start may have been begun before it failed, so it
+                    # is followed by polling, rather than started again
+                    url = urlunsplit((self.__scheme, self.__netloc, path, urlencode(retryquery), ''))
+
     def info(self):
         '''Calls the info API endpoint.
         
+        :raises ssllabs.errors.ResponseError: subclass if an error was encountered with a known code
+        :raises requests.HTTPError: if an error was encountered that isn't a known code
         :returns: the info data
         :rtype: ssllabs.info.Info
         '''
-        path = '/'.join((self.__path, 'info'))
-        url = urlunsplit((self.__scheme, self.__netloc, path, '', ''))
-        request = requests.get(url)
-        request.raise_for_status()
-        return Info(request.json())
+        # The capacity is live, so the answer is never served from the cache
+        data = self.__json('info')
+        if self.__cache is not None:
+            self.__cache.versions(data.get('engineVersion'), data.get('criteriaVersion'))
+        info = Info(data)
+        if info.maxAssessments is not None:
+            self.__maxAssessments = info.maxAssessments
+        if info.currentAssessments is not None:
+            self.__currentAssessments = info.currentAssessments
+        return info
 
     def statusCodes(self):
         '''Calls the getStatusCodes API endpoint.
         
+        :raises ssllabs.errors.ResponseError: subclass if an error was encountered with a known code
+        :raises requests.HTTPError: if an error was encountered that isn't a known code
         :returns: the StatusCodes data
         :rtype: ssllabs.statuscodes.StatusCodes
         '''
-        path = '/'.join((self.__path, 'getStatusCodes'))
-        url = urlunsplit((self.__scheme, self.__netloc, path, '', ''))
-        request = requests.get(url)
-        request.raise_for_status()
-        return StatusCodes(request.json())
+        key = ('statusCodes', self.entrypoint)
+        data = self.__cache.get(key) if self.__cache is not None else None
+        if data is None:
+            data = self.__json('getStatusCodes')
+            if self.__cache is not None:
+                self.__cache.put(key, data)
+        return StatusCodes(data)
+
+    def endpointData(self, host, s, fromCache=False, fields=None):
+        '''Calls the getEndpointData API endpoint, getting one endpoint of a
+        host, with its details once it is done.
+
+        :raises ssllabs.errors.ResponseError: subclass if an error was encountered with a known code
+        :raises requests.HTTPError: if an error was encountered that isn't a known code
+        :param str host: The host
+        :param str s: The IP address of the endpoint
+        :param bool fromCache: Whether to get the endpoint of the last cached result, rather than of the assessment in progress
+        :param fields: An iterable of the only dotted paths of the endpoint to build, as for :meth:`analyze`
+        :rtype: ssllabs.endpoint.Endpoint
+        '''
+        return Endpoint(self.__endpointData(host, s, fromCache), fields=fields)
+
+    def __endpointData(self, host, s, fromCache=False):
+        query = {'host': host, 's': s}
+        if fromCache:
+            query['fromCache'] = 'on'
+        return self.__json('getEndpointData', query)
 
-    def analyze(self, host, publish=False, ignoreMismatch=False):
+    def analyze(self, host, publish=False, ignoreMismatch=False, polling=None, mode='new', maxAge=None, last=None, stream=False, skip=None, fields=None, incremental=False, lightweight=False, defer=False):
         '''A generator that iteratively calls analyze on a host until it is done or errored.
         
         Does not return the host structure, but sets it to the object for
@@ -104,50 +294,327 @@ class Client(object):
                 return client.host
 
         This will let you check multiple endpoints at once, or run the analysis
-        while doing other work.
+        while doing other work.  Each poll still blocks the event loop, though;
+        :class:`ssllabs.aio.AsyncClient` runs the whole assessment on
+        non-blocking HTTP instead.
 
         The data yielded is the same form as the data put into the host
         property, but is expected to be incomplete; in particular, there will
         be no EndpointDetails.  You can use this data to possibly provide an
         ETA and progress bar, however.  It is quite fancy.
 
+        By default, every call starts a new assessment, which takes minutes.
+        The mode changes that:
+
+        new
+            Always start a new assessment.
+        cache
+            Return a cached result if the server has one, no older than
+            maxAge; otherwise an assessment is started.  This usually takes
+            a single round trip.
+        attach
+            Follow the assessment of this host that is already in progress,
+            or return the last cached result, starting an assessment only if
+            there is neither.
+        auto
+            Choose from the above by the last result of this host, as seen by
+            this client or given as last: 'cache' if its testTime is no older
+            than maxAge, 'attach' if an earlier call was left while the
+            assessment was in progress, and 'new' otherwise.
+
+        If the client has a cache holding a live result of this host, that
+        result is set without any request, and nothing is yielded.  In 'new'
+        mode the cache isn't read, but the new result is still stored in it.
+
+        If the client has a retry engine, a request that fails is retried as
+        a poll, so that the assessment already running on the server is
+        picked up again, rather than started anew; only a start refused with
+        :class:`ssllabs.errors.RequestRate`, which the API never began, is
+        sent again as a start.  The generator sleeps before each retry, for
+        as long as the engine says, unless defer is set, in which case it
+        yields a :class:`ssllabs.retry.Wait` instead, and the caller should
+        wait that long before going on.  A refused start is then raised, for
+        the caller to space out its starts on its own, as
+        :class:`ssllabs.scheduler.Scheduler` does.
+
+        If a polling policy from :mod:`ssllabs.polling` is given, the
+        generator waits between polls on its own, for as long as the policy
+        says, and the loop should not wait any more::
+
+            for data in client.analyze("https://example.com", polling=AdaptivePolling()):
+                print(data.status)
+
+        If stream is set, the final response is decoded as it arrives, with
+        :class:`ssllabs.stream.Stream`, and each of its endpoints is yielded
+        as a :class:`ssllabs.endpoint.Endpoint` as soon as it is complete,
+        after the incomplete hosts of the earlier polls.  The :meth:`host`
+        property is still set once the generator is done.  Parts of the
+        endpoints that aren't needed may be left out with skip, which also
+        streams the responses; results with skipped parts aren't put in the
+        cache.  Streaming costs throughput, and only shortens the time to the
+        first endpoint of responses larger than :data:`CHUNKSIZE`, such as
+        those of hosts with many endpoints, so it isn't the default.
+
+        If only some fields of the endpoints are needed, they may be listed
+        in fields, as dotted paths such as ``'grade'`` or
+        ``'details.cert.notAfter'``.  Only those fields of the final host and
+        its endpoints are built, as described for
+        :class:`ssllabs.host.Host`.  If stream is also set, the details of
+        each endpoint are decoded only as far as they are needed, and the
+        other fields of the endpoints themselves are kept in the raw data, as
+        they are needed to follow the progress of the assessment; such
+        results aren't put in the cache.  Otherwise the response is decoded
+        whole, which the C decoder of :mod:`json` does faster than the
+        streaming one can leave parts out.
+
+        If incremental is set, the polls leave the details out, and the
+        details of each endpoint are fetched with :meth:`endpointData` as
+        soon as a poll sees it Ready, up to :data:`FETCHES` at once in
+        background threads.  Each endpoint is yielded as a
+        :class:`ssllabs.endpoint.Endpoint` once its details have arrived,
+        before the next poll, so that the first ones come long before the
+        slowest endpoint of the host is done.  Once the assessment is done,
+        the generator waits for the rest, and the :meth:`host` property is
+        set with the details of every endpoint.  As in stream mode, a loop
+        doing its own waiting should only wait after the hosts yielded::
+
+            for data in client.analyze("https://example.com", incremental=True):
+                if isinstance(data, Endpoint):
+                    print(data.ipAddress, data.grade)
+                else:
+                    time.sleep(10)
+
+        If lightweight is set, the polls of the assessment in progress are
+        yielded as :class:`ssllabs.progress.Progress` records, which hold only
+        the status of the host and the progress of its endpoints, rather than
+        as hosts.  Only the final result is built in full.
+
         :raises ssllabs.errors.ResponseError: subclass if an error was encountered with a known code
         :raises requests.HTTPError: if an error was encountered that isn't a known code, the raw error is returned
         :param str host: The host to test
         :param bool publish: Whether to publish the results on the Qualys SSL Labs site
         :param bool ignoreMismatch: Proceed with assessments even when the server certificate doesn't match the assessment hostname
+        :param ssllabs.polling.Polling polling: A policy deciding how long to wait between polls; if not set, the caller does the waiting
+        :param str mode: How to get the result; one of 'new', 'cache', 'attach' or 'auto', as described above
+        :param datetime.timedelta maxAge: The oldest cached result accepted in 'cache' mode, rounded up to whole hours; any age if not set
+        :param ssllabs.host.Host last: A previous result of this host, which 'auto' mode decides from, if this client hasn't seen one itself
+        :param bool stream: Whether to yield the endpoints of the final response as they are decoded
+        :param skip: An iterable of dotted paths within each endpoint to leave out, such as 'details.sims', as described for :func:`ssllabs.stream.tree`
+        :param fields: An iterable of the only dotted paths within each endpoint to build
+        :param bool incremental: Whether to fetch the details of each endpoint on its own, as soon as it is Ready
+        :param bool lightweight: Whether to yield polls in progress as :class:`ssllabs.progress.Progress` records
+        :param bool defer: Whether to yield the waits before retries, rather than sleeping
+        :raises ValueError: if incremental is given along with stream or skip
         '''
-        path = '/'.join((self.__path, 'analyze'))
+        if incremental and (stream or skip):
+            raise ValueError('incremental may not be combined with stream or skip')
+        mode = self.__mode(host, mode, maxAge, last)
+        hooks = self.__hooks
+        if hooks is not None:
+            start = time.time()
+
+        # A new assessment is asked for exactly because a stored result
+        # won't do, so the cache is only read in the other modes
+        key = self.__cache.key(self.entrypoint, host, publish=publish, ignoreMismatch=ignoreMismatch) if self.__cache is not None else None
+        if key is not None and mode != 'new':
+            data = self.__cache.get(key)
+            if data is not None:
+                self.__host = Host(data, fields=fields)
+                if hooks is not None:
+                    hooks.analyze(host, start, time.time(), 0, [], self.__host.status, None)
+                return
 
         # Start the run
-        query = {'host': host, 'all': 'done'}
+        query = {'host': host}
+        if not incremental:
+            query['all'] = 'done'
         if publish:
             query['publish'] = 'on'
 
         if ignoreMismatch:
             query['ignoreMismatch'] = 'on'
 
-        startnewquery = {'startNew': 'on'}
-        startnewquery.update(query)
+        if mode == 'cache':
+            query['fromCache'] = 'on'
+            if maxAge is not None:
+                query['maxAge'] = max(int(math.ceil(maxAge.total_seconds() / 3600)), 1)
+
+        startquery = dict(query)
+        if mode == 'new':
+            startquery['startNew'] = 'on'
 
+        keep = None
+        if stream and fields is not None:
+            # The plain fields of the endpoints are small, and the ones that
+            # tell the progress are needed for every poll
+            keep = [field.key for field in Endpoint.schema if not field.lazy]
+            keep.extend(fields)
+
+        data = None
+        # The polls made, and the [status, begin, seconds] of each status in
+        # progress seen, for the hooks
+        polls = 0
+        phases = []
+        error = None
+        # The details of each endpoint fetched in incremental mode, by IP
+        # address, as futures, and the addresses of the ones yielded
+        executor = ThreadPoolExecutor(FETCHES) if incremental else None
+        fetches = OrderedDict()
+        delivered = set()
         try:
-            url = urlunsplit((self.__scheme, self.__netloc, path, urlencode(startnewquery), ''))
-            request = requests.get(url)
-            request.raise_for_status()
-            data = request.json()
-
-            url = urlunsplit((self.__scheme, self.__netloc, path, urlencode(query), ''))
-            while data['status'] in {'IN_PROGRESS', 'DNS'}:
-                yield Host(data)
-                request = requests.get(url)
-                request.raise_for_status()
-                data = request.json()
-            self.__host = Host(data)
-        except requests.HTTPError as e:
-            if e.response.status_code in errors.codes:
-                raise errors.codes[e.response.status_code](e.response.reason)
-            else:
-                raise e
+            nextquery = startquery
+            # The retries done of the request in hand
+            attempt = 0
+            while True:
+                # A failed start is followed by polling
+                retryquery = query if nextquery is startquery else None
+                streamed = stream or skip
+                try:
+                    if streamed:
+                        if hooks is not None:
+                            requested = time.time()
+                        response, retries = self.__get('analyze', nextquery, stream=True, attempt=attempt, defer=defer, retryquery=retryquery)
+                    else:
+                        data = self.__json('analyze', nextquery, attempt=attempt, defer=defer, retryquery=retryquery)
+                except _Deferred as deferred:
+                    attempt = deferred.attempt
+                    yield deferred.wait
+                    if retryquery is not None and not isinstance(deferred.wait.error, errors.RequestRate):
+                        nextquery = query
+                    continue
+                attempt = 0
+
+                if streamed:
+                    try:
+                        chunks = response.iter_content(CHUNKSIZE)
+                        if hooks is not None:
+                            received = time.time()
+                            size = [0]
+                            chunks = self.__counted(chunks, size)
+                        decoder = Stream(chunks, skip or (), keep)
+                        if stream:
+                            for endpoint in self.__endpoints(decoder, fields):
+                                yield endpoint
+                        else:
+                            for endpoint in decoder:
+                                pass
+                        data = decoder.data
+                    finally:
+                        response.close()
+                    if hooks is not None:
+                        now = time.time()
+                        hooks.request('analyze', requested, response.status_code, received - requested, size[0], retries, now - received, None)
+
+                if hooks is not None:
+                    polls += 1
+                    now = time.time()
+                    if phases:
+                        phases[-1][2] = now - phases[-1][1]
+                    if data['status'] in {'IN_PROGRESS', 'DNS'} and (not phases or phases[-1][0] != data['status']):
+                        phases.append([data['status'], now, 0])
+
+                if executor is not None:
+                    for endpoint in data.get('endpoints', ()):
+                        ip = endpoint.get('ipAddress')
+                        if endpoint.get('statusMessage') == 'Ready' and ip not in fetches:
+                            fetches[ip] = executor.submit(self.__endpointData, host, ip)
+
+                if data['status'] not in {'IN_PROGRESS', 'DNS'}:
+                    break
+                self.__running.add(host)
+                progress = Progress(data) if lightweight else Host(data)
+                yield progress
+                if polling is not None:
+                    time.sleep(polling.delay(progress))
+                for ip, future in fetches.items():
+                    if ip not in delivered and future.done():
+                        delivered.add(ip)
+                        yield Endpoint(future.result(), fields=fields)
+                nextquery = query
+
+            if executor is not None:
+                addresses = {future: ip for ip, future in fetches.items() if ip not in delivered}
+                for future in as_completed(addresses):
+                    delivered.add(addresses[future])
+                    yield Endpoint(future.result(), fields=fields)
+                data = dict(data, endpoints=[fetches[endpoint['ipAddress']].result() if endpoint.get('ipAddress') in fetches else endpoint for endpoint in data.get('endpoints', ())])
+
+            self.__host = Host(data, fields=fields)
+            self.__running.discard(host)
+            if self.__cache is not None:
+                self.__cache.versions(self.__host.engineVersion, self.__host.criteriaVersion)
+                if self.__host.status == 'READY' and not skip and keep is None:
+                    self.__cache.put(key, data)
+            if self.__host.testTime is not None:
+                self.__tested[host] = self.__host.testTime
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            if polling is not None:
+                polling.reset(data.get('host', host) if data is not None else host)
+            if hooks is not None:
+                now = time.time()
+                if phases and data['status'] in {'IN_PROGRESS', 'DNS'}:
+                    phases[-1][2] = now - phases[-1][1]
+                hooks.analyze(host, start, now, polls, [tuple(phase) for phase in phases], data.get('status') if data is not None else None, error)
+
+    def __json(self, endpoint, query=None, **kwargs):
+        '''Runs a request and decodes its JSON body, reporting the call to the
+        hooks, if there are any.  Other arguments are passed on to the
+        request.'''
+        if self.__hooks is None:
+            return self.__get(endpoint, query, **kwargs)[0].json()
+        start = time.time()
+        response, retries = self.__get(endpoint, query, **kwargs)
+        received = time.time()
+        data = response.json()
+        self.__hooks.request(endpoint, start, response.status_code, received - start, len(response.content), retries, time.time() - received, None)
+        return data
+
+    @staticmethod
+    def __counted(chunks, size):
+        '''Passes chunks through, adding up their lengths in size[0].'''
+        for chunk in chunks:
+            size[0] += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def __endpoints(decoder, fields):
+        '''Decodes a streamed analyze response, yielding each of its endpoints
+        if the response is final.  Endpoints that arrive before the status
+        are held until it is known.'''
+        held = []
+        for endpoint in decoder:
+            status = decoder.data.get('status')
+            if status in {'IN_PROGRESS', 'DNS'}:
+                continue
+            held.append(endpoint)
+            if status is not None:
+                for item in held:
+                    yield Endpoint(item, fields=fields)
+                held = []
+        if decoder.data.get('status') not in {'IN_PROGRESS', 'DNS'}:
+            for item in held:
+                yield Endpoint(item, fields=fields)
+
+    def __mode(self, host, mode, maxAge, last):
+        '''Resolves the 'auto' analyze mode into one of the others.'''
+        if mode not in {'new', 'cache', 'attach', 'auto'}:
+            raise ValueError('Unknown analyze mode: {}'.format(mode))
+        if mode != 'auto':
+            return mode
+
+        testTime = self.__tested.get(host)
+        if testTime is None and last is not None:
+            testTime = last.testTime
+        if testTime is not None and (maxAge is None or datetime.utcnow() - testTime < maxAge):
+            return 'cache'
+        if host in self.__running:
+            return 'attach'
+        return 'new'
 
     @property
     def host(self):
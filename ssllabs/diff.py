@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Change detection between results of the same host.
+
+A :class:`Digest` condenses a finished :class:`ssllabs.host.Host` into the
+parts worth alerting on (see :data:`ASPECTS`), each under its own hash, with
+a hash over each endpoint and one over the whole host above them.  Comparing
+two digests with :func:`diff` goes down only the branches whose hashes
+differ, so an unchanged host costs a single comparison however large its
+results are.  Digests are made from the raw data alone, without building any
+objects, and are small and picklable, so they can be kept in place of the
+hosts they were made from::
+
+    previous = {}
+    for name, host in scheduler.run(hosts):
+        current = Digest(host)
+        for change in diff(previous.get(name), current):
+            alert(change)
+        previous[name] = current
+'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+import base64
+import binascii
+import hashlib
+import json
+
+from ssllabs.schema import EPOCH
+
+#: The parts of each endpoint that are compared, in the order that changes
+#: are reported
+ASPECTS = ('grade', 'cert', 'protocols', 'suites', 'hsts', 'vulnerabilities')
+
+#: The :class:`ssllabs.endpointdetails.EndpointDetails` properties compared
+#: as the ``vulnerabilities`` aspect
+VULNERABILITIES = (
+    'vulnBeast', 'heartbleed', 'poodle', 'poodleTls', 'openSslCcs',
+    'openSSLLuckyMinus20', 'freak', 'logjam', 'drownVulnerable', 'supportsRc4',
+    )
+
+def _get(data, path):
+    '''Follows a dotted path of keys through raw data, giving None if any
+    part of it is missing or None.'''
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def _fingerprint(pem):
+    '''The SHA-256 fingerprint of a PEM-encoded certificate, in hex.'''
+    if not pem:
+        return None
+    body = ''.join(line for line in pem.splitlines() if line and not line.startswith('-----'))
+    try:
+        der = base64.b64decode(body)
+    except (binascii.Error, TypeError, ValueError):
+        return None
+    return hashlib.sha256(der).hexdigest()
+
+# Each aspect is taken from the raw data of an endpoint as plain values in a
+# canonical form, which is what is hashed, and only turned into the summary
+# that is reported once it is found to have changed
+
+def _grade(endpoint):
+    return {
+        'grade': endpoint.get('grade'),
+        'gradeTrustIgnored': endpoint.get('gradeTrustIgnored'),
+        }
+
+def _cert(endpoint):
+    # The leaf certificate is kept by its fingerprint, rather than its PEM
+    # data, which is the bulk of a digest
+    certs = _get(endpoint, 'details.chain.certs')
+    return {
+        'fingerprint': _fingerprint(certs[0].get('raw')) if certs else None,
+        'notAfter': _get(endpoint, 'details.cert.notAfter'),
+        }
+
+def _certsummary(value):
+    notAfter = value['notAfter']
+    return {
+        'fingerprint': value['fingerprint'],
+        'notAfter': (EPOCH + timedelta(milliseconds=notAfter)).isoformat() if notAfter is not None else None,
+        }
+
+def _protocols(endpoint):
+    return sorted('{} {}'.format(protocol.get('name'), protocol.get('version')) for protocol in _get(endpoint, 'details.protocols') or ())
+
+def _suites(endpoint):
+    return sorted(suite.get('name') for suite in _get(endpoint, 'details.suites.list') or ())
+
+def _hsts(endpoint):
+    policy = _get(endpoint, 'details.hstsPolicy')
+    if policy is None:
+        return None
+    return {
+        'status': policy.get('status'),
+        'maxAge': policy.get('maxAge'),
+        'includeSubDomains': policy.get('includeSubDomains'),
+        'preload': policy.get('preload'),
+        }
+
+def _vulnerabilities(endpoint):
+    details = endpoint.get('details')
+    if details is None:
+        return None
+    return {name: details.get(name) for name in VULNERABILITIES}
+
+_CANONICAL = {
+    'grade': _grade,
+    'cert': _cert,
+    'protocols': _protocols,
+    'suites': _suites,
+    'hsts': _hsts,
+    'vulnerabilities': _vulnerabilities,
+    }
+
+#: The summaries that differ from the canonical values
+_SUMMARIES = {
+    'cert': _certsummary,
+    }
+
+def _hash(*parts):
+    '''Hashes JSON-compatible values, the same way on every run and every
+    Python version.'''
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, separators=(',', ':')).encode('utf-8')).digest()
+
+def _hex(digest):
+    return binascii.hexlify(digest).decode('ascii')
+
+class Change(object):
+    '''One changed aspect of one endpoint.
+
+    For endpoints that were added or removed, :attr:`aspect` is ``'endpoint'``
+    and the missing side is None.
+    '''
+
+    def __init__(self, host, ipAddress, aspect, old, new):
+        self.__host = host
+        self.__ipAddress = ipAddress
+        self.__aspect = aspect
+        self.__old = old
+        self.__new = new
+
+    @property
+    def host(self):
+        '''the assessed host name'''
+        return self.__host
+
+    @property
+    def ipAddress(self):
+        '''the IP address of the changed endpoint'''
+        return self.__ipAddress
+
+    @property
+    def aspect(self):
+        '''what changed: one of :data:`ASPECTS`, or ``'endpoint'``'''
+        return self.__aspect
+
+    @property
+    def old(self):
+        '''the summary of the aspect before the change'''
+        return self.__old
+
+    @property
+    def new(self):
+        '''the summary of the aspect after the change'''
+        return self.__new
+
+    def __repr__(self):
+        return 'Change({!r}, {!r}, {!r}, {!r}, {!r})'.format(self.__host, self.__ipAddress, self.__aspect, self.__old, self.__new)
+
+class Digest(object):
+    '''The hashed summary of a finished host, as compared by :func:`diff`.
+
+    It is made from the raw data of the host, without building any of its
+    objects, and hashes each aspect in the canonical form of its raw values.
+    Those values are kept, rather than the summaries reported in
+    :class:`Change` objects, which are only worked out when asked for.'''
+
+    def __init__(self, host):
+        '''Summarizes a host.
+
+        :param host: The host, as returned by a finished :meth:`ssllabs.client.Client.analyze`, or its raw data
+        :type host: :class:`ssllabs.host.Host`
+        :raises ValueError: if the host has been compacted
+        '''
+        data = getattr(host, 'rawdata', host)
+        if data is None:
+            raise ValueError('Compacted hosts have no raw data to digest')
+        self.__host = data.get('host')
+        self.__endpoints = {}
+        for index, endpoint in enumerate(data.get('endpoints') or ()):
+            # Endpoints are matched up by address, or by position if a
+            # projection left the address out
+            ipAddress = endpoint.get('ipAddress')
+            if ipAddress is None:
+                ipAddress = '#{}'.format(index)
+            aspects = {}
+            for aspect in ASPECTS:
+                value = _CANONICAL[aspect](endpoint)
+                aspects[aspect] = (_hash(value), value)
+            self.__endpoints[ipAddress] = (_hash(*[_hex(aspects[aspect][0]) for aspect in ASPECTS]), aspects)
+        self.__hash = _hash(*sorted([ipAddress, _hex(value[0])] for ipAddress, value in self.__endpoints.items()))
+
+    @property
+    def host(self):
+        '''the assessed host name'''
+        return self.__host
+
+    @property
+    def hash(self):
+        '''the hash of everything compared, as :class:`bytes`'''
+        return self.__hash
+
+    @property
+    def endpoints(self):
+        '''the IP addresses of the endpoints, sorted'''
+        return sorted(self.__endpoints)
+
+    def endpoint(self, ipAddress):
+        '''The (hash, aspects) pair of one endpoint, where aspects maps each
+        of :data:`ASPECTS` to a (hash, value) pair of the canonical raw
+        values hashed.'''
+        return self.__endpoints[ipAddress]
+
+    def summary(self, ipAddress, aspect):
+        '''The summary of one aspect of one endpoint, as plain JSON-compatible
+        values.'''
+        value = self.__endpoints[ipAddress][1][aspect][1]
+        return _SUMMARIES[aspect](value) if aspect in _SUMMARIES else value
+
+    def __eq__(self, other):
+        return isinstance(other, Digest) and self.__hash == other.hash
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.__hash)
+
+def diff(old, new):
+    '''Finds what changed between two results of the same host.
+
+    :param old: The earlier result, as a :class:`Digest`, a :class:`ssllabs.host.Host` or its raw data, or None if there was none, in which case every endpoint counts as added
+    :param new: The later result, in the same form
+    :returns: the changes, ordered by endpoint and then by :data:`ASPECTS`, empty if nothing changed
+    :rtype: list of :class:`Change`
+    '''
+    if old is not None and not isinstance(old, Digest):
+        old = Digest(old)
+    if new is not None and not isinstance(new, Digest):
+        new = Digest(new)
+    if old is None and new is None or old == new:
+        return []
+
+    name = (new if new is not None else old).host
+    oldendpoints = set(old.endpoints) if old is not None else set()
+    newendpoints = set(new.endpoints) if new is not None else set()
+
+    changes = []
+    for ipAddress in sorted(oldendpoints | newendpoints):
+        if ipAddress not in oldendpoints:
+            changes.append(Change(name, ipAddress, 'endpoint', None, ipAddress))
+            continue
+        if ipAddress not in newendpoints:
+            changes.append(Change(name, ipAddress, 'endpoint', ipAddress, None))
+            continue
+        oldhash, oldaspects = old.endpoint(ipAddress)
+        newhash, newaspects = new.endpoint(ipAddress)
+        if oldhash == newhash:
+            continue
+        for aspect in ASPECTS:
+            if oldaspects[aspect][0] != newaspects[aspect][0]:
+                changes.append(Change(name, ipAddress, aspect, old.summary(ipAddress, aspect), new.summary(ipAddress, aspect)))
+    return changes
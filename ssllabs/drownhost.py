@@ -6,46 +6,20 @@
 from __future__ import division, absolute_import, print_function, unicode_literals
 
 from ssllabs.object import Object
+from ssllabs.schema import Field
 
 class DrownHost(Object):
     '''A DROWN host, accessed from
     :meth:`ssllabs.endpointdetails.EndpointDetails.drownHosts`'''
-    def __init__(self, data):
-        self.__ip = data.get('ip')
-        self.__export = data.get('export')
-        self.__port = data.get('port')
-        self.__special = data.get('special')
-        self.__sslv2 = data.get('sslv2')
-        self.__status = data.get('status')
 
-    @property
-    def ip(self):
+    ip = Field(
         '''Ip address of server that shares same RSA-Key/hostname in its
-        certificate'''
-        return self.__ip
-
-    @property
-    def export(self):
-        '''true if export cipher suites detected'''
-        return self.__export
-
-    @property
-    def port(self):
-        '''port number of the server'''
-        return self.__port
-
-    @property
-    def special(self):
-        '''true if vulnerable OpenSSL version detected'''
-        return self.__special
-
-    @property
-    def sslv2(self):
-        '''true if SSL v2 is supported'''
-        return self.__sslv2
-
-    @property
-    def status(self):
+        certificate''')
+    export = Field('''true if export cipher suites detected''')
+    port = Field('''port number of the server''')
+    special = Field('''true if vulnerable OpenSSL version detected''')
+    sslv2 = Field('''true if SSL v2 is supported''')
+    status = Field(
         '''drown host status:
 
         error
@@ -64,5 +38,4 @@ class DrownHost(Object):
             vulnerable (same key with SSL v2)
         hostname_match
             vulnerable (same hostname with SSL v2)
-        '''
-        return self.__status
+        ''')
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''An index of certificate expiry across many hosts.
+
+An :class:`ExpiryIndex` holds the expiry of every certificate of every
+endpoint of the hosts put into it: the one each endpoint presented, from
+:meth:`ssllabs.endpointdetails.EndpointDetails.cert`, and the rest of its
+chain, from :meth:`ssllabs.chain.Chain.certs`.  They are kept in a heap by
+expiry, so that putting in a new result of a host costs O(log n) for each of
+its certificates, and asking for the certificates that expire next costs
+O(log n) for each one returned, however many hosts are held.  Replaced
+results are left in the heap, and skipped when they come up, until they
+make up half of it.
+
+The certificates returned by :meth:`ExpiryIndex.within` and
+:meth:`ExpiryIndex.rescans` are taken off the heap, so that each is handed
+out once, and a rescan driver asking again doesn't get the hosts it has
+already queued.  They are still held, and a new result of their host puts
+its certificates back in the running; a host whose rescan failed may be put
+back as it was with ``index.put(name, index.get(name))``::
+
+    index = ExpiryIndex()
+    for name, result in scheduler.run(hosts, fields=FIELDS):
+        if not isinstance(result, Exception):
+            index.update(result, name)
+
+    # The hosts to rescan now, as their certificates expire within a week;
+    # asking again only gives the ones that have come due since
+    rescan = index.rescans(timedelta(days=7))
+'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from collections import namedtuple
+from datetime import datetime
+import heapq
+
+#: The endpoint fields the index reads, as a projection for
+#: :meth:`ssllabs.client.Client.analyze`
+FIELDS = ('ipAddress', 'details.cert.subject', 'details.cert.notAfter', 'details.chain.certs.subject', 'details.chain.certs.notAfter')
+
+#: A certificate in the index: its expiry, as a naive UTC datetime, the host
+#: and the IP address of the endpoint it was seen on, its subject, and its
+#: position in the chain of the endpoint, or None for the certificate the
+#: endpoint presented
+Expiry = namedtuple('Expiry', ('notAfter', 'host', 'ipAddress', 'subject', 'chain'))
+
+def _get(obj, name):
+    '''Gets a property, giving None if it was left out by a projection.'''
+    try:
+        return getattr(obj, name)
+    except AttributeError:
+        return None
+
+def expiries(host, name=None):
+    '''Lists the certificates of every endpoint of a host.  A certificate of
+    the chain that is the same as the one presented, by subject and expiry,
+    is only listed once.
+
+    :param ssllabs.host.Host host: The finished host
+    :param str name: The host name to list them under; the host of the result if not set
+    :rtype: list of :data:`Expiry`
+    '''
+    name = name if name is not None else host.host
+    found = []
+    for endpoint in host.endpoints:
+        details = _get(endpoint, 'details')
+        if details is None:
+            continue
+        ipAddress = _get(endpoint, 'ipAddress')
+        seen = set()
+        cert = _get(details, 'cert')
+        if _get(cert, 'notAfter') is not None:
+            subject = _get(cert, 'subject')
+            seen.add((subject, cert.notAfter))
+            found.append(Expiry(cert.notAfter, name, ipAddress, subject, None))
+        chain = _get(details, 'chain')
+        for position, chaincert in enumerate(_get(chain, 'certs') or ()):
+            notAfter = _get(chaincert, 'notAfter')
+            subject = _get(chaincert, 'subject')
+            if notAfter is None or (subject, notAfter) in seen:
+                continue
+            seen.add((subject, notAfter))
+            found.append(Expiry(notAfter, name, ipAddress, subject, position))
+    return found
+
+class ExpiryIndex(object):
+    '''An index of the certificates of many hosts by their expiry, keeping
+    the certificates of the last result put in for each host.'''
+
+    def __init__(self):
+        # Heap of (notAfter, tiebreaker, generation, Expiry)
+        self.__heap = []
+        # host -> (generation, [Expiry]) of the last result of each host
+        self.__hosts = {}
+        self.__counter = 0
+        self.__live = 0
+
+    def __len__(self):
+        '''The number of certificates held'''
+        return self.__live
+
+    def __contains__(self, name):
+        return name in self.__hosts
+
+    @property
+    def hosts(self):
+        '''The names of the hosts held'''
+        return list(self.__hosts)
+
+    def get(self, name):
+        '''Gets the certificates held for a host.
+
+        :param str name: The host name
+        :rtype: list of :data:`Expiry`
+        '''
+        return list(self.__hosts[name][1]) if name in self.__hosts else []
+
+    def update(self, host, name=None):
+        '''Puts in a new result of a host, replacing its certificates.
+
+        :param ssllabs.host.Host host: The finished host
+        :param str name: The host name to hold them under; the host of the result if not set
+        :returns: the certificates now held for the host
+        :rtype: list of :data:`Expiry`
+        '''
+        name = name if name is not None else host.host
+        return self.put(name, expiries(host, name))
+
+    def put(self, name, entries):
+        '''Replaces the certificates of a host with a list of them, such as
+        one from :func:`expiries`.
+
+        :param str name: The host name
+        :param entries: An iterable of :data:`Expiry`
+        :returns: the certificates now held for the host
+        :rtype: list of :data:`Expiry`
+        '''
+        self.remove(name)
+        entries = list(entries)
+        self.__counter += 1
+        generation = self.__counter
+        self.__hosts[name] = (generation, entries)
+        for entry in entries:
+            self.__counter += 1
+            heapq.heappush(self.__heap, (entry.notAfter, self.__counter, generation, entry))
+        self.__live += len(entries)
+        return entries
+
+    def remove(self, name):
+        '''Drops the certificates of a host, if it is held.
+
+        :param str name: The host name
+        '''
+        if name in self.__hosts:
+            generation, entries = self.__hosts.pop(name)
+            self.__live -= len(entries)
+            if len(self.__heap) > 2 * self.__live + 64:
+                self.__compact()
+
+    def __current(self, item):
+        '''Tells whether a heap item belongs to the last result of its host.'''
+        held = self.__hosts.get(item[3].host)
+        return held is not None and held[0] == item[2]
+
+    def __compact(self):
+        '''Rebuilds the heap without the items of replaced results.'''
+        self.__heap = [item for item in self.__heap if self.__current(item)]
+        heapq.heapify(self.__heap)
+
+    def __take(self, stop, keep=True):
+        '''Takes the current items off the top of the heap, in order, until
+        stop says to, putting them back afterwards if keep is set.
+
+        :param stop: A function of the items taken so far and the next item, telling whether to stop before it
+        :rtype: list of :data:`Expiry`
+        '''
+        taken = []
+        heap = self.__heap
+        while heap:
+            if not self.__current(heap[0]):
+                heapq.heappop(heap)
+                continue
+            if stop(taken, heap[0]):
+                break
+            taken.append(heapq.heappop(heap))
+        if keep:
+            for item in taken:
+                heapq.heappush(heap, item)
+        return [item[3] for item in taken]
+
+    def next(self, count=1):
+        '''Gets the certificates that expire first, of those not yet handed
+        out by :meth:`within` or :meth:`rescans`, leaving them in the index.
+
+        :param int count: The number of certificates
+        :returns: up to count certificates, soonest first
+        :rtype: list of :data:`Expiry`
+        '''
+        return self.__take(lambda taken, item: len(taken) >= count)
+
+    def within(self, delta, now=None):
+        '''Takes the certificates that expire within a length of time, or
+        have already expired, of those not yet handed out.  They aren't
+        returned again until a new result of their host is put in.
+
+        :param datetime.timedelta delta: The length of time
+        :param datetime.datetime now: The naive UTC time to count from; the current time if not set
+        :returns: the certificates, soonest first
+        :rtype: list of :data:`Expiry`
+        '''
+        deadline = (now if now is not None else datetime.utcnow()) + delta
+        return self.__take(lambda taken, item: item[0] > deadline, keep=False)
+
+    def rescans(self, window, now=None):
+        '''Takes the hosts due for a rescan: those with a certificate that
+        expires within the window, or has already expired, as found by
+        :meth:`within`.  A host isn't returned again until a new result of
+        it is put in, or one of its certificates not yet handed out comes
+        within the window.
+
+        :param datetime.timedelta window: How long before the expiry of a certificate its host is due
+        :param datetime.datetime now: The naive UTC time to count from; the current time if not set
+        :returns: the host names, the one whose certificate expires first first
+        :rtype: list of str
+        '''
+        hosts = []
+        seen = set()
+        for entry in self.within(window, now):
+            if entry.host not in seen:
+                seen.add(entry.host)
+                hosts.append(entry.host)
+        return hosts
+
+    def due(self, window):
+        '''Gets the time the next host is due for a rescan, which is the
+        expiry of the first certificate not yet handed out less the window.
+
+        :param datetime.timedelta window: How long before the expiry of a certificate its host is due
+        :returns: the naive UTC time, or None if no certificates are held
+        :rtype: datetime.datetime
+        '''
+        first = self.next()
+        return first[0].notAfter - window if first else None
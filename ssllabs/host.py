@@ -5,90 +5,60 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-from datetime import datetime, timedelta
-
 from ssllabs.endpoint import Endpoint
 from ssllabs.object import Object
+from ssllabs.schema import Field, ListOf, Timestamp, projection
 
 class Host(Object):
     '''A host object.  The class filled by
     :meth:`ssllabs.client.Client.analyze` and accessed through
     :meth:`ssllabs.client.Client.host`'''
 
-    def __init__(self, data):
-        self.__host = data.get('host')
-        self.__port = data.get('port')
-        self.__protocol = data.get('protocol')
-        self.__isPublic = data.get('isPublic')
-        self.__status = data.get('status')
-        self.__statusMessage = data.get('statusMessage')
-        self.__startTime = (datetime.utcfromtimestamp(0) + timedelta(milliseconds=data['startTime'])) if 'startTime' in data else None
-        self.__testTime = (datetime.utcfromtimestamp(0) + timedelta(milliseconds=data['testTime'])) if 'testTime' in data else None
-        self.__engineVersion = data.get('engineVersion')
-        self.__criteriaVersion = data.get('criteriaVersion')
-        self.__cacheExpiryTime = data.get('cacheExpiryTime')
-        self.__endpoints = [Endpoint(endpoint) for endpoint in data.get('endpoints', list())]
-        self.__certHostnames = data.get('certHostnames', list())
-
-    @property
-    def host(self):
-        '''assessment host, which can be a hostname or an IP address'''
-        return self.__host
-    @property
-    def port(self):
-        '''assessment port (e.g., 443)'''
-        return self.__port
-    @property
-    def protocol(self):
-        '''protocol (e.g., HTTP)'''
-        return self.__protocol
-    @property
-    def isPublic(self):
+    host = Field('''assessment host, which can be a hostname or an IP address''')
+    port = Field('''assessment port (e.g., 443)''')
+    protocol = Field('''protocol (e.g., HTTP)''')
+    isPublic = Field(
         '''true if this assessment is publicly available (listed on the SSL
-        Labs assessment boards)'''
-        return self.__isPublic
-    @property
-    def status(self):
+        Labs assessment boards)''')
+    status = Field(
         '''assessment status; possible values: DNS, ERROR, IN_PROGRESS, and
-        READY.'''
-        return self.__status
-    @property
-    def statusMessage(self):
+        READY.''')
+    statusMessage = Field(
         '''status message in English. When status is ERROR, this field will
-        contain an error message.'''
-        return self.__statusMessage
-    @property
-    def startTime(self):
-        '''assessment starting time, as a utc datetime object'''
-        return self.__startTime
-    @property
-    def testTime(self):
-        '''assessment completion time, as a utc datetime object'''
-        return self.__testTime
-    @property
-    def engineVersion(self):
-        '''assessment engine version (e.g., "1.0.120")'''
-        return self.__engineVersion
-    @property
-    def criteriaVersion(self):
-        '''grading criteria version (e.g., "2009")'''
-        return self.__criteriaVersion
-    @property
-    def cacheExpiryTime(self):
+        contain an error message.''')
+    startTime = Timestamp('''assessment starting time, as a utc datetime object''')
+    testTime = Timestamp('''assessment completion time, as a utc datetime object''')
+    engineVersion = Field('''assessment engine version (e.g., "1.0.120")''')
+    criteriaVersion = Field('''grading criteria version (e.g., "2009")''')
+    cacheExpiryTime = Field(
         '''when will the assessment results expire from the cache (typically
         set only for assessment with errors; otherwise the results stay in the
-        cache for as long as there's sufficient room)'''
-        return self.__cacheExpiryTime
-    @property
-    def endpoints(self):
-        '''list of :class:`ssllabs.endpoint.Endpoint` objects'''
-        return self.__endpoints
-    @property
-    def certHostnames(self):
+        cache for as long as there's sufficient room)''')
+    endpoints = ListOf(Endpoint, '''list of :class:`ssllabs.endpoint.Endpoint` objects''')
+    certHostnames = Field(
         '''the list of certificate hostnames collected from the
         certificates seen during assessment. The hostnames may not be
         valid. This field is available only if the server certificate
         doesn't match the requested hostname. In that case, this field
         saves you some time as you don't have to inspect the certificates
-        yourself to find out what valid hostnames might be.'''
-        return self.__certHostnames
+        yourself to find out what valid hostnames might be.''', factory=list)
+
+    def __init__(self, data, fields=None):
+        '''Builds the host from its raw data.
+
+        Most of a result is in its endpoints, so a projection of a host is
+        given relative to each endpoint, as dotted paths such as ``'grade'``
+        or ``'details.cert.notAfter'``.  The fields of the host itself are
+        always built.  Reading any other field of an endpoint raises
+        :class:`AttributeError`.
+
+        :param dict data: The raw data
+        :param fields: The dotted paths of the only endpoint fields to build, or None for every field
+        '''
+        if fields is None:
+            loader = Host.loader()
+        else:
+            wanted = {field.name: True for field in Host.schema if not field.lazy}
+            wanted['endpoints'] = projection(fields)
+            loader = Host.loader(wanted)
+        loader(self, data)
@@ -5,35 +5,18 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-
 from ssllabs.object import Object
+from ssllabs.schema import Field
 
 class HstsPolicy(Object):
     '''The HSTS Policy, accessed from
     :meth:`ssllabs.endpointdetails.EndpointDetails.hstsPolicy`'''
-    def __init__(self, data):
-        self.__LONG_MAX_AGE = data.get('LONG_MAX_AGE')
-        self.__header = data.get('header')
-        self.__status = data.get('status')
-        self.__error = data.get('error')
-        self.__maxAge = data.get('maxAge')
-        self.__includeSubDomains = data.get('includeSubDomains')
-        self.__preload = data.get('preload')
-        self.__directives = data.get('directives')
 
-    @property
-    def LONG_MAX_AGE(self):
+    LONG_MAX_AGE = Field(
         '''this constant contains what SSL Labs considers to be
-        sufficiently large max-age value'''
-        return self.__LONG_MAX_AGE
-
-    @property
-    def header(self):
-        '''the contents of the HSTS response header, if present'''
-        return self.__header
-
-    @property
-    def status(self):
+        sufficiently large max-age value''')
+    header = Field('''the contents of the HSTS response header, if present''')
+    status = Field(
         '''HSTS status:
 
         unknown
@@ -46,33 +29,14 @@ class HstsPolicy(Object):
             header present, but couldn't be parsed
         disabled
             header present and syntatically correct, but HSTS is disabled
-        '''
-        return self.__status
-
-    @property
-    def error(self):
-        '''error message when error is encountered, null otherwise'''
-        return self.__error
-
-    @property
-    def maxAge(self):
+        ''')
+    error = Field('''error message when error is encountered, null otherwise''')
+    maxAge = Field(
         '''the max-age value specified in the policy; null if policy is
         missing or invalid or on parsing error; the maximum value currently
-        supported is 9223372036854775807'''
-        return self.__maxAge
-
-    @property
-    def includeSubDomains(self):
+        supported is 9223372036854775807''')
+    includeSubDomains = Field(
         '''true if the includeSubDomains directive is set; null
-        otherwise'''
-        return self.__includeSubDomains
-
-    @property
-    def preload(self):
-        '''true if the preload directive is set; null otherwise'''
-        return self.__preload
-
-    @property
-    def directives(self):
-        '''list of raw policy directives'''
-        return self.__directives
+        otherwise''')
+    preload = Field('''true if the preload directive is set; null otherwise''')
+    directives = Field('''list of raw policy directives''')
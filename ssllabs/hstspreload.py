@@ -5,10 +5,8 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-from datetime import datetime, timedelta
-
 from ssllabs.object import Object
-from ssllabs.util import objectornone
+from ssllabs.schema import Field, Timestamp
 
 class HstsPreload(Object):
     '''The HSTS Preload, accessed from
@@ -21,34 +19,15 @@ class HstsPreload(Object):
     includeSubDomains enabled or if there is an explicit entry for
     "www.example.com".
     '''
-    def __init__(self, data):
-        self.__source = data.get('source')
-        self.__status = data.get('status')
-        self.__error = data.get('error')
-        self.__sourceTime = (datetime.utcfromtimestamp(0) + timedelta(milliseconds=data['sourceTime'])) if 'sourceTime' in data else None
-
-    @property
-    def source(self):
-        '''source name'''
-        return self.__source
 
-    @property
-    def status(self):
+    source = Field('''source name''')
+    status = Field(
         '''preload status:
             
         * error
         * unknown - either before the preload status is checked, or if the information is not available for some reason.
         * absent
         * present
-        '''
-        return self.__status
-
-    @property
-    def error(self):
-        '''error message, when status is "error"'''
-        return self.__error
-
-    @property
-    def sourceTime(self):
-        '''datetime, when the preload database was retrieved'''
-        return self.__sourceTime
+        ''')
+    error = Field('''error message, when status is "error"''')
+    sourceTime = Timestamp('''datetime, when the preload database was retrieved''')
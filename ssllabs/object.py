@@ -5,11 +5,29 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-class Object(object):
+import six
+
+from ssllabs.schema import Schema
+
+class Object(six.with_metaclass(Schema, object)):
     '''This class mostly exists simply to allow all inheriting classes to have
-    access to the :meth:`rawdata` property'''
+    access to the :meth:`rawdata` property.
+
+    Inheriting classes declare their fields with :mod:`ssllabs.schema`, which
+    builds their properties, slots and loaders.  Nested objects and lists of
+    them are decoded from the raw data the first time their property is
+    accessed, rather than on construction, so only the parts of a result that
+    are actually read are ever built.
+
+    Every object keeps its attributes in ``__slots__`` rather than a
+    ``__dict__``.  When the raw data isn't needed, :meth:`compact` can drop
+    it, leaving only the decoded attributes.'''
+
+    __slots__ = (
+        '__rawdata',
+        )
 
-    def __new__(typ, data):
+    def __new__(typ, data=None, fields=None):
         obj = object.__new__(typ)
         obj.__rawdata = data
         return obj
@@ -27,3 +45,26 @@ class Object(object):
         :rtype: dict
         '''
         return self.__rawdata
+
+    def compact(self):
+        '''Decodes everything that hasn't been decoded yet, in this object and
+        every object nested in it, and then drops the raw data of all of them.
+
+        This is worth doing for objects that are kept around for a long time,
+        as the raw data otherwise takes about as much memory again as the
+        objects themselves.  Afterwards, :meth:`rawdata` is None.
+
+        :returns: this object
+        '''
+        for field in type(self).schema:
+            if field.lazy:
+                try:
+                    value = getattr(self, field.name)
+                except AttributeError:
+                    # Left out by a projection
+                    continue
+                for item in (value if isinstance(value, list) else (value,)):
+                    if isinstance(item, Object):
+                        item.compact()
+        self.__rawdata = None
+        return self
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Checking of finished hosts against a policy of rules.
+
+A :class:`Policy` is declared with keyword arguments, or loaded from a JSON
+file of the same names with :func:`load`, such as::
+
+    {
+        "grade": "A-",
+        "expiry": 30,
+        "protocols": ["SSL 2.0", "SSL 3.0", "TLS 1.0"],
+        "hstsMaxAge": 15552000,
+        "rc4": false,
+        "vulnerabilities": ["heartbleed", "poodle", "freak", "logjam", "drownVulnerable"],
+        "chainIssues": ["incompletechain", "wrongorder"]
+    }
+
+Each rule is compiled once, when the policy is made, into a predicate over
+the raw data of an endpoint, so that checking a host doesn't build any of
+its objects.  A host passes if none of the rules fail on any of its graded
+endpoints; the :class:`Verdict` lists the reason of every failure::
+
+    policy = load('policy.json')
+    for name, result in scheduler.run(hosts, fields=policy.fields):
+        verdict = policy.check(result)
+        if not verdict.passed:
+            print(name, verdict.reasons)
+
+As the rules read the raw data, hosts must still have it, rather than having
+been compacted, and a projection of them must include :meth:`Policy.fields`.
+'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from collections import namedtuple
+from datetime import timedelta
+import io
+import json
+import time
+
+from ssllabs.chain import Issues
+from ssllabs.schema import EPOCH
+
+#: Every grade, from best to worst
+GRADES = (
+    'A+', 'A', 'A-',
+    'B+', 'B', 'B-',
+    'C+', 'C', 'C-',
+    'D+', 'D', 'D-',
+    'E+', 'E', 'E-',
+    'F+', 'F', 'F-',
+    'T', 'M', 'EMPTY',
+    )
+
+#: The vulnerabilities that may be forbidden, each as the
+#: :class:`ssllabs.endpointdetails.EndpointDetails` property telling it and
+#: the values of that property that mean the endpoint is vulnerable; True
+#: for the flags
+VULNERABILITIES = {
+    'vulnBeast': True,
+    'heartbleed': True,
+    'poodle': True,
+    'poodleTls': 2,
+    'openSslCcs': 3,
+    'openSSLLuckyMinus20': 2,
+    'freak': True,
+    'logjam': True,
+    'drownVulnerable': True,
+    }
+
+#: A failed rule, as the name of the rule, the IP address of the endpoint it
+#: failed on (None for the host as a whole), and the reason
+Failure = namedtuple('Failure', ('rule', 'ipAddress', 'reason'))
+
+class Verdict(object):
+    '''The result of checking one host against a policy.'''
+
+    __slots__ = (
+        '__failures',
+        '__grade',
+        '__expires',
+        )
+
+    def __init__(self, failures, grade, expires):
+        self.__failures = failures
+        self.__grade = grade
+        self.__expires = expires
+
+    @property
+    def passed(self):
+        '''Whether no rule failed'''
+        return not self.__failures
+
+    @property
+    def failures(self):
+        '''The list of :data:`Failure` tuples of the rules that failed, in the
+        order of the endpoints'''
+        return self.__failures
+
+    @property
+    def reasons(self):
+        '''The reasons of the failures, as strings prefixed with their
+        endpoint'''
+        return ['{}: {}'.format(failure.ipAddress, failure.reason) if failure.ipAddress is not None else failure.reason for failure in self.__failures]
+
+    @property
+    def grade(self):
+        '''The worst grade of the endpoints, 'EMPTY' if none was graded, or
+        'A+' if that is allowed'''
+        return self.__grade
+
+    @property
+    def expires(self):
+        '''The earliest certificate expiry of the graded endpoints, as a UTC
+        datetime, or None'''
+        return self.__expires
+
+def _details(endpoint):
+    return endpoint.get('details') or {}
+
+def _protocols(forbidden):
+    forbidden = frozenset(forbidden)
+
+    def check(endpoint, now):
+        found = sorted(name for name in ('{} {}'.format(protocol.get('name'), protocol.get('version')) for protocol in _details(endpoint).get('protocols') or ()) if name in forbidden)
+        if found:
+            return 'supports {}'.format(', '.join(found))
+    return check
+
+def _hsts(minimum):
+    def check(endpoint, now):
+        policy = _details(endpoint).get('hstsPolicy') or {}
+        if policy.get('status') != 'present':
+            return 'HSTS is {}'.format(policy.get('status', 'unknown'))
+        if (policy.get('maxAge') or 0) < minimum:
+            return 'HSTS max-age {} is below {}'.format(policy.get('maxAge'), minimum)
+    return check
+
+def _rc4(endpoint, now):
+    if _details(endpoint).get('supportsRc4'):
+        return 'supports RC4'
+
+def _vulnerabilities(forbidden):
+    vulnerable = tuple((name, VULNERABILITIES[name]) for name in forbidden)
+
+    def check(endpoint, now):
+        details = _details(endpoint)
+        found = [name for name, value in vulnerable if details.get(name) == value]
+        if found:
+            return 'vulnerable to {}'.format(', '.join(found))
+    return check
+
+def _chain(names):
+    bits = tuple((name, Issues.bits[name]) for name in names)
+    mask = 0
+    for name, bit in bits:
+        mask |= bit
+
+    def check(endpoint, now):
+        issues = ((_details(endpoint).get('chain') or {}).get('issues') or 0) & mask
+        if issues:
+            return 'chain issues: {}'.format(', '.join(name for name, bit in bits if issues & bit))
+    return check
+
+def _expiry(days):
+    margin = days * 86400000
+
+    def check(endpoint, now):
+        notAfter = (_details(endpoint).get('cert') or {}).get('notAfter')
+        if notAfter is not None and notAfter - now <= margin:
+            return 'certificate expires in {} days'.format(int((notAfter - now) // 86400000))
+    return check
+
+class Policy(object):
+    '''A set of rules that every graded endpoint of a host must meet.
+    Endpoints without a grade, which couldn't be assessed, are left out.'''
+
+    def __init__(self, grade='A+', ignoreTrust=False, allowEmpty=False, expiry=None, protocols=(), hstsMaxAge=None, rc4=True, vulnerabilities=(), chainIssues=()):
+        '''initializes the policy, compiling its rules.
+
+        :param str grade: The worst acceptable grade, from :data:`GRADES`
+        :param bool ignoreTrust: Whether to judge the grades with trust issues ignored
+        :param bool allowEmpty: Whether a host without any graded endpoint passes, rather than getting the grade 'EMPTY'
+        :param int expiry: The fewest days that must be left before the certificate of each endpoint expires, if any
+        :param protocols: An iterable of forbidden protocols, by name and version, such as 'SSL 3.0'
+        :param int hstsMaxAge: The smallest HSTS max-age allowed, in seconds; if set, HSTS is required
+        :param bool rc4: Whether RC4 suites are allowed
+        :param vulnerabilities: An iterable of forbidden vulnerabilities, from :data:`VULNERABILITIES`
+        :param chainIssues: An iterable of forbidden chain issues, by the names of the :class:`ssllabs.chain.Issues` flags
+        :raises ValueError: if a grade, vulnerability or chain issue is unknown
+        '''
+        if grade not in GRADES:
+            raise ValueError('Unknown grade: {}'.format(grade))
+        for name in vulnerabilities:
+            if name not in VULNERABILITIES:
+                raise ValueError('Unknown vulnerability: {}'.format(name))
+        for name in chainIssues:
+            if name not in Issues.bits:
+                raise ValueError('Unknown chain issue: {}'.format(name))
+
+        self.__grade = GRADES.index(grade)
+        self.__expiry = expiry
+        self.__gradekey = 'gradeTrustIgnored' if ignoreTrust else 'grade'
+        self.__allowEmpty = allowEmpty
+        # (name, check, fields) of every rule, other than the grade
+        rules = []
+        if expiry is not None:
+            rules.append(('expiry', _expiry(expiry), ['details.cert.notAfter']))
+        if protocols:
+            rules.append(('protocols', _protocols(protocols), ['details.protocols']))
+        if hstsMaxAge is not None:
+            rules.append(('hsts', _hsts(hstsMaxAge), ['details.hstsPolicy']))
+        if not rc4:
+            rules.append(('rc4', _rc4, ['details.supportsRc4']))
+        if vulnerabilities:
+            rules.append(('vulnerabilities', _vulnerabilities(tuple(vulnerabilities)), ['details.' + name for name in vulnerabilities]))
+        if chainIssues:
+            rules.append(('chainIssues', _chain(tuple(chainIssues)), ['details.chain.issues']))
+        self.__rules = tuple((name, check) for name, check, fields in rules)
+        self.__fields = ['grade', 'gradeTrustIgnored', 'details.cert.notAfter']
+        for name, check, fields in rules:
+            self.__fields.extend(field for field in fields if field not in self.__fields)
+
+    @property
+    def grade(self):
+        '''The worst acceptable grade'''
+        return GRADES[self.__grade]
+
+    @property
+    def expiry(self):
+        '''The fewest days that must be left before each certificate expires,
+        or None'''
+        return self.__expiry
+
+    @property
+    def fields(self):
+        '''The dotted paths of the endpoint fields the rules read, to be
+        passed as the fields of :meth:`ssllabs.client.Client.analyze`'''
+        return list(self.__fields)
+
+    def check(self, host, now=None):
+        '''Checks a finished host against every rule.
+
+        :param host: The :class:`ssllabs.host.Host`, or its raw data
+        :param float now: The time to judge expiry by, in seconds since the epoch; the current time if not set
+        :raises ValueError: if the host has been compacted
+        :rtype: Verdict
+        '''
+        data = getattr(host, 'rawdata', host)
+        if data is None:
+            raise ValueError('Compacted hosts have no raw data to check')
+        now = int((time.time() if now is None else now) * 1000)
+
+        failures = []
+        grade = None
+        expires = None
+        for endpoint in data.get('endpoints') or ():
+            name = endpoint.get(self.__gradekey)
+            if name is None:
+                continue
+            ipAddress = endpoint.get('ipAddress')
+            index = GRADES.index(name)
+            if grade is None or index > grade:
+                grade = index
+            if index > self.__grade:
+                failures.append(Failure('grade', ipAddress, 'grade {} is below {}'.format(name, GRADES[self.__grade])))
+            notAfter = (_details(endpoint).get('cert') or {}).get('notAfter')
+            if notAfter is not None and (expires is None or notAfter < expires):
+                expires = notAfter
+            for rule, check in self.__rules:
+                reason = check(endpoint, now)
+                if reason is not None:
+                    failures.append(Failure(rule, ipAddress, reason))
+
+        if grade is None:
+            if self.__allowEmpty:
+                grade = GRADES.index('A+')
+            else:
+                grade = GRADES.index('EMPTY')
+                if grade > self.__grade:
+                    failures.append(Failure('grade', None, 'no endpoint was graded'))
+        return Verdict(failures, GRADES[grade], EPOCH + timedelta(milliseconds=expires) if expires is not None else None)
+
+    def evaluate(self, hosts, now=None):
+        '''Checks many hosts, judging all of them by the same time.
+
+        :param hosts: An iterable of hosts, as taken by :meth:`check`
+        :param float now: The time to judge expiry by, in seconds since the epoch; the current time if not set
+        :returns: an iterator of their verdicts, in order
+        '''
+        now = time.time() if now is None else now
+        for host in hosts:
+            yield self.check(host, now)
+
+def load(path):
+    '''Loads a policy from a JSON file holding an object of the keyword
+    arguments of :class:`Policy`.
+
+    :param str path: The path of the file
+    :raises ValueError: if the file isn't a JSON object, or holds an unknown rule
+    :rtype: Policy
+    '''
+    with io.open(path, 'r', encoding='utf-8') as file:
+        rules = json.load(file)
+    if not isinstance(rules, dict):
+        raise ValueError('A policy must be a JSON object')
+    try:
+        return Policy(**{str(key): value for key, value in rules.items()})
+    except TypeError as e:
+        raise ValueError('Unknown rule in {}: {}'.format(path, e))
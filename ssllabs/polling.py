@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Polling policies, deciding how long to wait between polls of an assessment
+in progress.  A policy may be given to :meth:`ssllabs.client.Client.analyze`,
+:class:`ssllabs.scheduler.Scheduler` and :class:`ssllabs.aio.AsyncClient`.
+
+A single policy object may be shared by any number of assessments at once;
+any state it keeps is tracked per host.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import time
+
+class Polling(object):
+    '''A fixed polling policy, waiting the same time between every poll'''
+
+    def __init__(self, interval=3, dnsinterval=1):
+        '''initializes the policy.
+
+        :param float interval: The time to wait between polls of an assessment in progress, in seconds
+        :param float dnsinterval: The time to wait between polls while the assessment is resolving DNS, in seconds
+        '''
+        self.__interval = interval
+        self.__dnsinterval = dnsinterval
+
+    @property
+    def interval(self):
+        '''The time to wait between polls of an assessment in progress, in
+        seconds'''
+        return self.__interval
+
+    @property
+    def dnsinterval(self):
+        '''The time to wait between polls while the assessment is resolving
+        DNS, in seconds'''
+        return self.__dnsinterval
+
+    def delay(self, host):
+        '''Gets the time to wait before the next poll.
+
+        :param ssllabs.host.Host host: The data of the last poll
+        :returns: the time to wait, in seconds
+        :rtype: float
+        '''
+        return self.__dnsinterval if host.status == 'DNS' else self.__interval
+
+    def reset(self, host):
+        '''Forgets any state kept for a host, once its assessment is over.
+
+        :param str host: The assessment host, as in :meth:`ssllabs.host.Host.host`
+        '''
+        pass
+
+class AdaptivePolling(Polling):
+    '''A polling policy that waits according to how much work is left.
+
+    The remaining time of an assessment is estimated from the
+    :meth:`ssllabs.endpoint.Endpoint.eta` of its unfinished endpoints, and
+    from the rate at which their :meth:`ssllabs.endpoint.Endpoint.progress`
+    has moved since the last poll, taking whichever finishes sooner.  Each
+    wait is a fraction of that estimate, so that the polls close in on the
+    expected end of the assessment.  Once the estimate is overrun, the waits
+    grow exponentially instead, as the estimate is evidently wrong.
+
+    No host is polled more than about maxpolls times: once the polls left are
+    few, the waits are stretched to spread them over the remaining time, and
+    once they are used up, every wait is maxinterval.
+    '''
+
+    def __init__(self, interval=5, dnsinterval=1, mininterval=2, maxinterval=60, fraction=0.5, backoff=2, maxpolls=30, clock=time.time):
+        '''initializes the policy.
+
+        :param float interval: The time to wait while there is nothing to estimate the remaining time from, in seconds
+        :param float dnsinterval: The time to wait between polls while the assessment is resolving DNS, in seconds
+        :param float mininterval: The shortest time to wait, in seconds
+        :param float maxinterval: The longest time to wait, in seconds
+        :param float fraction: The fraction of the estimated remaining time to wait
+        :param float backoff: The factor the wait grows by with each poll once the estimate is overrun
+        :param int maxpolls: The number of polls of an assessment after which every wait is maxinterval
+        :param clock: The function used to tell the time, returning seconds
+        '''
+        super(AdaptivePolling, self).__init__(interval=interval, dnsinterval=dnsinterval)
+        self.__mininterval = mininterval
+        self.__maxinterval = maxinterval
+        self.__fraction = fraction
+        self.__backoff = backoff
+        self.__maxpolls = maxpolls
+        self.__clock = clock
+        # host -> [polls, last time, last progress, last delay, expected end]
+        self.__state = {}
+
+    def delay(self, host):
+        '''Gets the time to wait before the next poll.
+
+        :param ssllabs.host.Host host: The data of the last poll
+        :returns: the time to wait, in seconds
+        :rtype: float
+        '''
+        now = self.__clock()
+        state = self.__state.setdefault(host.host, [0, None, None, None, None])
+        state[0] += 1
+        polls, then, before, last, deadline = state
+
+        if host.status == 'DNS':
+            state[3] = self.dnsinterval
+            return self.dnsinterval
+
+        progress = 0
+        estimates = []
+        if host.endpoints:
+            eta = 0
+            for endpoint in host.endpoints:
+                progress += max(endpoint.progress or 0, 0)
+                if endpoint.statusMessage != 'Ready' and endpoint.eta is not None:
+                    eta += max(endpoint.eta.total_seconds(), 0)
+            progress /= len(host.endpoints)
+            if eta > 0:
+                estimates.append(eta)
+
+        if then is not None and progress > before and now > then:
+            rate = (progress - before) / (now - then)
+            estimates.append((100 - progress) / rate)
+
+        if estimates:
+            deadline = now + min(estimates)
+
+        state[1] = now
+        state[2] = progress
+        state[4] = deadline
+
+        if polls > self.__maxpolls:
+            delay = self.__maxinterval
+        elif deadline is None:
+            delay = self.interval
+        elif deadline > now:
+            remaining = deadline - now
+            # Spread the polls that are left over the remaining time
+            delay = max(remaining * self.__fraction, remaining / (self.__maxpolls - polls + 1))
+        else:
+            delay = (last or self.__mininterval) * self.__backoff
+
+        delay = min(max(delay, self.__mininterval), self.__maxinterval)
+        state[3] = delay
+        return delay
+
+    def reset(self, host):
+        '''Forgets the state kept for a host, once its assessment is over.
+
+        :param str host: The assessment host, as in :meth:`ssllabs.host.Host.host`
+        '''
+        self.__state.pop(host, None)
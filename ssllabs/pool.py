@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Parsing of analyze responses in a pool of processes.
+
+Decoding the JSON of a finished ``all=done`` response takes milliseconds of
+CPU under the GIL, which adds up when many assessments finish at once.  A
+:class:`ParsePool` does the decoding in worker processes, so that it scales
+with cores and leaves the calling thread free.  By default, workers send
+back the decoded raw data, which unpickles several times faster than the
+JSON decodes, and the :class:`ssllabs.host.Host` is built over it in the
+calling process; as its nested objects are only decoded on first access,
+that costs next to nothing.  With skip or fields, the workers also leave out
+everything not needed, so that less is sent back.
+
+With compact set, workers build the whole :class:`ssllabs.host.Host` and
+send it back after :meth:`ssllabs.object.Object.compact`.  Unpickling it
+costs about as much as building it did, so this only pays off when the
+callers would decode everything anyway and keep the hosts without their raw
+data.
+
+The pool may be used on its own::
+
+    with ParsePool() as pool:
+        hosts = list(pool.map(bodies))
+
+or given to :class:`ssllabs.aio.AsyncClient`, which then hands it every
+large response.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import json
+
+from ssllabs.endpoint import Endpoint
+from ssllabs.host import Host
+from ssllabs import stream
+
+def _parse(body, skip=(), keep=None, fields=None, compact=False):
+    '''Decodes a response body in a worker.'''
+    if skip or keep is not None:
+        data = stream.loads(body, skip, keep)
+    else:
+        data = json.loads(body.decode('utf-8') if isinstance(body, bytes) else body)
+    if compact and data.get('status') not in {'IN_PROGRESS', 'DNS'}:
+        return Host(data, fields=fields).compact()
+    return data
+
+class ParsePool(object):
+    '''A pool of processes decoding analyze responses into
+    :class:`ssllabs.host.Host` objects.'''
+
+    def __init__(self, processes=None, skip=(), fields=None, compact=False, threshold=65536, executor=None):
+        '''initializes the pool.  The worker processes are started as they
+        are needed.
+
+        :param int processes: The number of worker processes; the number of CPUs if not set
+        :param skip: An iterable of dotted paths within each endpoint to leave out, as described for :func:`ssllabs.stream.tree`
+        :param fields: An iterable of the only dotted paths within each endpoint to build, as described for :meth:`ssllabs.client.Client.analyze`
+        :param bool compact: Whether workers send back whole, compacted hosts rather than raw data
+        :param int threshold: The size in bytes below which :class:`ssllabs.aio.AsyncClient` decodes responses itself, as sending them to a worker would cost more
+        :param concurrent.futures.Executor executor: The executor to run the workers in, in place of a new process pool
+        '''
+        self.__executor = executor if executor is not None else ProcessPoolExecutor(processes)
+        self.__fields = tuple(fields) if fields is not None else None
+        keep = None
+        if fields is not None:
+            # As in Client.analyze, the plain fields of the endpoints are kept
+            # for the progress of the assessment
+            keep = tuple(field.key for field in Endpoint.schema if not field.lazy) + self.__fields
+        self.__compact = compact
+        self.__threshold = threshold
+        self.__parse = functools.partial(_parse, skip=tuple(skip), keep=keep, fields=self.__fields, compact=compact)
+
+    @property
+    def threshold(self):
+        '''The size in bytes below which responses aren't worth sending to a
+        worker'''
+        return self.__threshold
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        '''Shuts the worker processes down, once they are done.'''
+        self.__executor.shutdown()
+
+    def submit(self, body):
+        '''Sends a response body to a worker.
+
+        :param bytes body: The body of an analyze response
+        :returns: a future of what the worker sends back, to be passed to :meth:`build`
+        :rtype: concurrent.futures.Future
+        '''
+        return self.__executor.submit(self.__parse, body)
+
+    def build(self, result):
+        '''Builds the host out of what a worker sent back, or out of the raw
+        data of a response that was decoded some other way.  Hosts still in
+        progress are built whole, as their progress is read from the fields
+        that a projection would leave out.
+
+        :param result: The result of a future from :meth:`submit`, or the raw data of a response
+        :rtype: ssllabs.host.Host
+        '''
+        if isinstance(result, Host):
+            return result
+        if result.get('status') in {'IN_PROGRESS', 'DNS'}:
+            return Host(result)
+        host = Host(result, fields=self.__fields)
+        if self.__compact:
+            host.compact()
+        return host
+
+    def parse(self, body):
+        '''Decodes a response body in a worker, waiting for it.
+
+        :param bytes body: The body of an analyze response
+        :rtype: ssllabs.host.Host
+        '''
+        return self.build(self.submit(body).result())
+
+    def map(self, bodies):
+        '''Decodes many response bodies across the workers.
+
+        :param bodies: An iterable of analyze response bodies
+        :returns: an iterator of the hosts, in the same order as the bodies
+        '''
+        for result in self.__executor.map(self.__parse, bodies):
+            yield self.build(result)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Minimal records of the progress of an assessment, yielded in place of
+:class:`ssllabs.host.Host` objects by
+:meth:`ssllabs.client.Client.analyze` with lightweight set.
+
+A poll of an assessment in progress is only read for its status and the
+progress of its endpoints, and polls far outnumber finished results, so
+these records declare only those fields.  They have the same names as on
+:class:`ssllabs.host.Host` and :class:`ssllabs.endpoint.Endpoint`, so that
+anything reading only them, such as :class:`ssllabs.polling.AdaptivePolling`,
+takes either.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from ssllabs.object import Object
+from ssllabs.schema import Duration, Field, ListOf
+
+class EndpointProgress(Object):
+    '''The progress of one endpoint'''
+
+    ipAddress = Field('''endpoint IP address, in IPv4 or IPv6 format.''')
+    statusMessage = Field(
+        '''assessment status message; this field will contain "Ready" if the
+        endpoint assessment was successful.''')
+    statusDetails = Field('''code of the operation currently in progress''')
+    statusDetailsMessage = Field('''description of the operation currently in progress''')
+    progress = Field(
+        '''assessment progress, which is a value from 0 to 100, and -1 if the
+        assessment has not yet started''')
+    eta = Duration(
+        '''estimated time, as a timedelta, until the completion of the
+        assessment''', unit='seconds')
+
+class Progress(Object):
+    '''The progress of an assessment, as of one poll'''
+
+    host = Field('''assessment host, which can be a hostname or an IP address''')
+    status = Field(
+        '''assessment status; possible values: DNS, ERROR, IN_PROGRESS, and
+        READY.''')
+    statusMessage = Field('''status message in English''')
+    endpoints = ListOf(EndpointProgress, '''list of :class:`EndpointProgress` objects''')
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Continuous rescanning of many hosts, most valuable first.
+
+A :class:`Rescanner` holds every host it is given in a queue ordered by the
+time each is next due, as decided from its last result by a
+:class:`Staleness` policy, and runs a :class:`ssllabs.scheduler.Scheduler`
+over the hosts that are due, for as long as it is iterated.  Hosts that
+were never assessed are due at once, and every finished result puts its
+host back into the queue.  The queue is a heap, so that taking the next
+host and putting one back cost O(log n), with nothing ever scanned in
+full::
+
+    rescanner = Rescanner(Client())
+    for name in hosts:
+        rescanner.add(name)
+    for name, result in rescanner.run():
+        store(name, result)
+
+It can also be run on its own, with the ``ssllabs-rescan`` program, which
+writes every result as a line of JSON.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import argparse
+import heapq
+import io
+import json
+import sys
+import time
+from datetime import timedelta
+
+from ssllabs.client import Client
+from ssllabs.expiry import FIELDS, expiries
+from ssllabs.policy import GRADES
+from ssllabs.polling import AdaptivePolling
+from ssllabs.scheduler import Scheduler
+from ssllabs.schema import EPOCH
+from ssllabs.util import readhosts
+
+def _seconds(moment):
+    '''A naive UTC datetime as seconds since the epoch.'''
+    return (moment - EPOCH).total_seconds()
+
+class Staleness(object):
+    '''The policy deciding when each host is due for its next assessment,
+    from its last result.
+
+    A finished result is due again maxAge after its testTime, or only
+    failing after it if its worst grade is below grade, as those are the
+    results most likely to change.  It is due sooner if one of its
+    certificates comes within expiry of expiring, and once it has expired,
+    to find whether it was renewed.  A result with status ERROR is due when
+    the API drops it from its cache, at its cacheExpiryTime, or error after
+    it was seen if that isn't given, and so is an assessment that failed
+    with an exception.'''
+
+    #: The endpoint fields read, to be included in any projection of the results
+    fields = ('grade',) + FIELDS
+
+    def __init__(self, maxAge=timedelta(days=7), failing=timedelta(days=1), grade='A-', expiry=timedelta(days=14), error=timedelta(hours=1)):
+        '''initializes the policy.
+
+        :param datetime.timedelta maxAge: The time after which a passing result is due
+        :param datetime.timedelta failing: The time after which a result with a grade below grade is due
+        :param str grade: The worst grade that counts as passing, from :data:`ssllabs.policy.GRADES`
+        :param datetime.timedelta expiry: How long before a certificate expires its host is due
+        :param datetime.timedelta error: The time after which a failed assessment is due, if the API doesn't say
+        :raises ValueError: if the grade is unknown
+        '''
+        if grade not in GRADES:
+            raise ValueError('Unknown grade: {}'.format(grade))
+        self.__maxAge = maxAge.total_seconds()
+        self.__failing = failing.total_seconds()
+        self.__grade = GRADES.index(grade)
+        self.__expiry = expiry.total_seconds()
+        self.__error = error.total_seconds()
+
+    def due(self, result, now):
+        '''Gets the time a host is next due.
+
+        :param result: The last :class:`ssllabs.host.Host` of the host, or the exception its assessment failed with
+        :param float now: The current time, in seconds since the epoch
+        :returns: the time, in seconds since the epoch
+        :rtype: float
+        '''
+        if isinstance(result, Exception):
+            return now + self.__error
+        if result.status == 'ERROR':
+            if result.cacheExpiryTime is not None:
+                return max(result.cacheExpiryTime / 1000, now)
+            return now + self.__error
+
+        tested = _seconds(result.testTime) if result.testTime is not None else now
+        grades = [GRADES.index(endpoint.grade) for endpoint in result.endpoints if getattr(endpoint, 'grade', None) in GRADES]
+        due = tested + (self.__failing if grades and max(grades) > self.__grade else self.__maxAge)
+
+        certificates = expiries(result)
+        if certificates:
+            expires = _seconds(min(certificate.notAfter for certificate in certificates))
+            if expires - self.__expiry > tested:
+                due = min(due, expires - self.__expiry)
+            elif expires > tested:
+                due = min(due, expires)
+        return due
+
+class _Queue(object):
+    '''The hosts of a rescanner by the time they are due, as a heap, with
+    the deque methods a :class:`ssllabs.scheduler.Scheduler` takes hosts
+    from.  Moving a host leaves its old item in the heap, to be skipped
+    when it comes up.'''
+
+    def __init__(self, clock):
+        self.__clock = clock
+        # Heap of (due, tiebreaker, name); the item of each host is the one
+        # whose tiebreaker is in current, along with its due time
+        self.__heap = []
+        self.__current = {}
+        self.__counter = 0
+        # Hosts taken by the scheduler and not yet put back, by due time
+        self.taken = {}
+        # Set to stop handing out hosts
+        self.closed = False
+
+    def __len__(self):
+        return len(self.__current)
+
+    def __contains__(self, name):
+        return name in self.__current or name in self.taken
+
+    def __live(self, item):
+        current = self.__current.get(item[2])
+        return current is not None and current[0] == item[1]
+
+    def __top(self):
+        '''The current item at the top of the heap, or None.'''
+        heap = self.__heap
+        while heap and not self.__live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def __bool__(self):
+        if self.closed:
+            return False
+        top = self.__top()
+        return top is not None and top[0] <= self.__clock()
+
+    __nonzero__ = __bool__
+
+    def push(self, name, due):
+        self.taken.pop(name, None)
+        self.__counter += 1
+        self.__current[name] = (self.__counter, due)
+        heapq.heappush(self.__heap, (due, self.__counter, name))
+        if len(self.__heap) > 2 * len(self.__current) + 64:
+            self.__heap = [item for item in self.__heap if self.__live(item)]
+            heapq.heapify(self.__heap)
+
+    def remove(self, name):
+        self.taken.pop(name, None)
+        self.__current.pop(name, None)
+
+    def due(self, name):
+        if name in self.__current:
+            return self.__current[name][1]
+        return self.taken.get(name)
+
+    def next(self):
+        '''The time the next host is due, or None if there is none.'''
+        top = self.__top()
+        return top[0] if top is not None else None
+
+    def popleft(self):
+        due, counter, name = self.__top()
+        heapq.heappop(self.__heap)
+        del self.__current[name]
+        self.taken[name] = due
+        return name
+
+    def appendleft(self, name):
+        self.push(name, self.taken.get(name, self.__clock()))
+
+class Rescanner(object):
+    '''Runs assessments of a changing set of hosts, each as it becomes due,
+    as many at once as the API allows.'''
+
+    def __init__(self, client=None, staleness=None, polling=None, ratewait=15, idle=60, sleep=time.sleep, clock=time.time):
+        '''initializes the rescanner.
+
+        :param ssllabs.client.Client client: The client to run assessments through; a new one is made if not set
+        :param Staleness staleness: The policy deciding when each host is due; a default :class:`Staleness` if not set
+        :param ssllabs.polling.Polling polling: The policy deciding how long to wait between polls of each assessment; an :class:`ssllabs.polling.AdaptivePolling` if not set
+        :param float ratewait: The time to hold off new assessments after the API refused one, in seconds, as for :class:`ssllabs.scheduler.Scheduler`
+        :param float idle: The longest time to sleep while no host is due, in seconds, so that hosts added meanwhile aren't left waiting
+        :param sleep: The function used to wait, taking seconds
+        :param clock: The function used to tell the time, returning seconds
+        '''
+        self.__scheduler = Scheduler(client, polling=polling if polling is not None else AdaptivePolling(), ratewait=ratewait, sleep=sleep, clock=clock)
+        self.__staleness = staleness if staleness is not None else Staleness()
+        self.__idle = idle
+        self.__sleep = sleep
+        self.__clock = clock
+        self.__queue = _Queue(clock)
+        self.__stopped = False
+
+    @property
+    def scheduler(self):
+        '''The :class:`ssllabs.scheduler.Scheduler` running the assessments'''
+        return self.__scheduler
+
+    @property
+    def staleness(self):
+        '''The :class:`Staleness` policy'''
+        return self.__staleness
+
+    def __len__(self):
+        '''The number of hosts held, other than those being assessed'''
+        return len(self.__queue)
+
+    def __contains__(self, name):
+        return name in self.__queue
+
+    def add(self, name, last=None):
+        '''Adds a host, or moves it if it is already held.
+
+        :param str name: The host
+        :param last: The last result of the host, as taken by :meth:`Staleness.due`, to decide when it is due; if not set, it is due at once
+        '''
+        now = self.__clock()
+        self.__queue.push(name, self.__staleness.due(last, now) if last is not None else now)
+
+    def remove(self, name):
+        '''Drops a host.  If it is being assessed, its result is still
+        yielded, but it isn't put back.
+
+        :param str name: The host
+        '''
+        self.__queue.remove(name)
+
+    def due(self, name):
+        '''Gets the time a host is next due, or was due if it is being
+        assessed.
+
+        :param str name: The host
+        :returns: the time, in seconds since the epoch, or None if the host isn't held
+        :rtype: float
+        '''
+        return self.__queue.due(name)
+
+    def stop(self):
+        '''Makes :meth:`run` return once the assessments running are done,
+        without starting any more.'''
+        self.__queue.closed = True
+
+    def run(self, **kwargs):
+        '''A generator that assesses each host as it becomes due, yielding
+        every (host, result) tuple as the scheduler does, and putting the
+        host back into the queue by its result.  It goes on until
+        :meth:`stop` is called, or until no host is held.
+
+        :param kwargs: Other arguments passed to :meth:`ssllabs.client.Client.analyze`
+        '''
+        queue = self.__queue
+        queue.closed = False
+        while not queue.closed:
+            if not queue:
+                wake = queue.next()
+                if wake is None:
+                    return
+                self.__sleep(min(max(wake - self.__clock(), 0), self.__idle))
+                continue
+            for name, result in self.__scheduler.run(queue, **kwargs):
+                if name in queue.taken:
+                    queue.push(name, self.__staleness.due(result, self.__clock()))
+                yield name, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep rescanning a list of hosts, each as its last result goes stale, writing every result as a line of JSON.  By using this tool, you are bound by the SSL Labs terms of use: https://www.ssllabs.com/about/terms.html.  This program sends data through the SSL Labs remote servers.')
+    parser.add_argument('-f', '--file', help='A file listing the hosts to rescan, one per line, or - for stdin', required=True)
+    parser.add_argument('-o', '--output', help='The file to append results to (default stdout)')
+    parser.add_argument('-u', '--url', help='The entrypoint URL of the API (default %(default)s)', default='https://api.ssllabs.com/api/v2')
+    parser.add_argument('-m', '--max-age', help='The days after which a passing result is rescanned (default %(default)s)', type=float, default=7)
+    parser.add_argument('-F', '--failing', help='The days after which a failing result is rescanned (default %(default)s)', type=float, default=1)
+    parser.add_argument('-g', '--grade', help='The worst grade that counts as passing (default %(default)s)', choices=GRADES, default='A-')
+    parser.add_argument('-x', '--expiry', help='The days before a certificate expires that its host is rescanned (default %(default)s)', type=float, default=14)
+    args = parser.parse_args()
+
+    staleness = Staleness(maxAge=timedelta(days=args.max_age), failing=timedelta(days=args.failing), grade=args.grade, expiry=timedelta(days=args.expiry))
+    rescanner = Rescanner(Client(args.url), staleness)
+    for name in readhosts(args.file):
+        rescanner.add(name)
+
+    output = sys.stdout if args.output is None else io.open(args.output, 'a', encoding='utf-8')
+    try:
+        for name, result in rescanner.run():
+            data = {'host': name, 'due': rescanner.due(name)}
+            if isinstance(result, Exception):
+                data.update(status=None, error='{}: {}'.format(type(result).__name__, result))
+            else:
+                data.update(
+                    status=result.status,
+                    error=result.statusMessage if result.status == 'ERROR' else None,
+                    testTime=result.testTime.isoformat() if result.testTime is not None else None,
+                    grades={endpoint.ipAddress: endpoint.grade for endpoint in result.endpoints},
+                    )
+            output.write(json.dumps(data, sort_keys=True) + '\n')
+            output.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Retry policies for failed requests, which may be given to
+:class:`ssllabs.client.Client` and :class:`ssllabs.aio.AsyncClient`.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+import random
+
+from ssllabs import errors
+
+class Backoff(object):
+    '''An exponential backoff with jitter, used for one class of error.
+
+    The wait before retry number n (counting from 0) is base * factor ** n,
+    capped at cap, and then shortened by a random part of up to jitter of
+    itself, so that many clients failing at once don't all come back at once.
+    '''
+
+    def __init__(self, tries=5, base=5, factor=2, cap=300, jitter=0.5):
+        '''initializes the backoff.
+
+        :param int tries: The number of retries before giving up
+        :param float base: The wait before the first retry, in seconds
+        :param float factor: The factor the wait grows by with each retry
+        :param float cap: The longest wait, in seconds
+        :param float jitter: The largest part of each wait that may randomly be taken off, from 0 to 1
+        '''
+        self.__tries = tries
+        self.__base = base
+        self.__factor = factor
+        self.__cap = cap
+        self.__jitter = jitter
+
+    @property
+    def tries(self):
+        '''The number of retries before giving up'''
+        return self.__tries
+
+    def delay(self, attempt, random=random.random):
+        '''Gets the wait before a retry.
+
+        :param int attempt: The number of retries already done
+        :param random: The function giving random numbers from 0 to 1
+        :returns: the time to wait, in seconds, or None if no retries are left
+        :rtype: float
+        '''
+        if attempt >= self.__tries:
+            return None
+        delay = min(self.__base * self.__factor ** attempt, self.__cap)
+        return delay * (1 - self.__jitter * random())
+
+class Wait(object):
+    '''A wait before a failed request is retried, yielded by
+    :meth:`ssllabs.client.Client.analyze` with defer set, in place of
+    sleeping.'''
+
+    __slots__ = (
+        '__seconds',
+        '__error',
+        )
+
+    def __init__(self, seconds, error):
+        self.__seconds = seconds
+        self.__error = error
+
+    @property
+    def seconds(self):
+        '''The time to wait before going on, in seconds'''
+        return self.__seconds
+
+    @property
+    def error(self):
+        '''The error the request failed with'''
+        return self.__error
+
+class Retry(object):
+    '''The retry engine, deciding which failed requests are retried, and when.
+
+    Each class of error has its own :class:`Backoff`; an error that has no
+    backoff for its class or any of its base classes is never retried.  By
+    default, the errors the API uses to tell the client to slow down are
+    retried: :class:`ssllabs.errors.RequestRate`,
+    :class:`ssllabs.errors.ServiceNotAvailable` and
+    :class:`ssllabs.errors.ServiceOverloaded`.  The API asks to wait for
+    minutes after the last two, so their waits are much longer.
+
+    The engine also counts every retry and the time spent waiting, for all of
+    the clients it is given to.
+    '''
+
+    def __init__(self, policies=None, random=random.random):
+        '''initializes the retry engine.
+
+        :param dict policies: A mapping of exception classes to :class:`Backoff` objects, replacing the defaults
+        :param random: The function giving random numbers from 0 to 1, used for jitter
+        '''
+        if policies is None:
+            policies = {
+                errors.RequestRate: Backoff(tries=8, base=5, cap=120),
+                errors.ServiceNotAvailable: Backoff(tries=5, base=60, cap=900),
+                errors.ServiceOverloaded: Backoff(tries=5, base=120, cap=1800),
+                }
+        self.__policies = policies
+        self.__random = random
+        self.__retries = 0
+        self.__backofftime = timedelta()
+        self.__counts = {}
+
+    @property
+    def policies(self):
+        '''The mapping of exception classes to :class:`Backoff` objects'''
+        return self.__policies
+
+    @property
+    def retries(self):
+        '''The number of retries done so far'''
+        return self.__retries
+
+    @property
+    def backofftime(self):
+        '''The total time spent waiting before retries, as a timedelta'''
+        return self.__backofftime
+
+    @property
+    def counts(self):
+        '''A :class:`dict` of the number of retries done for each exception
+        class'''
+        return self.__counts
+
+    def backoff(self, error, attempt):
+        '''Decides whether to retry after an error, counting the retry if so.
+
+        :param Exception error: The error the request failed with
+        :param int attempt: The number of retries of this request already done
+        :returns: the time to wait before retrying, in seconds, or None if the error should be raised
+        :rtype: float
+        '''
+        for cls in type(error).__mro__:
+            if cls in self.__policies:
+                delay = self.__policies[cls].delay(attempt, self.__random)
+                break
+        else:
+            return None
+
+        if delay is not None:
+            self.__retries += 1
+            self.__backofftime += timedelta(seconds=delay)
+            self.__counts[cls] = self.__counts.get(cls, 0) + 1
+        return delay
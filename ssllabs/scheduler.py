@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from collections import deque
+import heapq
+import itertools
+import time
+
+from ssllabs import errors
+from ssllabs.client import Client
+from ssllabs.endpoint import Endpoint
+from ssllabs.polling import Polling
+from ssllabs.retry import Wait
+
+class Scheduler(object):
+    '''Runs assessments of a list of hosts through a single
+    :class:`ssllabs.client.Client`, starting new assessments as fast as the
+    API allows.
+
+    The number of assessments run at once is bounded by
+    :meth:`ssllabs.client.Client.maxAssessments` and
+    :meth:`ssllabs.client.Client.currentAssessments`, which the client keeps
+    up to date from the headers of every response, and new assessments are
+    started no faster than :meth:`ssllabs.info.Info.newAssessmentCoolOff`.
+    All of the running assessments are polled from the same thread, by
+    interleaving their :meth:`ssllabs.client.Client.analyze` generators::
+
+        for host, result in Scheduler().run(hosts):
+            if isinstance(result, Exception):
+                print(host, 'failed:', result)
+            else:
+                print(host, [endpoint.grade for endpoint in result.endpoints])
+    '''
+
+    def __init__(self, client=None, polling=None, ratewait=15, sleep=time.sleep, clock=time.time):
+        '''initializes the scheduler.
+
+        :param ssllabs.client.Client client: The client to run assessments through; a new one is made if not set
+        :param ssllabs.polling.Polling polling: The policy deciding how long to wait between polls of each assessment; a fixed :class:`ssllabs.polling.Polling` if not set
+        :param float ratewait: The longest time to hold off new assessments after the API refused them with :class:`ssllabs.errors.RequestRate`, in seconds; the wait starts at the cool-off and doubles with every refusal in a row, up to this
+        :param sleep: The function used to wait, taking seconds
+        :param clock: The function used to tell the time, returning seconds
+        '''
+        self.__client = client if client is not None else Client()
+        self.__polling = polling if polling is not None else Polling()
+        self.__ratewait = ratewait
+        self.__sleep = sleep
+        self.__clock = clock
+
+    @property
+    def client(self):
+        '''The :class:`ssllabs.client.Client` used for every request'''
+        return self.__client
+
+    def __capacity(self, active):
+        '''The number of new assessments that may be started right now'''
+        limit = self.__client.maxAssessments
+        if limit is None:
+            limit = 1
+        current = max(self.__client.currentAssessments or 0, active)
+        return limit - current
+
+    def run(self, hosts, **kwargs):
+        '''A generator that runs an assessment of every host, yielding each
+        one as it finishes.
+
+        Each yielded value is a (host, result) tuple, where host is the host
+        as passed in, and result is the :class:`ssllabs.host.Host` object, or
+        the exception that ended the assessment of that host.
+
+        The hosts may also be given as a queue, with the popleft and
+        appendleft methods of a :class:`collections.deque`, which is taken
+        from as the run goes, rather than copied first.  Its truth tells
+        whether a host is waiting right now, so that hosts may become due
+        while the run goes on; the run is over once it is false and no
+        assessment is left running.
+
+        :param hosts: An iterable of hosts to test, or a queue of them
+        :param kwargs: Other arguments passed to :meth:`ssllabs.client.Client.analyze`, which is run with defer set, so that the waits of its retry engine hold up only its own assessment
+        '''
+        info = self.__client.info()
+        cooloff = info.newAssessmentCoolOff.total_seconds() if info.newAssessmentCoolOff is not None else 0
+
+        pending = hosts if hasattr(hosts, 'popleft') else deque(hosts)
+        # Heap of (next poll time, tiebreaker, host, generator)
+        active = []
+        counter = itertools.count()
+        nextstart = self.__clock()
+        # The number of starts refused in a row
+        refused = 0
+
+        while pending or active:
+            now = self.__clock()
+
+            if pending and now >= nextstart:
+                if self.__capacity(len(active)) > 0:
+                    host = pending.popleft()
+                    try:
+                        data = self.__step(host, self.__client.analyze(host, defer=True, **kwargs), active, counter, starting=True)
+                    except errors.RequestRate:
+                        # The assessment was never started, so it is simply
+                        # retried later.  Most refusals are of the cool-off,
+                        # so the wait only grows to ratewait if they go on; a
+                        # refusal for the concurrent limit also updates the
+                        # capacity, which holds off starts by itself.
+                        pending.appendleft(host)
+                        nextstart = self.__clock() + min(max(cooloff, 0.1) * 2 ** refused, max(cooloff, self.__ratewait))
+                        refused += 1
+                        continue
+                    # The API times the cool-off from when it accepted the
+                    # start, which is no earlier than its response
+                    nextstart = self.__clock() + cooloff
+                    refused = 0
+                    if data is not None:
+                        yield data
+                    continue
+                elif not active:
+                    # Slots are taken by assessments of somebody else using
+                    # this client's quota; wait and ask the API again
+                    self.__sleep(max(cooloff, self.__polling.interval))
+                    self.__client.info()
+                    continue
+
+            if active and active[0][0] <= now:
+                _, _, host, generator = heapq.heappop(active)
+                data = self.__step(host, generator, active, counter)
+                if data is not None:
+                    yield data
+                continue
+
+            wake = []
+            if active:
+                wake.append(active[0][0])
+            if pending and self.__capacity(len(active)) > 0:
+                wake.append(nextstart)
+            self.__sleep(max(min(wake) - now, 0) if wake else self.__polling.interval)
+
+    def __step(self, host, generator, active, counter, starting=False):
+        '''Polls an assessment once, either scheduling its next poll or
+        returning its finished result.  A refused start raises
+        :class:`ssllabs.errors.RequestRate` rather than failing the host.
+
+        :returns: a (host, result) tuple if the assessment finished, otherwise None
+        '''
+        try:
+            data = next(generator)
+            # Endpoints streamed out of the final response aren't polls
+            while isinstance(data, Endpoint):
+                data = next(generator)
+        except StopIteration:
+            # Nothing else runs between the last poll and here, so the host
+            # property of the client is still the one of this assessment
+            result = self.__client.host
+            self.__polling.reset(result.host)
+            return (host, result)
+        except errors.RequestRate as e:
+            if starting:
+                raise
+            return (host, e)
+        except Exception as e:
+            return (host, e)
+
+        # The waits of the client's retry engine are kept here, so that the
+        # other assessments are polled meanwhile
+        delay = data.seconds if isinstance(data, Wait) else self.__polling.delay(data)
+        heapq.heappush(active, (self.__clock() + delay, next(counter), host, generator))
+        return None
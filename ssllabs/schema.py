@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''The declarative field schema that the model classes are built from.
+
+Each model class lists its fields as class attributes, with their type and
+docstring, instead of parsing its raw data by hand::
+
+    class Cert(Object):
+        subject = Field(\'\'\'certificate subject\'\'\')
+        notBefore = Timestamp(\'\'\'timestamp before which the certificate is not valid\'\'\')
+        issues = Nested(Issues, \'\'\'list of certificate issues as an :class:`Issues` object\'\'\')
+
+The :class:`Schema` metaclass turns each field into a read-only property,
+gives the class ``__slots__`` for them, and compiles a loader for the class
+that fills in every plain field in one go.  Nested objects and lists of them
+are only decoded from the raw data when their property is first read.
+
+Objects may also be built with a projection, listing the only fields that
+are wanted, as dotted paths such as ``'details.cert.notAfter'``.  Each
+projection gets a loader of its own, which builds the listed fields and
+nothing else; reading any other field of the object raises
+:class:`AttributeError`.
+
+Bitmask values are declared the same way, as :class:`Flags` classes with a
+:class:`Flag` per bit.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import datetime, timedelta
+import itertools
+import json
+import operator
+
+import six
+
+from ssllabs.util import unset
+
+#: The start of the millisecond timestamps used by the API, as a naive UTC
+#: datetime
+EPOCH = datetime(1970, 1, 1)
+
+_counter = itertools.count()
+
+def projection(paths):
+    '''Builds a projection tree from dotted paths.
+
+    :param paths: An iterable of dotted paths of fields, such as 'details.cert.notAfter'.  Lists are passed through, so 'certs.raw' is the raw data of every certificate.
+    :returns: a dict mapping each name to its own projection, or to True for names wanted whole
+    :rtype: dict
+    '''
+    result = {}
+    for path in paths:
+        node = result
+        names = path.split('.')
+        for name in names[:-1]:
+            if node.get(name) is True:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = True
+    return result
+
+class Field(object):
+    '''A field holding the value from the raw data as it is.
+
+    Subclasses change how the value is decoded.'''
+
+    #: Whether the field is decoded on first access rather than on construction
+    lazy = False
+
+    #: The types of raw value the field accepts, for :meth:`Schema.validate`;
+    #: None accepts anything
+    types = None
+
+    def __init__(self, doc=None, key=None, default=None, factory=None, convert=None):
+        '''initializes the field.
+
+        :param str doc: The docstring of the property
+        :param str key: The key of the value in the raw data; the name of the attribute if not set
+        :param default: The value used when the key is missing
+        :param factory: A callable building the value used when the key is missing, for mutable defaults
+        :param convert: A callable converting the raw value, if it is present
+        '''
+        self.doc = doc
+        self.key = key
+        self.default = default
+        self.factory = factory
+        self.converter = convert
+        self.name = None
+        self.slot = None
+        self.order = next(_counter)
+
+    def convert(self, value):
+        '''Converts a raw value that is present.'''
+        if self.converter is not None:
+            return self.converter(value)
+        return value
+
+    def missing(self):
+        '''Gets the value used when the key is missing.'''
+        if self.factory is not None:
+            return self.factory()
+        return self.default
+
+    def decode(self, data):
+        '''Gets the value of this field from the raw data of an object.'''
+        if self.key in data:
+            return self.convert(data[self.key])
+        return self.missing()
+
+    def source(self, bind):
+        '''Builds the Python expression computing this field from ``data`` in
+        the compiled loader.
+
+        :param bind: A callable that makes an object available to the
+            expression, returning the name it is bound to
+        :rtype: str
+        '''
+        key = repr(self.key)
+        if self.converter is None and self.factory is None:
+            if self.default is None:
+                return 'get({})'.format(key)
+            return 'get({}, {})'.format(key, bind(self.default))
+        return '{convert}(data[{key}]) if {key} in data else {missing}'.format(
+            convert=bind(self.convert),
+            key=key,
+            missing='{}()'.format(bind(self.missing)) if self.factory is not None else bind(self.default))
+
+    def project(self, projection):
+        '''Builds a callable that builds the value of this field from a
+        present raw value, with only the fields in a projection.'''
+        raise ValueError('{} has no fields to project'.format(self.name))
+
+    def validate(self, value, path):
+        '''Checks a raw value that is present, returning a list of problems.'''
+        if self.types is not None and value is not None and not isinstance(value, self.types):
+            return ['{}: expected {}, got {}'.format(path, ' or '.join(cls.__name__ for cls in self.types), type(value).__name__)]
+        return []
+
+class Timestamp(Field):
+    '''A field holding a millisecond timestamp, decoded to a naive UTC
+    :class:`datetime.datetime`'''
+
+    types = six.integer_types + (float,)
+
+    def convert(self, value):
+        return EPOCH + timedelta(milliseconds=value)
+
+    def source(self, bind):
+        return '{epoch} + timedelta(milliseconds=data[{key}]) if {key} in data else None'.format(epoch=bind(EPOCH), key=repr(self.key))
+
+class Duration(Field):
+    '''A field holding a length of time, decoded to a
+    :class:`datetime.timedelta`'''
+
+    types = six.integer_types + (float,)
+
+    def __init__(self, doc=None, key=None, unit='milliseconds'):
+        '''initializes the field.
+
+        :param str doc: The docstring of the property
+        :param str key: The key of the value in the raw data; the name of the attribute if not set
+        :param str unit: The unit of the raw value, as a :class:`datetime.timedelta` keyword
+        '''
+        super(Duration, self).__init__(doc, key)
+        self.unit = unit
+
+    def convert(self, value):
+        return timedelta(**{self.unit: value})
+
+    def source(self, bind):
+        return 'timedelta({unit}=data[{key}]) if {key} in data else None'.format(unit=self.unit, key=repr(self.key))
+
+class Nested(Field):
+    '''A field holding a nested object, decoded on first access, or None if
+    it is missing'''
+
+    lazy = True
+
+    def __init__(self, type, doc=None, key=None):
+        '''initializes the field.
+
+        :param type type: The class of the nested object, constructed from the raw value
+        :param str doc: The docstring of the property
+        :param str key: The key of the value in the raw data; the name of the attribute if not set
+        '''
+        super(Nested, self).__init__(doc, key)
+        self.type = type
+
+    def convert(self, value):
+        return self.type(value)
+
+    def project(self, projection):
+        return _builder(self, projection)
+
+    def validate(self, value, path):
+        if value is not None and isinstance(self.type, Schema):
+            return self.type.validate(value, path)
+        return []
+
+class ListOf(Field):
+    '''A field holding a list of nested objects, decoded on first access, or
+    an empty list if it is missing'''
+
+    lazy = True
+    types = (list,)
+
+    def __init__(self, type, doc=None, key=None):
+        '''initializes the field.
+
+        :param type: The class of the items, or any callable converting each raw item
+        :param str doc: The docstring of the property
+        :param str key: The key of the value in the raw data; the name of the attribute if not set
+        '''
+        super(ListOf, self).__init__(doc, key, factory=list)
+        self.type = type
+
+    def convert(self, value):
+        return [self.type(item) for item in value]
+
+    def project(self, projection):
+        build = _builder(self, projection)
+        return lambda value: [build(item) for item in value]
+
+    def validate(self, value, path):
+        problems = super(ListOf, self).validate(value, path)
+        if not problems and value is not None and isinstance(self.type, Schema):
+            for index, item in enumerate(value):
+                problems.extend(self.type.validate(item, '{}[{}]'.format(path, index)))
+        return problems
+
+class Flag(object):
+    '''A single bit of a :class:`Flags` class'''
+
+    def __init__(self, bit, doc=None):
+        '''initializes the flag.
+
+        :param int bit: The value of the bit
+        :param str doc: The docstring of the property
+        '''
+        self.bit = bit
+        self.doc = doc
+        self.order = next(_counter)
+
+def _lazy(field, slot):
+    '''Builds the getter of a lazy field, which decodes the field from the raw
+    data and stores it in its slot on first access.'''
+    get = slot.__get__
+    set = slot.__set__
+    decode = field.decode
+
+    def getter(self):
+        value = get(self)
+        if value is unset:
+            value = decode(self.rawdata)
+            set(self, value)
+        return value
+    return getter
+
+def _builder(field, projection):
+    '''Builds a callable constructing the type of a field from a raw value
+    with a projection.'''
+    type = field.type
+    if not isinstance(type, Schema) or issubclass(type, Flags):
+        raise ValueError('{} has no fields to project'.format(field.name))
+    new = type.__new__
+    load = type.loader(projection)
+
+    def build(value):
+        obj = new(type, value)
+        load(obj, value)
+        return obj
+    return build
+
+def _flag(bit):
+    def getter(self):
+        return bool(self._Flags__value & bit)
+    return getter
+
+class Schema(type):
+    '''The metaclass of the model classes, which builds each class from the
+    fields declared on it.
+
+    Every :class:`Field` becomes a property of the same name, backed by a slot,
+    and is listed in declaration order in the ``schema`` attribute of the
+    class, after those of its base classes.  Unless the class defines its own
+    ``__init__``, one is compiled for it that decodes all of its plain fields
+    straight from the raw data and marks its lazy ones as not yet decoded.
+    It takes the raw data and an optional list of fields, as dotted paths,
+    to build only those.
+
+    Every :class:`Flag` becomes a boolean property testing its bit of the
+    value, and its bit is kept by name in the ``bits`` dict of the class,
+    along with those of its base classes.'''
+
+    def __new__(metacls, name, bases, namespace):
+        fields = sorted(((key, value) for key, value in namespace.items() if isinstance(value, Field)), key=lambda item: item[1].order)
+        flags = sorted(((key, value) for key, value in namespace.items() if isinstance(value, Flag)), key=lambda item: item[1].order)
+
+        mangled = '_{}__'.format(name.lstrip('_'))
+        for key, field in fields:
+            del namespace[key]
+            field.name = key
+            if field.key is None:
+                field.key = key
+            field.slot = mangled + key
+        for key, flag in flags:
+            del namespace[key]
+
+        namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + tuple(field.slot for key, field in fields)
+        cls = super(Schema, metacls).__new__(metacls, name, bases, namespace)
+
+        for key, field in fields:
+            slot = cls.__dict__[field.slot]
+            getter = _lazy(field, slot) if field.lazy else operator.attrgetter(field.slot)
+            setattr(cls, key, property(getter, doc=field.doc))
+        for key, flag in flags:
+            setattr(cls, key, property(_flag(flag.bit), doc=flag.doc))
+
+        cls.schema = tuple(itertools.chain(getattr(cls, 'schema', ()), (field for key, field in fields)))
+        if flags or hasattr(cls, 'bits'):
+            cls.bits = dict(getattr(cls, 'bits', {}))
+            cls.bits.update((key, flag.bit) for key, flag in flags)
+        cls._loaders = {}
+        if cls.schema and '__init__' not in namespace:
+            cls.__init__ = cls.loader()
+        return cls
+
+    def loader(cls, projection=None):
+        '''Gets the loader of this class for a projection, compiling it the
+        first time.
+
+        A loader is a function taking a new object and its raw data, which
+        fills in the fields of the object.  The loader without a projection
+        is the ``__init__`` method compiled for the class, and also takes a
+        list of fields as dotted paths.
+
+        :param dict projection: A projection tree, as built by :func:`projection`, or None for every field
+        '''
+        key = None if projection is None else json.dumps(projection, sort_keys=True)
+        loader = cls._loaders.get(key)
+        if loader is None:
+            loader = cls._loaders[key] = cls.__compile(projection)
+        return loader
+
+    def __compile(cls, wanted):
+        namespace = {'timedelta': timedelta, 'unset': unset}
+
+        def bind(value):
+            name = '_{}'.format(len(namespace))
+            namespace[name] = value
+            return name
+
+        if wanted is None:
+            lines = [
+                'def __init__(self, data, fields=None):',
+                '    if fields is not None:',
+                '        return {}(self, data, fields)'.format(bind(_project)),
+                ]
+        else:
+            unknown = set(wanted) - {field.name for field in cls.schema}
+            if unknown:
+                raise ValueError('{} has no fields {}'.format(cls.__name__, ', '.join(sorted(unknown))))
+            lines = ['def __init__(self, data):']
+        lines.append('    get = data.get')
+
+        for field in cls.schema:
+            entry = True if wanted is None else wanted.get(field.name)
+            if entry is None:
+                continue
+            if entry is not True:
+                source = '{build}(data[{key}]) if {key} in data else {missing}()'.format(
+                    build=bind(field.project(entry)),
+                    key=repr(field.key),
+                    missing=bind(field.missing))
+            elif field.lazy:
+                source = 'unset'
+            else:
+                source = field.source(bind)
+            lines.append('    self.{} = {}'.format(field.slot, source))
+        six.exec_('\n'.join(lines), namespace)
+        return namespace['__init__']
+
+    def validate(cls, data, path=None):
+        '''Checks raw data against the schema of this class, recursing into
+        nested objects.
+
+        :param data: The raw data
+        :param str path: The path of the data, used in the messages
+        :returns: a description of every problem found, empty if there are none
+        :rtype: list
+        '''
+        if path is None:
+            path = cls.__name__
+        if issubclass(cls, Flags):
+            if not isinstance(data, six.integer_types):
+                return ['{}: expected int, got {}'.format(path, type(data).__name__)]
+            return []
+        if not isinstance(data, dict):
+            return ['{}: expected dict, got {}'.format(path, type(data).__name__)]
+        problems = []
+        for field in cls.schema:
+            if field.key in data:
+                problems.extend(field.validate(data[field.key], '{}.{}'.format(path, field.key)))
+        return problems
+
+def _project(obj, data, fields):
+    type(obj).loader(projection(fields))(obj, data)
+
+class Flags(six.with_metaclass(Schema, object)):
+    '''The base of the bitmask classes, holding the raw integer value, with a
+    boolean property for each :class:`Flag` declared on them.'''
+
+    __slots__ = (
+        '__value',
+        )
+
+    def __init__(self, data):
+        self.__value = data
+
+    def __int__(self):
+        return self.__value
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Spreading of assessments across several API entrypoints.
+
+A :class:`ShardedClient` holds a :class:`ssllabs.client.Client` for each
+entrypoint, each with its own quota of concurrent assessments, and acts as
+one client with all of their quotas together.  It can take the place of a
+client anywhere one is only used to run assessments, such as in
+:class:`ssllabs.scheduler.Scheduler`::
+
+    client = ShardedClient(['https://api.ssllabs.com/api/v2', 'https://ssllabs.example.com/api/v2'])
+    for host, result in Scheduler(client).run(hosts):
+        print(host, result)'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from collections import OrderedDict
+import time
+
+import six
+
+from ssllabs import errors
+from ssllabs.client import Client
+from ssllabs.info import Info
+
+class ShardedClient(object):
+    '''A client running assessments across several entrypoints.
+
+    Each assessment is started on the entrypoint with the most room left, by
+    the maxAssessments and currentAssessments it last reported, preferring
+    the ones whose cool-off since their last new assessment is over.  An
+    entrypoint that fails with :class:`ssllabs.errors.ServiceNotAvailable`,
+    after any retries of its own client, is left out for a while, and the
+    assessment is started again on another one.'''
+
+    def __init__(self, shards, downtime=60, remember=10000, clock=time.time, **kwargs):
+        '''initializes the client.
+
+        :param shards: An iterable of the entrypoints to use, each either a :class:`ssllabs.client.Client` or an entrypoint URL
+        :param float downtime: The time an entrypoint is left out after it was found unavailable, in seconds
+        :param int remember: The number of hosts whose last shard is remembered, for the modes that follow earlier assessments; the ones assessed longest ago are forgotten first
+        :param clock: The function used to tell the time, returning seconds
+        :param kwargs: Other arguments passed to :class:`ssllabs.client.Client` for each shard given as a URL
+        :raises ValueError: if no shards are given
+        '''
+        self.__clients = tuple(shard if isinstance(shard, Client) else Client(shard, **kwargs) for shard in shards)
+        if not self.__clients:
+            raise ValueError('At least one shard must be given')
+        self.__downtime = downtime
+        self.__clock = clock
+        count = len(self.__clients)
+        # Per shard: the time it is left out until, the time of its last new
+        # assessment, its cool-off in seconds, and the assessments this
+        # client is running on it
+        self.__down = [None] * count
+        self.__started = [None] * count
+        self.__cooloff = [0] * count
+        self.__running = [0] * count
+        # The shard that last assessed each host, so that the modes that
+        # follow earlier assessments ask the same entrypoint again, oldest
+        # first
+        self.__affinity = OrderedDict()
+        self.__remember = remember
+        self.__host = None
+
+    @property
+    def clients(self):
+        '''The :class:`ssllabs.client.Client` of each shard, in order'''
+        return self.__clients
+
+    @property
+    def maxAssessments(self):
+        '''The number of concurrent assessments allowed across all shards
+        that are up and have reported theirs, or None if none has.'''
+        limits = [client.maxAssessments for index, client in enumerate(self.__clients) if client.maxAssessments is not None and self.available(index)]
+        return sum(limits) if limits else None
+
+    @property
+    def currentAssessments(self):
+        '''The number of ongoing assessments across all shards that are up
+        and have reported theirs, or None if none has.'''
+        counts = [client.currentAssessments for index, client in enumerate(self.__clients) if client.currentAssessments is not None and self.available(index)]
+        return sum(counts) if counts else None
+
+    def available(self, index):
+        '''Tells whether a shard is in use, rather than left out after it was
+        found unavailable.
+
+        :param int index: The index of the shard in :meth:`clients`
+        :rtype: bool
+        '''
+        down = self.__down[index]
+        return down is None or self.__clock() >= down
+
+    def __capacity(self, index):
+        '''The number of new assessments a shard has room for'''
+        client = self.__clients[index]
+        limit = client.maxAssessments if client.maxAssessments is not None else 1
+        return limit - max(client.currentAssessments or 0, self.__running[index])
+
+    def __pick(self, host, mode, tried):
+        '''The index of the shard to start an assessment on, or None if every
+        one has been tried.'''
+        candidates = [index for index in six.moves.range(len(self.__clients)) if index not in tried]
+        if not candidates:
+            return None
+        if mode != 'new':
+            index = self.__affinity.get(host)
+            if index in candidates and self.available(index):
+                return index
+        now = self.__clock()
+        # Shards that are up come first, then the ones past their cool-off,
+        # then the ones with the most room
+        return max(candidates, key=lambda index: (
+            self.available(index),
+            self.__started[index] is None or now - self.__started[index] >= self.__cooloff[index],
+            self.__capacity(index),
+            ))
+
+    def info(self):
+        '''Calls the info API endpoint of every shard that is up, and
+        combines their answers.
+
+        The maxAssessments and currentAssessments are the sums over the
+        shards, the messages are those of all shards, and the
+        newAssessmentCoolOff is the shortest one divided by the number of
+        shards, as that is how often new assessments may be started across
+        all of them.  The version and criteriaVersion are those of the first
+        shard that answered.
+
+        :raises ssllabs.errors.ServiceNotAvailable: if no shard is available
+        :rtype: ssllabs.info.Info
+        '''
+        infos = []
+        error = None
+        for index, client in enumerate(self.__clients):
+            if not self.available(index):
+                continue
+            try:
+                info = client.info()
+            except errors.ServiceNotAvailable as e:
+                self.__down[index] = self.__clock() + self.__downtime
+                error = e
+                continue
+            if info.newAssessmentCoolOff is not None:
+                self.__cooloff[index] = info.newAssessmentCoolOff.total_seconds()
+            infos.append(info)
+        if not infos:
+            raise error if error is not None else errors.ServiceNotAvailable('every shard is down')
+
+        data = {
+            'version': infos[0].version,
+            'criteriaVersion': infos[0].criteriaVersion,
+            'messages': [message for info in infos for message in info.messages],
+            }
+        limits = [info.maxAssessments for info in infos if info.maxAssessments is not None]
+        if limits:
+            data['maxAssessments'] = sum(limits)
+        counts = [info.currentAssessments for info in infos if info.currentAssessments is not None]
+        if counts:
+            data['currentAssessments'] = sum(counts)
+        cooloffs = [info.newAssessmentCoolOff for info in infos if info.newAssessmentCoolOff is not None]
+        if cooloffs:
+            data['newAssessmentCoolOff'] = int(min(cooloffs).total_seconds() * 1000) // len(infos)
+        return Info(data)
+
+    def analyze(self, host, **kwargs):
+        '''A generator running an assessment of a host on one of the shards,
+        as :meth:`ssllabs.client.Client.analyze` does, which it takes the
+        same arguments as.
+
+        If the shard fails with :class:`ssllabs.errors.ServiceNotAvailable`,
+        the assessment is started again on another one, in the same mode, so
+        that the progress yielded may start over.  The modes that follow
+        earlier results of the host use the shard that last assessed it,
+        while it is up, if it is one of the last remember hosts assessed.
+
+        :raises ssllabs.errors.ServiceNotAvailable: if every shard failed
+        '''
+        tried = set()
+        error = None
+        while True:
+            index = self.__pick(host, kwargs.get('mode', 'new'), tried)
+            if index is None:
+                raise error
+            tried.add(index)
+            client = self.__clients[index]
+            self.__affinity.pop(host, None)
+            self.__affinity[host] = index
+            while len(self.__affinity) > self.__remember:
+                self.__affinity.popitem(last=False)
+            self.__started[index] = self.__clock()
+            self.__running[index] += 1
+            try:
+                for data in client.analyze(host, **kwargs):
+                    yield data
+            except errors.ServiceNotAvailable as e:
+                self.__down[index] = self.__clock() + self.__downtime
+                error = e
+                continue
+            finally:
+                self.__running[index] -= 1
+            self.__host = client.host
+            return
+
+    @property
+    def host(self):
+        '''Gets the host data of the last finished assessment.
+
+        :raises ssllabs.errors.NoHostError: if a full call to analyze hasn't been completed
+        :rtype: ssllabs.host.Host
+        '''
+        if self.__host is None:
+            raise errors.NoHostError('analyze must be run to completion before the host property may be accessed')
+        return self.__host
@@ -5,17 +5,12 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-from datetime import datetime, timedelta
-
-from ssllabs.simulation import Simulation
 from ssllabs.object import Object
+from ssllabs.schema import ListOf
+from ssllabs.simulation import Simulation
 
 class SimDetails(Object):
     '''Simulation collection, accessed from
     :meth:`ssllabs.endpointdetails.EndpointDetails.sims`'''
-    def __init__(self, data):
-        self.__results = [Simulation(simulation) for simulation in data.get('results', list())]
-    @property
-    def results(self):
-        '''a list of :class:`ssllabs.simulation.Simulation` objects'''
-        return self.__results
+
+    results = ListOf(Simulation, '''a list of :class:`ssllabs.simulation.Simulation` objects''')
@@ -6,16 +6,13 @@
 from __future__ import division, absolute_import, print_function, unicode_literals
 
 from ssllabs.object import Object
+from ssllabs.schema import Field
 
 class StatusCodes(Object):
     '''Status codes, returned from :meth:`ssllabs.client.Client.statusCodes`'''
-    def __init__(self, data):
-        self.__statusDetails = data.get('statusDetails')
 
-    @property
-    def statusDetails(self):
+    statusDetails = Field(
         '''a :class:`dict` containing all status details codes and the
         corresponding English translations. Please note that, once in use, the
         codes will not change, whereas the translations may change at any
-        time.'''
-        return self.__statusDetails
+        time.''')
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''A columnar store of finished results, for querying many hosts at once.
+
+A :class:`Store` flattens :class:`ssllabs.host.Host` objects into one row per
+endpoint, with each column kept in a flat :class:`array.array`.  Strings are
+dictionary-encoded, so that a column of grades is an array of small integers
+and a query over it compares each distinct grade once.  Stores are saved to a
+single file that is memory-mapped when loaded, so opening even a large one
+reads nothing until it is queried.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from array import array
+from datetime import datetime, timedelta
+import io
+import json
+import math
+import mmap
+import struct
+import sys
+
+import six
+
+from ssllabs.schema import EPOCH
+
+#: The grades from best to worst, as used by :meth:`Store.gradebelow`
+GRADES = ('A+', 'A', 'A-', 'B', 'C', 'D', 'E', 'F', 'T', 'M')
+
+#: The protocols of the bits of the ``protocols`` column, lowest first
+PROTOCOLS = ('SSL 2.0', 'SSL 3.0', 'TLS 1.0', 'TLS 1.1', 'TLS 1.2', 'TLS 1.3')
+
+#: The :class:`ssllabs.endpointdetails.EndpointDetails` properties of the bits
+#: of the ``vulnerabilities`` column, lowest first
+VULNERABILITIES = ('vulnBeast', 'heartbleed', 'poodle', 'freak', 'logjam', 'drownVulnerable', 'supportsRc4')
+
+STRING = 'string'
+TIME = 'time'
+INTEGER = 'integer'
+
+#: The columns of every store, as (name, kind) pairs.  Strings are stored as
+#: indexes into a table of their distinct values, times as seconds since the
+#: epoch (NaN if missing), and integers as themselves (-1 if missing).
+COLUMNS = (
+    ('host', STRING),
+    ('port', INTEGER),
+    ('ipAddress', STRING),
+    ('serverName', STRING),
+    ('grade', STRING),
+    ('gradeTrustIgnored', STRING),
+    ('testTime', TIME),
+    ('notBefore', TIME),
+    ('notAfter', TIME),
+    ('issuerLabel', STRING),
+    ('keyAlg', STRING),
+    ('keySize', INTEGER),
+    ('keyStrength', INTEGER),
+    ('protocols', INTEGER),
+    ('vulnerabilities', INTEGER),
+    )
+
+# str(), as array needs native strings for its type codes on Python 2
+TYPECODES = {
+    STRING: str('i'),
+    TIME: str('d'),
+    INTEGER: str('i'),
+    }
+
+MAGIC = b'SSLLABS-STORE-1\n'
+
+def _seconds(time):
+    if time is None:
+        return float('nan')
+    return (time - EPOCH).total_seconds()
+
+def _integer(value):
+    return -1 if value is None else int(value)
+
+def _flags(names, present):
+    '''Builds a bitmask with the bit of each name in present set.'''
+    mask = 0
+    for bit, name in enumerate(names):
+        if name in present:
+            mask |= 1 << bit
+    return mask
+
+def _row(host, endpoint):
+    '''Flattens one endpoint into a dict of column values.'''
+    details = endpoint.details
+    cert = details.cert if details is not None else None
+    key = details.key if details is not None else None
+    protocols = set()
+    vulnerabilities = set()
+    if details is not None:
+        protocols = {'{} {}'.format(protocol.name, protocol.version) for protocol in details.protocols}
+        vulnerabilities = {name for name in VULNERABILITIES if getattr(details, name)}
+    return {
+        'host': host.host,
+        'port': _integer(host.port),
+        'ipAddress': endpoint.ipAddress,
+        'serverName': endpoint.serverName,
+        'grade': endpoint.grade,
+        'gradeTrustIgnored': endpoint.gradeTrustIgnored,
+        'testTime': _seconds(host.testTime),
+        'notBefore': _seconds(cert.notBefore if cert is not None else None),
+        'notAfter': _seconds(cert.notAfter if cert is not None else None),
+        'issuerLabel': cert.issuerLabel if cert is not None else None,
+        'keyAlg': key.alg if key is not None else None,
+        'keySize': _integer(key.size if key is not None else None),
+        'keyStrength': _integer(key.strength if key is not None else None),
+        'protocols': _flags(PROTOCOLS, protocols),
+        'vulnerabilities': _flags(VULNERABILITIES, vulnerabilities),
+        }
+
+class Store(object):
+    '''A table of finished results with one row per endpoint.
+
+    Rows are added with :meth:`append`, queried with :meth:`expiring`,
+    :meth:`gradebelow`, :meth:`vulnerable`, :meth:`supports` or
+    :meth:`where`, which all return lists of row numbers, and read back with
+    :meth:`row`.  The columns are those in :data:`COLUMNS`.
+    '''
+
+    def __init__(self, hosts=()):
+        '''initializes the store.
+
+        :param hosts: An iterable of :class:`ssllabs.host.Host` objects to add
+        '''
+        self.__columns = {name: array(TYPECODES[kind]) for name, kind in COLUMNS}
+        self.__strings = {name: [None] for name, kind in COLUMNS if kind == STRING}
+        self.__codes = {name: {None: 0} for name, kind in COLUMNS if kind == STRING}
+        self.__length = 0
+        self.__mapped = None
+        for host in hosts:
+            self.append(host)
+
+    def __len__(self):
+        return self.__length
+
+    def append(self, host):
+        '''Adds a row for each endpoint of a host.
+
+        :param ssllabs.host.Host host: A finished host
+        '''
+        if self.__mapped is not None:
+            self.__unmap()
+        for endpoint in host.endpoints:
+            row = _row(host, endpoint)
+            for name, kind in COLUMNS:
+                value = row[name]
+                if kind == STRING:
+                    codes = self.__codes[name]
+                    if value not in codes:
+                        codes[value] = len(codes)
+                        self.__strings[name].append(value)
+                    value = codes[value]
+                self.__columns[name].append(value)
+            self.__length += 1
+
+    def column(self, name):
+        '''Gets the decoded values of a column.
+
+        :param str name: The name of the column
+        :returns: the values, with times as :class:`datetime.datetime` and missing values as None
+        :rtype: list
+        '''
+        kind = dict(COLUMNS)[name]
+        column = self.__columns[name]
+        if kind == STRING:
+            strings = self.__strings[name]
+            return [strings[code] for code in column]
+        if kind == TIME:
+            return [None if math.isnan(value) else EPOCH + timedelta(seconds=value) for value in column]
+        return [None if value == -1 else value for value in column]
+
+    def row(self, index):
+        '''Gets a row as a dict of decoded values, in the same form as
+        :meth:`column`.
+
+        :param int index: The number of the row
+        :rtype: dict
+        '''
+        row = {}
+        for name, kind in COLUMNS:
+            value = self.__columns[name][index]
+            if kind == STRING:
+                value = self.__strings[name][value]
+            elif kind == TIME:
+                value = None if math.isnan(value) else EPOCH + timedelta(seconds=value)
+            elif value == -1:
+                value = None
+            row[name] = value
+        return row
+
+    def where(self, name, predicate):
+        '''Finds the rows whose value in a column matches a predicate.
+
+        For string columns, the predicate is called once for each distinct
+        value rather than for each row.  Values are passed as stored: missing
+        strings as None, times as seconds since the epoch, missing times as
+        NaN, and missing integers as -1.
+
+        :param str name: The name of the column
+        :param predicate: A callable taking a value and returning whether it matches
+        :returns: the numbers of the matching rows
+        :rtype: list
+        '''
+        column = self.__columns[name]
+        if dict(COLUMNS)[name] == STRING:
+            matched = {code for code, value in enumerate(self.__strings[name]) if predicate(value)}
+            return [index for index, code in enumerate(column) if code in matched]
+        return [index for index, value in enumerate(column) if predicate(value)]
+
+    def expiring(self, within, now=None):
+        '''Finds the rows whose certificate expires within some time, including
+        those that have already expired.
+
+        :param datetime.timedelta within: The time from now
+        :param datetime.datetime now: The current time, as a naive UTC datetime; :meth:`datetime.datetime.utcnow` if not set
+        :returns: the numbers of the matching rows
+        :rtype: list
+        '''
+        if now is None:
+            now = datetime.utcnow()
+        limit = _seconds(now + within)
+        # NaN compares false, so rows without a certificate never match
+        return [index for index, value in enumerate(self.__columns['notAfter']) if value <= limit]
+
+    def gradebelow(self, grade, trustIgnored=False):
+        '''Finds the rows graded worse than a grade, by the order of
+        :data:`GRADES`.  Rows without a grade never match.
+
+        :param str grade: The grade, e.g. 'B'
+        :param bool trustIgnored: Whether to use the grade with trust issues ignored
+        :returns: the numbers of the matching rows
+        :rtype: list
+        '''
+        rank = GRADES.index(grade)
+        worse = set(GRADES[rank + 1:])
+        return self.where('gradeTrustIgnored' if trustIgnored else 'grade', lambda value: value in worse)
+
+    def vulnerable(self, name):
+        '''Finds the rows vulnerable to an attack.
+
+        :param str name: One of :data:`VULNERABILITIES`, e.g. 'heartbleed'
+        :returns: the numbers of the matching rows
+        :rtype: list
+        '''
+        bit = 1 << VULNERABILITIES.index(name)
+        return [index for index, value in enumerate(self.__columns['vulnerabilities']) if value & bit]
+
+    def supports(self, protocol):
+        '''Finds the rows supporting a protocol.
+
+        :param str protocol: One of :data:`PROTOCOLS`, e.g. 'TLS 1.0'
+        :returns: the numbers of the matching rows
+        :rtype: list
+        '''
+        bit = 1 << PROTOCOLS.index(protocol)
+        return [index for index, value in enumerate(self.__columns['protocols']) if value & bit]
+
+    def save(self, path):
+        '''Writes the store to a file.
+
+        The file is a header line, a JSON description of the columns and
+        their string tables, and then the raw contents of each column,
+        aligned to 8 bytes, in native byte order.
+
+        :param str path: The path of the file
+        '''
+        columns = []
+        offset = 0
+        for name, kind in COLUMNS:
+            column = self.__columns[name]
+            size = len(column) * column.itemsize
+            columns.append({
+                'name': name,
+                'typecode': column.typecode,
+                'offset': offset,
+                'size': size,
+                'strings': self.__strings.get(name),
+                })
+            offset += size + -size % 8
+        header = json.dumps({
+            'rows': self.__length,
+            'byteorder': sys.byteorder,
+            'columns': columns,
+            }).encode('utf-8')
+        # The data starts on an 8-byte boundary, so that every column can be
+        # viewed in place once mapped
+        start = len(MAGIC) + 8 + len(header)
+        header += b' ' * (-start % 8)
+
+        with io.open(path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(struct.pack('<Q', len(header)))
+            file.write(header)
+            for name, kind in COLUMNS:
+                data = self.__columns[name]
+                if not isinstance(data, array):
+                    data = array(TYPECODES[kind], data)
+                data = data.tobytes() if hasattr(data, 'tobytes') else data.tostring()
+                file.write(data)
+                file.write(b'\0' * (-len(data) % 8))
+
+    @classmethod
+    def load(cls, path):
+        '''Opens a store saved with :meth:`save`.
+
+        On Python 3, the file is memory-mapped and its columns are read in
+        place; on Python 2, or if the file was written with another byte
+        order, they are copied in.  Appending to a loaded store copies its
+        columns in first.
+
+        :param str path: The path of the file
+        :rtype: Store
+        '''
+        store = cls()
+        with io.open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError('{} is not a store file'.format(path))
+            length, = struct.unpack('<Q', file.read(8))
+            header = json.loads(file.read(length).decode('utf-8'))
+            start = len(MAGIC) + 8 + length
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        inplace = six.PY3 and header['byteorder'] == sys.byteorder
+        columns = {}
+        for column in header['columns']:
+            begin = start + column['offset']
+            end = begin + column['size']
+            if inplace:
+                columns[column['name']] = memoryview(mapped)[begin:end].cast(str(column['typecode']))
+            else:
+                data = array(str(column['typecode']))
+                getattr(data, 'frombytes', getattr(data, 'fromstring', None))(mapped[begin:end])
+                if header['byteorder'] != sys.byteorder:
+                    data.byteswap()
+                columns[column['name']] = data
+            if column['strings'] is not None:
+                store.__strings[column['name']] = column['strings']
+                store.__codes[column['name']] = {value: code for code, value in enumerate(column['strings'])}
+        store.__columns = columns
+        store.__length = header['rows']
+        store.__mapped = mapped if inplace else None
+        return store
+
+    def __unmap(self):
+        self.__columns = {name: array(TYPECODES[kind], self.__columns[name]) for name, kind in COLUMNS}
+        self.__mapped = None
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Incremental decoding of analyze responses.
+
+A :class:`Stream` decodes an analyze response as it arrives, handing out each
+endpoint as soon as it is complete, rather than waiting for the whole body.
+Parts of each endpoint that aren't wanted, such as the handshake simulations
+or the PEM data of the chain, can be skipped, so that they aren't kept.
+Everything is decoded by the standard :mod:`json` decoder, a whole value at
+a time, except along the paths to the skipped parts; skipped strings are
+only scanned, but skipped objects and arrays are decoded and then dropped.
+
+Streaming is slower than decoding the whole body at once, and is only worth
+it for the first endpoint of large responses: as responses are read
+:data:`ssllabs.client.CHUNKSIZE` bytes at a time, a body that fits in one
+chunk gains nothing, and skipping only lowers the peak memory of hosts with
+many endpoints.  ``python -m benchmarks.parse`` measures all three for a
+given number of endpoints.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import codecs
+import json
+import re
+
+from ssllabs.schema import projection
+
+_decoder = json.JSONDecoder()
+_scanstring = json.decoder.scanstring
+_whitespace = re.compile(r'[ \t\n\r]*')
+_string = re.compile(r'"(?:[^"\\]|\\.)*(")?', re.DOTALL)
+
+class _Incomplete(Exception):
+    '''Raised when the text ends before the value being decoded does'''
+    pass
+
+class _Tree(dict):
+    '''A node of the tree of what to decode, mapping keys to the nodes below
+    them, to True for keys that are skipped, or to None for keys that are
+    decoded whole.  Keys that aren't in it are skipped if default is True,
+    and decoded whole if it is None.'''
+
+    def __init__(self, default=None):
+        super(_Tree, self).__init__()
+        self.default = default
+
+def _keep(projection):
+    node = _Tree(True)
+    for key, child in projection.items():
+        node[key] = None if child is True else _keep(child)
+    return node
+
+def tree(skip=(), keep=None):
+    '''Builds the tree of what to decode of each endpoint, as used by
+    :class:`Stream`.
+
+    :param skip: An iterable of dotted paths to skip, relative to an endpoint, such as 'details.sims'.  Lists are passed through, so 'details.chain.certs.raw' skips the PEM data of every certificate of the chain.
+    :param keep: An iterable of the only dotted paths to decode, in the same form, with everything else skipped; None decodes everything that isn't skipped
+    :returns: the root of the tree, or None if everything is decoded
+    '''
+    root = _keep(projection(keep)) if keep is not None else _Tree()
+    for path in skip:
+        node = root
+        keys = path.split('.')
+        for key in keys[:-1]:
+            child = node.get(key, node.default)
+            if child is True:
+                break
+            if child is None:
+                child = node[key] = _Tree()
+            node = child
+        else:
+            node[keys[-1]] = True
+    if not root and root.default is None:
+        return None
+    return root
+
+def _skipspace(text, pos):
+    '''Skips whitespace up to the next character, which must be there.'''
+    if pos < len(text) and text[pos] not in ' \t\n\r':
+        return pos
+    pos = _whitespace.match(text, pos).end()
+    if pos >= len(text):
+        raise _Incomplete()
+    return pos
+
+def _skip(text, pos):
+    '''Finds the end of the value at pos, keeping none of it.'''
+    if text[pos] == '"':
+        # Long strings, like PEM data, are passed over without being copied
+        match = _string.match(text, pos)
+        if match.group(1) is None:
+            raise _Incomplete()
+        _skipspace(text, match.end())
+        return match.end()
+    # Scanning a container for its end in Python is several times slower
+    # than decoding it in C, so it is decoded and dropped at once
+    return _decode(text, pos, None)[1]
+
+def _decode(text, pos, skip):
+    '''Decodes the value at pos, leaving out the parts skipped by the tree.'''
+    if skip is not None:
+        char = text[pos]
+        if char == '{':
+            return _object(text, pos, skip)
+        if char == '[':
+            return _array(text, pos, skip)
+    try:
+        value, end = _decoder.raw_decode(text, pos)
+    except ValueError:
+        raise _Incomplete()
+    # A number cut off by the end of the text decodes as a shorter number,
+    # so a value only counts once something follows it
+    _skipspace(text, end)
+    return value, end
+
+def _object(text, pos, skip):
+    result = {}
+    pos = _skipspace(text, pos + 1)
+    if text[pos] == '}':
+        return result, pos + 1
+    while True:
+        if text[pos] != '"':
+            raise ValueError('Expecting property name enclosed in double quotes')
+        try:
+            key, pos = _scanstring(text, pos + 1)
+        except ValueError:
+            raise _Incomplete()
+        pos = _skipspace(text, pos)
+        if text[pos] != ':':
+            raise ValueError('Expecting \':\' delimiter')
+        pos = _skipspace(text, pos + 1)
+        subtree = skip.get(key, skip.default)
+        if subtree is True:
+            pos = _skip(text, pos)
+        else:
+            result[key], pos = _decode(text, pos, subtree)
+        pos = _skipspace(text, pos)
+        if text[pos] == '}':
+            return result, pos + 1
+        if text[pos] != ',':
+            raise ValueError('Expecting \',\' delimiter')
+        pos = _skipspace(text, pos + 1)
+
+def _array(text, pos, skip):
+    result = []
+    pos = _skipspace(text, pos + 1)
+    if text[pos] == ']':
+        return result, pos + 1
+    while True:
+        value, pos = _decode(text, pos, skip)
+        result.append(value)
+        pos = _skipspace(text, pos)
+        if text[pos] == ']':
+            return result, pos + 1
+        if text[pos] != ',':
+            raise ValueError('Expecting \',\' delimiter')
+        pos = _skipspace(text, pos + 1)
+
+class Stream(object):
+    '''An analyze response being decoded.
+
+    Iterating the stream reads the body and yields the raw data of each
+    endpoint as soon as it has been decoded.  Once the iteration is done,
+    :meth:`data` holds the raw data of the whole host, endpoints included,
+    the same as the decoded JSON except for the skipped parts.  While
+    iterating, :meth:`data` holds the fields of the host decoded so far.
+
+    ::
+
+        stream = Stream(response.iter_content(65536), skip=['details.sims'])
+        for endpoint in stream:
+            print(endpoint['ipAddress'], endpoint.get('grade'))
+        host = Host(stream.data)
+    '''
+
+    def __init__(self, chunks, skip=(), fields=None):
+        '''initializes the stream.
+
+        :param chunks: An iterable of the body in pieces, as bytes or text
+        :param skip: An iterable of dotted paths within each endpoint to skip, as described for :func:`tree`
+        :param fields: An iterable of the only dotted paths within each endpoint to decode, as described for :func:`tree`
+        '''
+        self.__chunks = iter(chunks)
+        self.__skip = tree(skip, fields)
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__text = ''
+        self.__pos = 0
+        self.__done = False
+        self.__data = {}
+
+    @property
+    def data(self):
+        '''The raw data of the host decoded so far, as a :class:`dict`'''
+        return self.__data
+
+    def __read(self, size):
+        '''Reads at least size more characters, if the body has them.
+
+        :returns: whether anything was read
+        '''
+        start = len(self.__text)
+        parts = [self.__text]
+        read = 0
+        while read < size:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                break
+            if isinstance(chunk, bytes):
+                chunk = self.__decoder.decode(chunk)
+            parts.append(chunk)
+            read += len(chunk)
+        self.__text = ''.join(parts)
+        return len(self.__text) > start
+
+    def __step(self, step):
+        '''Runs one step of the decoding from the current position, reading
+        more of the body for as long as the step runs out of text.'''
+        while True:
+            try:
+                result, self.__pos = step(self.__text, self.__pos)
+                return result
+            except (_Incomplete, IndexError):
+                # Reading at least as much again as is already held for the
+                # step keeps a large value from being retried many times
+                if not self.__read(max(len(self.__text) - self.__pos, 1)):
+                    raise ValueError('The response ended before its JSON did')
+
+    def __trim(self):
+        self.__text = self.__text[self.__pos:]
+        self.__pos = 0
+
+    def __iter__(self):
+        if self.__done:
+            return
+
+        def expect(chars):
+            def step(text, pos):
+                pos = _skipspace(text, pos)
+                if text[pos] not in chars:
+                    raise ValueError('Expecting one of {!r}, got {!r}'.format(chars, text[pos]))
+                return text[pos], pos + 1
+            return step
+
+        def key(text, pos):
+            key, pos = _decode(text, _skipspace(text, pos), None)
+            pos = _skipspace(text, pos)
+            if text[pos] != ':':
+                raise ValueError('Expecting \':\' delimiter')
+            return key, _skipspace(text, pos + 1)
+
+        def value(skip):
+            return lambda text, pos: _decode(text, _skipspace(text, pos), skip)
+
+        def peek(text, pos):
+            pos = _skipspace(text, pos)
+            return text[pos], pos
+
+        self.__step(expect('{'))
+        if self.__step(peek) == '}':
+            self.__step(expect('}'))
+        else:
+            while True:
+                name = self.__step(key)
+                if name == 'endpoints' and self.__step(peek) == '[':
+                    endpoints = self.__data['endpoints'] = []
+                    self.__step(expect('['))
+                    if self.__step(peek) == ']':
+                        self.__step(expect(']'))
+                    else:
+                        while True:
+                            endpoint = self.__step(value(self.__skip))
+                            endpoints.append(endpoint)
+                            self.__trim()
+                            yield endpoint
+                            if self.__step(expect(',]')) == ']':
+                                break
+                else:
+                    self.__data[name] = self.__step(value(None))
+                self.__trim()
+                if self.__step(expect(',}')) == '}':
+                    break
+        self.__done = True
+
+def loads(text, skip=(), fields=None):
+    '''Decodes a whole analyze response at once, skipping the given paths.
+
+    :param text: The response body, as bytes or text
+    :param skip: An iterable of dotted paths within each endpoint to skip, as described for :func:`tree`
+    :param fields: An iterable of the only dotted paths within each endpoint to decode, as described for :func:`tree`
+    :returns: the raw data of the host
+    :rtype: dict
+    '''
+    stream = Stream([text], skip, fields)
+    for endpoint in stream:
+        pass
+    return stream.data
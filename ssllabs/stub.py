@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''A local stand-in for the SSL Labs API, for testing and load testing
+without the network.
+
+A :class:`Stub` answers ``info``, ``getStatusCodes``, ``analyze`` and
+``getEndpointData`` the way the v2 API does.  Every assessment resolves DNS,
+then tests its endpoints one after another, with their progress and ETA
+following the clock, and finishes with synthetic but complete results, as
+built by :func:`host`.  Running assessments are counted against
+``maxAssessments``; starting one beyond that, or sooner than the cool-off
+after the last one, is refused with 429, and 503 and 529 responses can be
+injected at random.  All assessments share one account, whichever client
+asks.
+
+The stub runs in a background thread::
+
+    stub = Stub(duration=5, maxAssessments=100).start()
+    client = Client(stub.url)
+    ...
+    stub.stop()
+
+or on its own, with the ``ssllabs-stub`` program.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import urlsplit, parse_qsl
+
+import argparse
+import base64
+import binascii
+import json
+import random
+import threading
+import time
+import zlib
+
+_GRADES = ('A+', 'A', 'A-', 'B', 'C', 'F', 'T')
+
+#: The steps endpoints in progress go through, as (status details code,
+#: message) pairs, in order
+STEPS = (
+    ('TESTING_PROTOCOL_INTOLERANCE_399', 'Testing Protocol Intolerance (TLS 1.152)'),
+    ('TESTING_SUITES', 'Determining available cipher suites'),
+    ('TESTING_HANDSHAKE_SIMULATION', 'Simulating handshakes'),
+    ('TESTING_HEARTBLEED', 'Testing Heartbleed'),
+    )
+
+def _pem(rng):
+    # A certificate body of realistic size; only its length matters
+    der = binascii.unhexlify('{:02400x}'.format(rng.getrandbits(9600)))
+    return '-----BEGIN CERTIFICATE-----\n' + base64.b64encode(der).decode('ascii') + '\n-----END CERTIFICATE-----\n'
+
+def _cert(rng, now, common):
+    notBefore = now - rng.randint(1, 300) * 86400000
+    return {
+        'subject': 'CN={}'.format(common),
+        'commonNames': [common],
+        'altNames': [common, 'www.' + common],
+        'notBefore': notBefore,
+        'notAfter': notBefore + 398 * 86400000,
+        'issuerSubject': 'CN=Synthetic Intermediate CA, O=Example, C=US',
+        'sigAlg': 'SHA256withRSA',
+        'issuerLabel': 'Synthetic Intermediate CA',
+        'revocationInfo': 3,
+        'crlURIs': ['http://crl.example.com/ca.crl'],
+        'ocspURIs': ['http://ocsp.example.com'],
+        'revocationStatus': 2,
+        'crlRevocationStatus': 2,
+        'ocspRevocationStatus': 2,
+        'sgc': 0,
+        'issues': 0,
+        'sct': True,
+        'mustStaple': 0,
+        }
+
+def _chaincert(rng, now, common):
+    data = _cert(rng, now, common)
+    for key in ('commonNames', 'altNames', 'revocationInfo', 'crlURIs', 'ocspURIs', 'sgc', 'sct', 'mustStaple'):
+        del data[key]
+    data.update({
+        'label': common,
+        'keyAlg': 'RSA',
+        'keySize': 2048,
+        'keyStrength': 2048,
+        'raw': _pem(rng),
+        })
+    return data
+
+def _details(rng, now, host, suites, sims):
+    return {
+        'hostStartTime': now,
+        'key': {'size': 2048, 'strength': 2048, 'alg': 'RSA', 'debianFlaw': False, 'q': None},
+        'cert': _cert(rng, now, host),
+        'chain': {'certs': [_chaincert(rng, now, name) for name in (host, 'Synthetic Intermediate CA', 'Synthetic Root CA')], 'issues': 0},
+        'protocols': [{'id': 0x0300 + minor, 'name': 'TLS', 'version': '1.{}'.format(minor - 1)} for minor in range(1, 5)],
+        'suites': {
+            'list': [{'id': 0xc000 + i, 'name': 'TLS_ECDHE_RSA_WITH_SUITE_{}'.format(i), 'cipherStrength': rng.choice((128, 256)), 'ecdhBits': 256, 'ecdhStrength': 3072} for i in range(suites)],
+            'preference': True,
+            },
+        'serverSignature': 'nginx',
+        'prefixDelegation': False,
+        'nonPrefixDelegation': True,
+        'vulnBeast': rng.random() < 0.2,
+        'renegSupport': 2,
+        'sessionResumption': 2,
+        'compressionMethods': 0,
+        'supportsNpn': True,
+        'npnProtocols': 'h2 http/1.1',
+        'sessionTickets': 1,
+        'ocspStapling': True,
+        'sniRequired': False,
+        'httpStatusCode': 200,
+        'supportsRc4': rng.random() < 0.05,
+        'rc4WithModern': False,
+        'rc4Only': False,
+        'forwardSecrecy': 4,
+        'protocolIntolerance': 0,
+        'miscIntolerance': 0,
+        'sims': {'results': [{'client': {'id': i, 'name': 'Client {}'.format(i), 'platform': 'Platform', 'version': str(i), 'isReference': i % 3 == 0}, 'errorCode': 0, 'attempts': 1, 'protocolId': 0x0303, 'suiteId': 0xc02f, 'kxInfo': 'ECDH secp256r1'} for i in range(sims)]},
+        'heartbleed': rng.random() < 0.01,
+        'heartbeat': True,
+        'openSslCcs': 1,
+        'openSSLLuckyMinus20': 1,
+        'poodle': rng.random() < 0.02,
+        'poodleTls': 1,
+        'fallbackScsv': True,
+        'freak': rng.random() < 0.01,
+        'hasSct': 1,
+        'dhPrimes': [''.join(rng.choice('0123456789abcdef') for _ in range(512))],
+        'dhUsesKnownPrimes': 0,
+        'dhYsReuse': False,
+        'logjam': rng.random() < 0.01,
+        'chaCha20Preference': True,
+        'hstsPolicy': {'LONG_MAX_AGE': 15552000, 'header': 'max-age=31536000', 'status': 'present', 'maxAge': 31536000, 'includeSubDomains': True, 'preload': False, 'directives': {'max-age': '31536000'}},
+        'hstsPreloads': [{'source': source, 'status': 'absent', 'sourceTime': now} for source in ('Chrome', 'Edge', 'Firefox', 'IE')],
+        'hpkpPolicy': {'status': 'absent', 'pins': [], 'matchedPins': [], 'directives': []},
+        'hpkpRoPolicy': {'status': 'absent', 'pins': [], 'matchedPins': [], 'directives': []},
+        'drownHosts': [],
+        'drownErrors': False,
+        'drownVulnerable': False,
+        }
+
+def host(index, endpoints=2, suites=30, sims=60, seed=None, name=None, now=None):
+    '''Builds the raw data of one finished host.
+
+    :param int index: The number of the host, used to name it and, unless seed is given, to seed the random choices
+    :param int endpoints: The number of endpoints
+    :param int suites: The number of cipher suites of each endpoint
+    :param int sims: The number of handshake simulations of each endpoint
+    :param seed: The seed of the random choices, if not the index
+    :param str name: The host name, if not one made from the index
+    :param int now: The testTime, in milliseconds since the epoch, if not one made from the index
+    :returns: the raw data, as decoded from an analyze response
+    :rtype: dict
+    '''
+    rng = random.Random(index if seed is None else seed)
+    if name is None:
+        name = 'host{}.example.com'.format(index)
+    if now is None:
+        now = 1500000000000 + index * 1000
+    return {
+        'host': name,
+        'port': 443,
+        'protocol': 'HTTP',
+        'isPublic': False,
+        'status': 'READY',
+        'startTime': now - 90000,
+        'testTime': now,
+        'engineVersion': '1.30.8',
+        'criteriaVersion': '2009p',
+        'endpoints': [{
+            'ipAddress': '10.{}.{}.{}'.format(index // 65536 % 256, index // 256 % 256, (index + i) % 256),
+            'serverName': name,
+            'statusMessage': 'Ready',
+            'grade': rng.choice(_GRADES),
+            'gradeTrustIgnored': 'A',
+            'hasWarnings': False,
+            'isExceptional': False,
+            'progress': 100,
+            'duration': 90000,
+            'delegation': 1,
+            'details': _details(rng, now, name, suites, sims),
+            } for i in range(endpoints)],
+        }
+
+class _Assessment(object):
+    '''The state of one assessment of the stub.'''
+
+    def __init__(self, name, start, dns, duration, endpoints, suites, sims):
+        self.name = name
+        self.start = start
+        self.dns = dns
+        self.duration = duration
+        self.end = start + dns + duration
+        self.endpoints = endpoints
+        self.suites = suites
+        self.sims = sims
+        self.__result = None
+
+    def result(self):
+        '''The finished result, built the first time it is asked for.'''
+        if self.__result is None:
+            index = zlib.crc32(self.name.encode('utf-8')) & 0xffffffff
+            self.__result = host(index, self.endpoints, self.suites, self.sims, name=self.name, now=int(self.end * 1000))
+            self.__result['startTime'] = int(self.start * 1000)
+            for endpoint in self.__result['endpoints']:
+                endpoint['duration'] = int(self.duration * 1000 / self.endpoints)
+        return self.__result
+
+    def render(self, now, details):
+        '''Builds the response to a poll at a time.
+
+        :param bool details: Whether finished endpoints get their details
+        '''
+        if now >= self.end:
+            result = self.result()
+            if details:
+                return result
+            return dict(result, endpoints=[{key: value for key, value in endpoint.items() if key != 'details'} for endpoint in result['endpoints']])
+
+        data = {
+            'host': self.name,
+            'port': 443,
+            'protocol': 'HTTP',
+            'isPublic': False,
+            'startTime': int(self.start * 1000),
+            'engineVersion': '1.30.8',
+            'criteriaVersion': '2009p',
+            }
+        if now < self.start + self.dns:
+            data['status'] = 'DNS'
+            data['statusMessage'] = 'Resolving domain names'
+            data['endpoints'] = []
+            return data
+
+        data['status'] = 'IN_PROGRESS'
+        result = self.result()
+        each = self.duration / self.endpoints
+        elapsed = now - self.start - self.dns
+        endpoints = []
+        for i, finished in enumerate(result['endpoints']):
+            begin = i * each
+            if elapsed >= begin + each:
+                endpoint = {key: value for key, value in finished.items() if details or key != 'details'}
+            else:
+                endpoint = {
+                    'ipAddress': finished['ipAddress'],
+                    'serverName': finished['serverName'],
+                    'delegation': finished['delegation'],
+                    }
+                if elapsed >= begin:
+                    code, message = STEPS[int((elapsed - begin) / each * len(STEPS))]
+                    endpoint.update({
+                        'statusMessage': 'In progress',
+                        'statusDetails': code,
+                        'statusDetailsMessage': message,
+                        'progress': int((elapsed - begin) * 100 / each),
+                        'eta': int(begin + each - elapsed),
+                        })
+                else:
+                    endpoint.update({
+                        'statusMessage': 'Pending',
+                        'progress': -1,
+                        'eta': -1,
+                        })
+            endpoints.append(endpoint)
+        data['endpoints'] = endpoints
+        return data
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.rstrip('/').rsplit('/', 1)[-1]
+        query = dict(parse_qsl(url.query))
+        status, body = self.server.respond(endpoint, query)
+        self.__send(status, body)
+
+    def __send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('X-Max-Assessments', str(self.server.maxAssessments))
+        self.send_header('X-Current-Assessments', str(self.server.currentAssessments))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(self, format, *args)
+
+class Stub(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    '''A stub of the SSL Labs API, served over HTTP.'''
+
+    daemon_threads = True
+    # Thousands of clients may connect at once
+    request_queue_size = 1024
+
+    def __init__(self, address=('127.0.0.1', 0), maxAssessments=25, cooloff=1.0, dns=1.0, duration=60.0, endpoints=2, suites=30, sims=60, unavailable=0.0, overloaded=0.0, seed=None, clock=time.time, verbose=False):
+        '''initializes the stub and binds its socket.
+
+        :param tuple address: The (host, port) to listen on; port 0 picks a free one
+        :param int maxAssessments: The number of assessments that may run at once
+        :param float cooloff: The time that must pass between starting two assessments, in seconds
+        :param float dns: The time each assessment spends resolving DNS, in seconds
+        :param float duration: The time each assessment spends testing its endpoints, in seconds
+        :param int endpoints: The number of endpoints of each host
+        :param int suites: The number of cipher suites of each endpoint
+        :param int sims: The number of handshake simulations of each endpoint
+        :param float unavailable: The fraction of requests answered with 503
+        :param float overloaded: The fraction of requests answered with 529
+        :param seed: The seed of the injected errors
+        :param clock: The function used to tell the time, returning seconds
+        :param bool verbose: Whether to log every request to stderr
+        '''
+        BaseHTTPServer.HTTPServer.__init__(self, address, _Handler)
+        self.__maxAssessments = maxAssessments
+        self.__cooloff = cooloff
+        self.__dns = dns
+        self.__duration = duration
+        self.__endpoints = endpoints
+        self.__suites = suites
+        self.__sims = sims
+        self.__unavailable = unavailable
+        self.__overloaded = overloaded
+        self.__random = random.Random(seed)
+        self.__clock = clock
+        self.__verbose = verbose
+        self.__lock = threading.Lock()
+        self.__assessments = {}
+        self.__running = set()
+        self.__laststart = None
+        self.__requests = 0
+        self.__connections = 0
+        self.__thread = None
+
+    @property
+    def url(self):
+        '''The entrypoint URL of the stub, for :class:`ssllabs.client.Client`'''
+        host, port = self.server_address[:2]
+        return 'http://{}:{}/api/v2'.format(host, port)
+
+    @property
+    def maxAssessments(self):
+        '''The number of assessments that may run at once'''
+        return self.__maxAssessments
+
+    @property
+    def currentAssessments(self):
+        '''The number of assessments running'''
+        with self.__lock:
+            self.__expire(self.__clock())
+            return len(self.__running)
+
+    @property
+    def requests(self):
+        '''The number of requests answered so far'''
+        return self.__requests
+
+    @property
+    def connections(self):
+        '''The number of connections accepted so far'''
+        return self.__connections
+
+    @property
+    def verbose(self):
+        '''Whether every request is logged to stderr'''
+        return self.__verbose
+
+    def get_request(self):
+        request = BaseHTTPServer.HTTPServer.get_request(self)
+        with self.__lock:
+            self.__connections += 1
+        return request
+
+    def start(self):
+        '''Serves requests in a background thread.
+
+        :returns: the stub itself
+        '''
+        self.__thread = threading.Thread(target=self.serve_forever)
+        self.__thread.daemon = True
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        '''Stops serving and closes the socket.'''
+        if self.__thread is not None:
+            self.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.server_close()
+
+    def __expire(self, now):
+        self.__running = {name for name in self.__running if self.__assessments[name].end > now}
+
+    def respond(self, endpoint, query):
+        '''Answers one request.
+
+        :param str endpoint: The API endpoint, such as 'analyze'
+        :param dict query: The query parameters
+        :returns: the HTTP status and the body, as JSON-compatible data
+        :rtype: tuple
+        '''
+        with self.__lock:
+            self.__requests += 1
+            now = self.__clock()
+            self.__expire(now)
+
+            draw = self.__random.random()
+            if draw < self.__unavailable:
+                return 503, {'errors': [{'message': 'Service is not available'}]}
+            if draw < self.__unavailable + self.__overloaded:
+                return 529, {'errors': [{'message': 'Service is overloaded'}]}
+
+            if endpoint == 'info':
+                return 200, {
+                    'version': 'stub',
+                    'engineVersion': '1.30.8',
+                    'criteriaVersion': '2009p',
+                    'maxAssessments': self.__maxAssessments,
+                    'currentAssessments': len(self.__running),
+                    'newAssessmentCoolOff': int(self.__cooloff * 1000),
+                    'messages': ['This is a local stub of the SSL Labs API.'],
+                    }
+            if endpoint == 'getStatusCodes':
+                return 200, {'statusDetails': dict(STEPS)}
+            if endpoint == 'analyze':
+                return self.__analyze(query, now)
+            if endpoint == 'getEndpointData':
+                return self.__endpointData(query, now)
+            return 404, {'errors': [{'message': 'Unknown endpoint: {}'.format(endpoint)}]}
+
+    def __analyze(self, query, now):
+        name = query.get('host')
+        if not name:
+            return 400, {'errors': [{'field': 'host', 'message': 'qp.required'}]}
+        name = name.lower()
+
+        assessment = self.__assessments.get(name)
+        start = assessment is None
+        if assessment is not None and name not in self.__running:
+            if query.get('startNew') == 'on':
+                start = True
+            elif query.get('fromCache') == 'on' and 'maxAge' in query:
+                start = now - assessment.end > int(query['maxAge']) * 3600
+
+        if start:
+            if len(self.__running) >= self.__maxAssessments:
+                return 429, {'errors': [{'message': 'Concurrent assessment limit reached ({})'.format(self.__maxAssessments)}]}
+            if self.__laststart is not None and now - self.__laststart < self.__cooloff:
+                return 429, {'errors': [{'message': 'Assessment cool-off period in effect'}]}
+            assessment = self.__assessments[name] = _Assessment(name, now, self.__dns, self.__duration, self.__endpoints, self.__suites, self.__sims)
+            self.__running.add(name)
+            self.__laststart = now
+
+        return 200, assessment.render(now, query.get('all') == 'on' or (query.get('all') == 'done' and now >= assessment.end))
+
+    def __endpointData(self, query, now):
+        for field in ('host', 's'):
+            if not query.get(field):
+                return 400, {'errors': [{'field': field, 'message': 'qp.required'}]}
+        assessment = self.__assessments.get(query['host'].lower())
+        if assessment is not None:
+            for endpoint in assessment.render(now, True).get('endpoints', ()):
+                if endpoint['ipAddress'] == query['s']:
+                    return 200, endpoint
+        return 400, {'errors': [{'field': 's', 'message': 'qp.invalid'}]}
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local stub of the SSL Labs API, for testing clients without the network')
+    parser.add_argument('-a', '--address', help='The address to listen on (default %(default)s)', default='127.0.0.1')
+    parser.add_argument('-p', '--port', help='The port to listen on (default %(default)s)', type=int, default=8080)
+    parser.add_argument('-m', '--max-assessments', help='The number of assessments that may run at once (default %(default)s)', type=int, default=25)
+    parser.add_argument('-c', '--cooloff', help='The time between starting two assessments, in seconds (default %(default)s)', type=float, default=1.0)
+    parser.add_argument('-D', '--dns', help='The time each assessment spends resolving DNS, in seconds (default %(default)s)', type=float, default=1.0)
+    parser.add_argument('-d', '--duration', help='The time each assessment spends testing, in seconds (default %(default)s)', type=float, default=60.0)
+    parser.add_argument('-e', '--endpoints', help='The number of endpoints of each host (default %(default)s)', type=int, default=2)
+    parser.add_argument('-s', '--suites', help='The number of cipher suites of each endpoint (default %(default)s)', type=int, default=30)
+    parser.add_argument('-S', '--sims', help='The number of handshake simulations of each endpoint (default %(default)s)', type=int, default=60)
+    parser.add_argument('--unavailable', help='The fraction of requests answered with 503 (default %(default)s)', type=float, default=0.0)
+    parser.add_argument('--overloaded', help='The fraction of requests answered with 529 (default %(default)s)', type=float, default=0.0)
+    parser.add_argument('--seed', help='The seed of the injected errors', type=int)
+    parser.add_argument('-v', '--verbose', help='Log every request', action='store_true')
+    args = parser.parse_args()
+
+    stub = Stub((args.address, args.port), maxAssessments=args.max_assessments, cooloff=args.cooloff, dns=args.dns, duration=args.duration, endpoints=args.endpoints, suites=args.suites, sims=args.sims, unavailable=args.unavailable, overloaded=args.overloaded, seed=args.seed, verbose=args.verbose)
+    print('Serving the SSL Labs API stub at {}'.format(stub.url))
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -5,23 +5,15 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
-from datetime import datetime, timedelta
-
-from ssllabs.suite import Suite
 from ssllabs.object import Object
+from ssllabs.schema import Field, ListOf
+from ssllabs.suite import Suite
 
 class Suites(Object):
     '''Cipher suite collection, accessed from
     :meth:`ssllabs.endpointdetails.EndpointDetails.suites`'''
-    def __init__(self, data):
-        self.__list = [Suite(suite) for suite in data.get('list', list())]
-        self.__preference = data.get('preference')
-    @property
-    def list(self):
-        '''a list of :class:`ssllabs.suite.Suite` objects'''
-        return self.__list
-    @property
-    def preference(self):
+
+    list = ListOf(Suite, '''a list of :class:`ssllabs.suite.Suite` objects''')
+    preference = Field(
         '''true if the server actively selects cipher suites; if null, we were
-        not able to determine if the server has a preference'''
-        return self.__preference
+        not able to determine if the server has a preference''')
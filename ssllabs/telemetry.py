@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Telemetry hooks, reporting where the time of a
+:class:`ssllabs.client.Client` goes.
+
+A :class:`Hooks` object given to a client is told about every API call once
+it is done, with its timings and sizes, and about every
+:meth:`ssllabs.client.Client.analyze` once it is over, with the time it spent
+in each status.  Clients without hooks don't measure anything.
+
+Two adapters are included: :class:`PrometheusHooks`, which needs the
+``prometheus_client`` package (the ``prometheus`` extra), and
+:class:`OpenTelemetryHooks`, which needs ``opentelemetry-api`` (the
+``opentelemetry`` extra).  Neither package is needed by anything else, and
+each is only imported once its adapter is made::
+
+    client = Client(hooks=PrometheusHooks())'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+class Hooks(object):
+    '''The base of telemetry hooks, doing nothing.  Subclasses override the
+    methods for the events they want.'''
+
+    def request(self, endpoint, start, status, latency, size, retries, decode, error):
+        '''Called once an API call is done, or has failed for good.
+
+        :param str endpoint: The API endpoint, such as 'analyze'
+        :param float start: The time the call started, in seconds since the epoch
+        :param int status: The HTTP status code of the last response, or None if there was none
+        :param float latency: The time until the last response arrived, retries and their backoff included, in seconds
+        :param int size: The size of the response body, in bytes, or None if it wasn't read
+        :param int retries: The number of retries done
+        :param float decode: The time spent decoding the JSON body, in seconds, or None if it wasn't decoded.  For streamed responses, this includes reading the body.
+        :param Exception error: The error the call failed with, or None
+        '''
+        pass
+
+    def analyze(self, host, start, end, polls, phases, status, error):
+        '''Called once an assessment started by
+        :meth:`ssllabs.client.Client.analyze` is over, or has failed.
+
+        :param str host: The host, as passed to analyze
+        :param float start: The time the assessment started, in seconds since the epoch
+        :param float end: The time the assessment was over, in seconds since the epoch
+        :param int polls: The number of analyze calls made; 0 if the result came from the local cache
+        :param list phases: The (status, begin, seconds) tuples of the 'DNS' and 'IN_PROGRESS' statuses the assessment went through, in order, each timed from the first poll that saw it, at begin seconds since the epoch, to the first poll that saw another status, or to the end
+        :param str status: The last status seen, such as 'READY', or None
+        :param Exception error: The error the assessment failed with, or None
+        '''
+        pass
+
+class PrometheusHooks(Hooks):
+    '''Hooks keeping Prometheus metrics, all prefixed with the namespace:
+
+    ``requests_total``
+        API calls, by endpoint and HTTP status (``'error'`` if there was no
+        response)
+    ``request_seconds``
+        histogram of the latency of API calls, by endpoint
+    ``response_bytes``
+        histogram of the size of response bodies, by endpoint
+    ``decode_seconds``
+        histogram of the JSON decode time, by endpoint
+    ``retries_total``
+        retried requests, by endpoint
+    ``analyses_total``
+        assessments, by final status (``'error'`` if one failed)
+    ``analyze_polls``
+        histogram of the number of polls of each assessment
+    ``status_seconds``
+        histogram of the time assessments spent in each status
+    '''
+
+    def __init__(self, namespace='ssllabs', registry=None):
+        '''initializes the hooks, registering their metrics.
+
+        :param str namespace: The prefix of every metric name
+        :param registry: The :class:`prometheus_client.CollectorRegistry` to register the metrics in; the default one if not set
+        :raises ImportError: if prometheus_client isn't installed
+        '''
+        import prometheus_client
+
+        kwargs = {'namespace': namespace}
+        if registry is not None:
+            kwargs['registry'] = registry
+        sizes = tuple(2 ** power for power in range(8, 24, 2)) + (float('inf'),)
+        self.__requests = prometheus_client.Counter('requests', 'SSL Labs API calls', ['endpoint', 'status'], **kwargs)
+        self.__latency = prometheus_client.Histogram('request_seconds', 'Latency of SSL Labs API calls', ['endpoint'], **kwargs)
+        self.__size = prometheus_client.Histogram('response_bytes', 'Size of SSL Labs API response bodies', ['endpoint'], buckets=sizes, **kwargs)
+        self.__decode = prometheus_client.Histogram('decode_seconds', 'JSON decode time of SSL Labs API responses', ['endpoint'], **kwargs)
+        self.__retries = prometheus_client.Counter('retries', 'Retried SSL Labs API requests', ['endpoint'], **kwargs)
+        self.__analyses = prometheus_client.Counter('analyses', 'SSL Labs assessments', ['status'], **kwargs)
+        self.__polls = prometheus_client.Histogram('analyze_polls', 'Polls of each SSL Labs assessment', buckets=(0, 1, 2, 5, 10, 20, 50, 100, float('inf')), **kwargs)
+        self.__status = prometheus_client.Histogram('status_seconds', 'Time SSL Labs assessments spent in each status', ['status'], buckets=(1, 5, 10, 30, 60, 120, 300, 600, float('inf')), **kwargs)
+
+    def request(self, endpoint, start, status, latency, size, retries, decode, error):
+        self.__requests.labels(endpoint, str(status) if status is not None else 'error').inc()
+        self.__latency.labels(endpoint).observe(latency)
+        if size is not None:
+            self.__size.labels(endpoint).observe(size)
+        if decode is not None:
+            self.__decode.labels(endpoint).observe(decode)
+        if retries:
+            self.__retries.labels(endpoint).inc(retries)
+
+    def analyze(self, host, start, end, polls, phases, status, error):
+        self.__analyses.labels('error' if error is not None or status is None else status).inc()
+        self.__polls.observe(polls)
+        for phase, begin, seconds in phases:
+            self.__status.labels(phase).observe(seconds)
+
+class OpenTelemetryHooks(Hooks):
+    '''Hooks recording OpenTelemetry spans: one named ``ssllabs <endpoint>``
+    for every API call, and one named ``ssllabs analyze`` for every
+    assessment, with a child span for each status it went through.  The
+    spans are recorded once their events are over, with their real start
+    and end times.'''
+
+    def __init__(self, tracer=None):
+        '''initializes the hooks.
+
+        :param tracer: The :class:`opentelemetry.trace.Tracer` to record spans with; the one named 'ssllabs' of the global tracer provider if not set
+        :raises ImportError: if opentelemetry-api isn't installed
+        '''
+        from opentelemetry import trace
+
+        self.__trace = trace
+        self.__tracer = tracer if tracer is not None else trace.get_tracer('ssllabs')
+
+    @staticmethod
+    def __nanoseconds(seconds):
+        return int(seconds * 1e9)
+
+    def __end(self, span, end, error):
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self.__trace.Status(self.__trace.StatusCode.ERROR, str(error)))
+        span.end(end_time=self.__nanoseconds(end))
+
+    def request(self, endpoint, start, status, latency, size, retries, decode, error):
+        attributes = {'ssllabs.endpoint': endpoint, 'ssllabs.retries': retries}
+        if status is not None:
+            attributes['http.status_code'] = status
+        if size is not None:
+            attributes['http.response_content_length'] = size
+        if decode is not None:
+            attributes['ssllabs.decode_seconds'] = decode
+        span = self.__tracer.start_span('ssllabs ' + endpoint, start_time=self.__nanoseconds(start), attributes=attributes)
+        self.__end(span, start + latency + (decode or 0), error)
+
+    def analyze(self, host, start, end, polls, phases, status, error):
+        attributes = {'ssllabs.host': host, 'ssllabs.polls': polls}
+        if status is not None:
+            attributes['ssllabs.status'] = status
+        span = self.__tracer.start_span('ssllabs analyze', start_time=self.__nanoseconds(start), attributes=attributes)
+        context = self.__trace.set_span_in_context(span)
+        for phase, begin, seconds in phases:
+            child = self.__tracer.start_span('ssllabs ' + phase, context=context, start_time=self.__nanoseconds(begin), attributes={'ssllabs.status': phase})
+            child.end(end_time=self.__nanoseconds(begin + seconds))
+        self.__end(span, end, error)
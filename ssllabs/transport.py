@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''The transports that carry the requests of a :class:`ssllabs.client.Client`.
+
+A transport has a single method, ``get(url, timeout=None, stream=False)``,
+returning a :class:`requests.Response`, and a ``close()`` method.  The
+client sends every request through its transport, so that the API can be
+swapped out for a recording of it:
+
+:class:`SessionTransport`
+    Sends requests over a pooled :class:`requests.Session`.  This is the
+    default.
+:class:`RecordTransport`
+    Sends requests through another transport, and writes every exchange to
+    a file.
+:class:`ReplayTransport`
+    Answers requests from such a file, without any network access, and
+    optionally with a simulated latency.
+
+A recording is a JSON Lines file with one exchange per line, as an object
+with the keys ``endpoint`` (the last part of the URL path, such as
+``'analyze'``), ``query`` (the query parameters, as an object), ``status``,
+``reason``, ``headers`` and ``body`` (the response body, as text).  Replays
+match requests by endpoint and query only, so a recording taken against one
+entrypoint can be played back against any other.  The responses to the same
+request are played back in the order they were recorded, so the polls of an
+assessment go through the same progress as they did when recorded; once
+they are all used up, they start over from the first.
+
+::
+
+    client = Client(transport=RecordTransport('session.jsonl'))
+    for data in client.analyze('example.com', polling=AdaptivePolling()):
+        pass
+
+    client = Client(transport=ReplayTransport('session.jsonl', latency=0.1))
+    for data in client.analyze('example.com'):
+        pass
+'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from six.moves.urllib.parse import urlsplit, parse_qsl
+import six
+
+import io
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+#: The response headers kept in recordings; the rest vary from run to run
+#: and mean nothing to the client
+HEADERS = ('Content-Type', 'X-Max-Assessments', 'X-Current-Assessments')
+
+def newsession(poolconnections=10, poolsize=10, keepalive=True):
+    '''Builds a pooled :class:`requests.Session` suitable for a :class:`SessionTransport`.
+
+    The same session may be handed to any number of transports or
+    :class:`ssllabs.client.Client` objects, which will then share a single
+    connection pool, so that polls for many hosts reuse the same few TCP and
+    TLS connections to the API.
+
+    :param int poolconnections: The number of distinct hosts to keep pools for
+    :param int poolsize: The maximum number of connections kept per host; should be at least the number of threads using the session at once
+    :param bool keepalive: Whether to keep connections open between requests.  Disabling this opens a new connection for every request.
+    :returns: the session object
+    :rtype: requests.Session
+    '''
+    value = requests.Session()
+    adapter = HTTPAdapter(pool_connections=poolconnections, pool_maxsize=poolsize)
+    value.mount('https://', adapter)
+    value.mount('http://', adapter)
+    if not keepalive:
+        value.headers['Connection'] = 'close'
+    return value
+
+def key(url):
+    '''Builds the key that recorded exchanges are matched by.
+
+    :param str url: The full request URL
+    :returns: the endpoint name and the sorted query items
+    :rtype: tuple
+    '''
+    parts = urlsplit(url)
+    return parts.path.rstrip('/').rsplit('/', 1)[-1], tuple(sorted(parse_qsl(parts.query)))
+
+def response(url, status, reason, headers, body):
+    '''Builds a complete :class:`requests.Response` out of its parts, as if
+    its body had already been read.
+
+    :param str url: The request URL
+    :param int status: The HTTP status code
+    :param str reason: The HTTP status reason
+    :param dict headers: The response headers
+    :param body: The body, as text or bytes
+    :rtype: requests.Response
+    '''
+    value = requests.Response()
+    value.url = url
+    value.status_code = status
+    value.reason = reason
+    value.headers = CaseInsensitiveDict(headers)
+    value.encoding = 'utf-8'
+    value._content = body.encode('utf-8') if isinstance(body, six.text_type) else body
+    value._content_consumed = True
+    return value
+
+class SessionTransport(object):
+    '''Sends requests over a :class:`requests.Session`.'''
+
+    def __init__(self, session=None):
+        '''initializes the transport.
+
+        :param requests.Session session: The session used for every request.  If not set, a new one is built with :func:`newsession`.
+        '''
+        self.__session = session if session is not None else newsession()
+
+    @property
+    def session(self):
+        '''The :class:`requests.Session` used for every request'''
+        return self.__session
+
+    def get(self, url, timeout=None, stream=False):
+        '''Sends a GET request.
+
+        :param str url: The full request URL
+        :param timeout: The timeout, as accepted by requests
+        :param bool stream: Whether to leave the body to be read
+        :rtype: requests.Response
+        '''
+        return self.__session.get(url, timeout=timeout, stream=stream)
+
+    def close(self):
+        '''Closes the session.'''
+        self.__session.close()
+
+class RecordTransport(object):
+    '''Sends requests through another transport, appending every exchange to
+    a recording.  Bodies are read whole before they are handed back, so
+    streamed responses are recorded too, though no longer streamed.'''
+
+    def __init__(self, path, transport=None):
+        '''initializes the transport.
+
+        :param str path: The file the exchanges are appended to
+        :param transport: The transport that sends the requests; a new :class:`SessionTransport` if not set
+        '''
+        self.__transport = transport if transport is not None else SessionTransport()
+        self.__file = io.open(path, 'a', encoding='utf-8')
+        self.__lock = threading.Lock()
+
+    @property
+    def transport(self):
+        '''The transport that sends the requests'''
+        return self.__transport
+
+    def get(self, url, timeout=None, stream=False):
+        value = self.__transport.get(url, timeout=timeout, stream=stream)
+        endpoint, query = key(url)
+        line = json.dumps({
+            'endpoint': endpoint,
+            'query': dict(query),
+            'status': value.status_code,
+            'reason': value.reason,
+            'headers': {name: value.headers[name] for name in HEADERS if name in value.headers},
+            'body': value.content.decode('utf-8'),
+            }, ensure_ascii=False, sort_keys=True)
+        with self.__lock:
+            self.__file.write(line + '\n')
+            self.__file.flush()
+        return value
+
+    def close(self):
+        '''Closes the recording and the inner transport.'''
+        self.__file.close()
+        self.__transport.close()
+
+class ReplayTransport(object):
+    '''Answers requests from a recording.'''
+
+    def __init__(self, recording, latency=0, sleep=time.sleep):
+        '''initializes the transport.
+
+        :param recording: The path of the recording, or an iterable of its exchanges as dicts
+        :param latency: The simulated time each request takes, in seconds, or a function returning it, which is called with the request URL
+        :param sleep: The function used to wait out the latency
+        '''
+        if isinstance(recording, six.string_types):
+            with io.open(recording, 'r', encoding='utf-8') as file:
+                recording = [json.loads(line) for line in file if line.strip()]
+
+        self.__latency = latency if callable(latency) else (lambda url: latency)
+        self.__sleep = sleep
+        self.__lock = threading.Lock()
+        self.__exchanges = {}
+        for exchange in recording:
+            exchangekey = (exchange['endpoint'], tuple(sorted((name, six.text_type(value)) for name, value in exchange['query'].items())))
+            self.__exchanges.setdefault(exchangekey, []).append(exchange)
+        self.__positions = {}
+
+    @property
+    def requests(self):
+        '''The number of distinct requests in the recording'''
+        return len(self.__exchanges)
+
+    def rewind(self):
+        '''Starts every request over from its first recorded response.'''
+        with self.__lock:
+            self.__positions.clear()
+
+    def get(self, url, timeout=None, stream=False):
+        '''Plays back the next recorded response to a request.
+
+        :raises KeyError: if the request was never recorded
+        :rtype: requests.Response
+        '''
+        requestkey = key(url)
+        exchanges = self.__exchanges.get(requestkey)
+        if exchanges is None:
+            raise KeyError('No recorded response for {} {}'.format(requestkey[0], dict(requestkey[1])))
+        with self.__lock:
+            position = self.__positions.get(requestkey, 0)
+            self.__positions[requestkey] = (position + 1) % len(exchanges)
+        exchange = exchanges[position]
+
+        delay = self.__latency(url)
+        if delay:
+            self.__sleep(delay)
+        return response(url, exchange['status'], exchange['reason'], exchange['headers'], exchange['body'])
+
+    def close(self):
+        pass
@@ -5,6 +5,9 @@
 
 from __future__ import division, absolute_import, print_function, unicode_literals
 
+import io
+import sys
+
 def objectornone(type, data, key):
     '''conditionally returns type(data[key]), or None.
     
@@ -19,3 +22,31 @@ def objectornone(type, data, key):
     '''
     if key in data:
         return type(data[key])
+
+class Unset(object):
+    '''The type of :data:`unset`.  It pickles by reference, so that the
+    marker stays the same object in unpickled objects.'''
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return 'unset'
+
+    def __repr__(self):
+        return 'unset'
+
+#: A marker for an attribute that hasn't been decoded yet, distinct from None.
+#: Nested objects are decoded from the raw data the first time their property
+#: is accessed, and kept after that.
+unset = Unset()
+
+def readhosts(filename):
+    '''Reads hosts, one per line, from a file or from stdin if filename is
+    '-'.  Blank lines and lines starting with # are left out.'''
+    file = sys.stdin if filename == '-' else io.open(filename, 'r', encoding='utf-8')
+    try:
+        hosts = [line.strip() for line in file]
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    return [host for host in hosts if host and not host.startswith('#')]
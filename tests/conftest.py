@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import os
+import sys
+
+import pytest
+
+# The tests run against the source tree, whether or not it is installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ssllabs.stub import Stub
+
+@pytest.fixture
+def stub(request):
+    '''A running :class:`ssllabs.stub.Stub`, taking the keyword arguments of
+    a ``stubargs`` mark.'''
+    mark = request.node.get_closest_marker('stubargs')
+    stub = Stub(**(mark.kwargs if mark is not None else {})).start()
+    yield stub
+    stub.stop()
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'stubargs(**kwargs): the arguments of the stub fixture')
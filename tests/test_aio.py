@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from ssllabs import errors
+from ssllabs.aio import AsyncClient
+from ssllabs.host import Host
+from ssllabs.polling import Polling
+from ssllabs.retry import Backoff, Retry
+from ssllabs.stub import Stub
+
+HOSTS = ['host{}.example.com'.format(index) for index in range(10)]
+
+def analyze_many(url, hosts, **kwargs):
+    async def run():
+        async with AsyncClient(url, polling=Polling(interval=0.05, dnsinterval=0.05)) as client:
+            return await client.analyze_many(hosts, **kwargs)
+    return asyncio.run(run())
+
+@pytest.mark.stubargs(maxAssessments=3, cooloff=0.05, dns=0, duration=0.2, endpoints=1, suites=2, sims=2)
+def test_refused_starts_are_retried(stub):
+    # More at once than the API allows, so that starts are refused for both
+    # the cool-off and the concurrent limit
+    results = analyze_many(stub.url, HOSTS, concurrency=5, ratewait=1)
+    assert [result.host for result in results] == HOSTS
+    assert all(isinstance(result, Host) and result.status == 'READY' for result in results)
+
+@pytest.mark.stubargs(maxAssessments=10, cooloff=0.05, dns=0, duration=0.2, endpoints=1, suites=2, sims=2, unavailable=0.2, seed=0)
+def test_failures_are_returned_in_place(stub):
+    results = analyze_many(stub.url, HOSTS, ratewait=1)
+    assert len(results) == len(HOSTS)
+    failed = [result for result in results if isinstance(result, Exception)]
+    assert failed
+    assert all(isinstance(result, errors.ServiceNotAvailable) for result in failed)
+    for host, result in zip(HOSTS, results):
+        if isinstance(result, Host):
+            assert result.host == host and result.status == 'READY'
+
+class FailingStart(Stub):
+    '''A stub that begins the first assessment it is asked to start, but
+    answers the start with 503, and counts the starts asked for.'''
+
+    def __init__(self, **kwargs):
+        Stub.__init__(self, **kwargs)
+        self.starts = 0
+
+    def respond(self, endpoint, query):
+        if endpoint == 'analyze' and query.get('startNew') == 'on':
+            self.starts += 1
+            if self.starts == 1:
+                Stub.respond(self, endpoint, query)
+                return 503, {'errors': [{'message': 'Service is not available'}]}
+        return Stub.respond(self, endpoint, query)
+
+def test_failed_start_is_retried_as_poll():
+    stub = FailingStart(cooloff=0, dns=0, duration=0.2, endpoints=1, suites=2, sims=2).start()
+    try:
+        async def run():
+            retry = Retry({errors.ServiceNotAvailable: Backoff(tries=5, base=0.01, factor=1, jitter=0)})
+            async with AsyncClient(stub.url, polling=Polling(interval=0.05, dnsinterval=0.05), retry=retry) as client:
+                return await client.analyze('example.com')
+        host = asyncio.run(run())
+    finally:
+        stub.stop()
+    assert host.status == 'READY'
+    assert stub.starts == 1
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+import os
+
+import pytest
+
+from ssllabs.cache import Cache
+from ssllabs.client import Client
+from ssllabs.stub import Stub
+
+URL = 'https://api.ssllabs.com/api/v2'
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def entry(name, engineVersion='1.30.8', criteriaVersion='2009p'):
+    return {'host': name, 'status': 'READY', 'engineVersion': engineVersion, 'criteriaVersion': criteriaVersion}
+
+def files(path):
+    return sorted(name for name in os.listdir(path) if name != 'versions.json')
+
+def test_eviction_keeps_the_newest(tmpdir):
+    cache = Cache(str(tmpdir), maxsize=3)
+    for index in range(5):
+        cache.put(Cache.key(URL, 'host{}'.format(index)), entry('host{}'.format(index)))
+    assert len(cache) == 3
+    assert len(files(str(tmpdir))) == 3
+    assert cache.get(Cache.key(URL, 'host0')) is None
+    assert cache.get(Cache.key(URL, 'host1')) is None
+    assert [cache.get(Cache.key(URL, 'host{}'.format(index)))['host'] for index in range(2, 5)] == ['host2', 'host3', 'host4']
+
+def test_rewriting_an_entry_makes_it_newest(tmpdir):
+    cache = Cache(str(tmpdir), maxsize=2)
+    cache.put(Cache.key(URL, 'a'), entry('a'))
+    cache.put(Cache.key(URL, 'b'), entry('b'))
+    cache.put(Cache.key(URL, 'a'), entry('a'))
+    cache.put(Cache.key(URL, 'c'), entry('c'))
+    assert cache.get(Cache.key(URL, 'a')) is not None
+    assert cache.get(Cache.key(URL, 'b')) is None
+
+def test_index_survives_reopening(tmpdir):
+    cache = Cache(str(tmpdir), maxsize=2)
+    cache.put(Cache.key(URL, 'a'), entry('a'))
+    cache.put(Cache.key(URL, 'b'), entry('b'))
+    reopened = Cache(str(tmpdir), maxsize=2)
+    assert len(reopened) == 2
+    reopened.put(Cache.key(URL, 'c'), entry('c'))
+    assert len(files(str(tmpdir))) == 2
+
+def test_expiry_and_versions_are_lazy(tmpdir):
+    clock = Clock()
+    cache = Cache(str(tmpdir), ttl=timedelta(seconds=10), clock=clock)
+    cache.put(Cache.key(URL, 'old'), entry('old', engineVersion='1.0'))
+    cache.put(Cache.key(URL, 'new'), entry('new'))
+    cache.versions('1.30.8', '2009p')
+    # Nothing is scanned when the versions change
+    assert len(files(str(tmpdir))) == 2
+    assert cache.get(Cache.key(URL, 'old')) is None
+    assert cache.get(Cache.key(URL, 'new')) is not None
+    assert len(cache) == 1
+    clock.now += 11
+    assert cache.get(Cache.key(URL, 'new')) is None
+    assert len(cache) == 0
+    assert files(str(tmpdir)) == []
+
+def test_keys():
+    assert Cache.key(URL, 'Example.com') == Cache.key(URL, 'example.com')
+    assert Cache.key(URL, 'example.com') != Cache.key(URL, 'example.com', publish=True)
+    assert Cache.key(URL, 'example.com') != Cache.key(URL, 'example.com', ignoreMismatch=True)
+    assert Cache.key(URL, 'example.com') == Cache.key(URL + '/', 'example.com')
+    assert Cache.key(URL, 'example.com') != Cache.key('https://ssllabs.example.com/api/v2', 'example.com')
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2)
+def test_client_modes(stub, tmpdir):
+    cache = Cache(str(tmpdir))
+    client = Client(stub.url, cache=cache)
+    list(client.analyze('example.com'))
+    requests = stub.requests
+    # Served from the cache
+    list(client.analyze('example.com', mode='cache'))
+    assert stub.requests == requests
+    # Keyed by ignoreMismatch
+    list(client.analyze('example.com', mode='cache', ignoreMismatch=True))
+    assert stub.requests > requests
+    requests = stub.requests
+    # A new assessment never reads the cache
+    list(client.analyze('example.com', mode='new'))
+    assert stub.requests > requests
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0)
+def test_info_sets_both_versions(stub, tmpdir):
+    cache = Cache(str(tmpdir))
+    cache.put(Cache.key(URL, 'old'), entry('old', engineVersion='1.0'))
+    Client(stub.url, cache=cache).info()
+    assert cache.get(Cache.key(URL, 'old')) is None
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=60, endpoints=1, suites=2, sims=2)
+def test_info_is_live(stub, tmpdir):
+    client = Client(stub.url, cache=Cache(str(tmpdir)))
+    assert client.info().currentAssessments == 0
+    next(client.analyze('example.com'))
+    info = client.info()
+    assert info.currentAssessments == 1
+    assert client.currentAssessments == 1
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2)
+def test_entrypoints_are_kept_apart(stub, tmpdir):
+    other = Stub(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2).start()
+    try:
+        cache = Cache(str(tmpdir))
+        list(Client(stub.url, cache=cache).analyze('example.com'))
+        list(Client(other.url, cache=cache).analyze('example.com', mode='cache'))
+        assert other.requests > 0
+        requests = other.requests
+        Client(stub.url, cache=cache).statusCodes()
+        Client(other.url, cache=cache).statusCodes()
+        assert other.requests == requests + 1
+    finally:
+        other.stop()
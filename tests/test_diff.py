@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import copy
+import pickle
+
+import pytest
+
+from ssllabs.diff import Digest, diff
+from ssllabs.host import Host
+from ssllabs.stub import host
+
+def test_unchanged():
+    data = host(1)
+    assert diff(Host(data), Host(copy.deepcopy(data))) == []
+    assert Digest(data) == Digest(Host(data))
+    assert pickle.loads(pickle.dumps(Digest(data))) == Digest(data)
+
+def test_changed_aspects():
+    old = host(1)
+    new = copy.deepcopy(old)
+    endpoint = new['endpoints'][1]
+    endpoint['grade'] = 'F' if endpoint['grade'] != 'F' else 'A'
+    endpoint['details']['cert']['notAfter'] += 86400000
+    endpoint['details']['suites']['list'].pop()
+    changes = diff(Host(old), Host(new))
+    assert [(change.ipAddress, change.aspect) for change in changes] == [(endpoint['ipAddress'], aspect) for aspect in ('grade', 'cert', 'suites')]
+    cert = changes[1]
+    assert cert.old['fingerprint'] == cert.new['fingerprint'] is not None
+    assert Host(old).endpoints[1].details.cert.notAfter.isoformat() == cert.old['notAfter']
+    assert Host(new).endpoints[1].details.cert.notAfter.isoformat() == cert.new['notAfter']
+
+def test_cert_is_fingerprinted():
+    old = host(1)
+    new = copy.deepcopy(old)
+    certs = new['endpoints'][0]['details']['chain']['certs']
+    certs[0]['raw'] = certs[-1]['raw']
+    digest = Digest(old)
+    hashed, aspects = digest.endpoint(old['endpoints'][0]['ipAddress'])
+    assert 'BEGIN CERTIFICATE' not in repr(aspects['cert'][1])
+    change, = diff(old, new)
+    assert change.aspect == 'cert'
+    assert change.old['fingerprint'] != change.new['fingerprint']
+    assert change.old['notAfter'] == change.new['notAfter']
+
+def test_reordered_protocols_are_unchanged():
+    old = host(2)
+    new = copy.deepcopy(old)
+    new['endpoints'][0]['details']['protocols'].reverse()
+    assert diff(old, new) == []
+
+def test_endpoints_added_and_removed():
+    old = host(3)
+    new = copy.deepcopy(old)
+    removed = new['endpoints'].pop(0)['ipAddress']
+    assert [(change.aspect, change.old, change.new) for change in diff(old, new)] == [('endpoint', removed, None)]
+    assert [(change.aspect, change.old) for change in diff(None, new)] == [('endpoint', None)]
+
+def test_compacted_hosts_are_refused():
+    with pytest.raises(ValueError):
+        Digest(Host(host(4)).compact())
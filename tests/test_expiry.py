@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import datetime, timedelta
+
+from ssllabs.expiry import Expiry, ExpiryIndex
+
+NOW = datetime(2020, 1, 1)
+
+def certs(name, *days):
+    return [Expiry(NOW + timedelta(days=day), name, '10.0.0.1', 'CN={}'.format(index), index or None) for index, day in enumerate(days)]
+
+def index():
+    index = ExpiryIndex()
+    index.put('expired', certs('expired', -3, 100))
+    index.put('soon', certs('soon', 5, 200))
+    index.put('later', certs('later', 20, 300))
+    index.put('fine', certs('fine', 90))
+    return index
+
+def test_rescans_are_handed_out_once():
+    expiries = index()
+    assert expiries.rescans(timedelta(days=7), NOW) == ['expired', 'soon']
+    assert expiries.rescans(timedelta(days=7), NOW) == []
+    assert expiries.rescans(timedelta(days=7), NOW) == []
+    # Time passing brings in only the hosts that have come due since
+    assert expiries.rescans(timedelta(days=7), NOW + timedelta(days=14)) == ['later']
+    assert expiries.rescans(timedelta(days=7), NOW + timedelta(days=14)) == []
+    # The certificates are still held
+    assert len(expiries) == 7
+    assert expiries.get('soon') == certs('soon', 5, 200)
+
+def test_new_result_is_due_again():
+    expiries = index()
+    expiries.rescans(timedelta(days=7), NOW)
+    # The rescan found the certificate renewed
+    expiries.put('soon', certs('soon', 400))
+    assert expiries.rescans(timedelta(days=7), NOW) == []
+    # A rescan that failed puts the host back as it was
+    expiries.put('expired', expiries.get('expired'))
+    assert expiries.rescans(timedelta(days=7), NOW) == ['expired']
+
+def test_within_is_handed_out_once():
+    expiries = index()
+    first = expiries.within(timedelta(days=30), NOW)
+    assert [(expiry.host, expiry.notAfter) for expiry in first] == [('expired', NOW - timedelta(days=3)), ('soon', NOW + timedelta(days=5)), ('later', NOW + timedelta(days=20))]
+    assert expiries.within(timedelta(days=30), NOW) == []
+    assert [expiry.host for expiry in expiries.within(timedelta(days=100), NOW)] == ['fine', 'expired']
+
+def test_next_and_due_leave_the_index_as_is():
+    expiries = index()
+    assert [expiry.host for expiry in expiries.next(2)] == ['expired', 'soon']
+    assert [expiry.host for expiry in expiries.next(2)] == ['expired', 'soon']
+    assert expiries.due(timedelta(days=7)) == NOW - timedelta(days=10)
+    expiries.rescans(timedelta(days=7), NOW)
+    assert expiries.due(timedelta(days=7)) == NOW + timedelta(days=13)
+
+def test_removed_hosts_are_dropped():
+    expiries = index()
+    expiries.remove('expired')
+    assert expiries.rescans(timedelta(days=7), NOW) == ['soon']
+    assert 'expired' not in expiries
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import copy
+
+import pytest
+
+from ssllabs.chain import Issues
+from ssllabs.policy import Policy
+from ssllabs.stub import host
+
+def test_flag_bits_match_properties():
+    for name, bit in Issues.bits.items():
+        assert getattr(Issues(bit), name)
+        assert not any(getattr(Issues(bit), other) for other in Issues.bits if other != name)
+
+def test_chain_issues():
+    data = host(1, endpoints=2)
+    for endpoint in data['endpoints']:
+        endpoint['grade'] = 'A'
+        endpoint['details']['chain']['issues'] = 0
+    policy = Policy(grade='A', chainIssues=['incompletechain', 'wrongorder'])
+    assert policy.check(data, now=0).passed
+
+    data = copy.deepcopy(data)
+    data['endpoints'][1]['details']['chain']['issues'] = Issues.bits['wrongorder'] | Issues.bits['unrelated'] | Issues.bits['incompletechain']
+    verdict = policy.check(data, now=0)
+    assert [(failure.rule, failure.reason) for failure in verdict.failures] == [('chainIssues', 'chain issues: incompletechain, wrongorder')]
+
+def test_unknown_chain_issue():
+    with pytest.raises(ValueError):
+        Policy(chainIssues=['certs'])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import pytest
+
+from ssllabs.host import Host
+from ssllabs.pool import ParsePool
+from ssllabs.stub import host
+
+FIELDS = ('ipAddress', 'grade', 'details.cert.notAfter', 'details.protocols')
+
+def bodies(count=6):
+    return [json.dumps(host(index, endpoints=2, suites=3, sims=3)).encode('utf-8') for index in range(count)]
+
+def summary(result):
+    '''The fields every test builds, of a host'''
+    return [(endpoint.ipAddress, endpoint.grade, endpoint.details.cert.notAfter, [protocol.version for protocol in endpoint.details.protocols]) for endpoint in result.endpoints]
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(3)
+    yield executor
+    executor.shutdown()
+
+def test_map(executor):
+    with ParsePool(executor=executor) as pool:
+        results = list(pool.map(bodies()))
+    expected = [Host(json.loads(body.decode('utf-8'))) for body in bodies()]
+    assert [result.host for result in results] == [result.host for result in expected]
+    assert [summary(result) for result in results] == [summary(result) for result in expected]
+    # Whole hosts, with their raw data
+    assert results[0].rawdata == expected[0].rawdata
+    assert results[0].endpoints[0].details.sims.results[0].client.name == expected[0].endpoints[0].details.sims.results[0].client.name
+
+def test_map_fields(executor):
+    with ParsePool(executor=executor, fields=FIELDS) as pool:
+        results = list(pool.map(bodies()))
+    assert [summary(result) for result in results] == [summary(Host(json.loads(body.decode('utf-8')))) for body in bodies()]
+    with pytest.raises(AttributeError):
+        results[0].endpoints[0].details.sims
+
+def test_map_compact(executor):
+    with ParsePool(executor=executor, fields=FIELDS, compact=True) as pool:
+        results = list(pool.map(bodies()))
+    assert [summary(result) for result in results] == [summary(Host(json.loads(body.decode('utf-8')))) for body in bodies()]
+    assert all(result.rawdata is None for result in results)
+
+def test_in_progress_built_whole(executor):
+    data = {'host': 'example.com', 'status': 'IN_PROGRESS', 'endpoints': [{'ipAddress': '10.0.0.1', 'statusMessage': 'In progress', 'progress': 40}]}
+    with ParsePool(executor=executor, fields=FIELDS, compact=True) as pool:
+        result = pool.parse(json.dumps(data).encode('utf-8'))
+    assert result.status == 'IN_PROGRESS'
+    assert result.endpoints[0].progress == 40
+
+def test_processes():
+    # The workers send back raw data, or compacted hosts, by pickling
+    for compact in (False, True):
+        with ParsePool(processes=1, fields=FIELDS, compact=compact) as pool:
+            results = list(pool.map(bodies(2)))
+        assert [summary(result) for result in results] == [summary(Host(json.loads(body.decode('utf-8')))) for body in bodies(2)]
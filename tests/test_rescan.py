@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ssllabs import errors
+from ssllabs.client import Client
+from ssllabs.host import Host
+from ssllabs.polling import Polling
+from ssllabs.rescan import Rescanner, Staleness, _Queue
+from ssllabs.stub import Stub
+
+HOSTS = ['host{}.example.com'.format(index) for index in range(15)]
+
+NOW = 1500000000.0
+
+DAY = 86400
+
+class Clock(object):
+    '''A clock that only moves when slept on.'''
+
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def result(grades=('A',), notAfter=None, status='READY', tested=NOW, cacheExpiryTime=None):
+    '''A finished host, tested at tested, with an endpoint of each grade,
+    each presenting a certificate expiring at notAfter, in seconds.'''
+    data = {'host': 'example.com', 'status': status, 'testTime': int(tested * 1000), 'endpoints': []}
+    if cacheExpiryTime is not None:
+        data['cacheExpiryTime'] = int(cacheExpiryTime * 1000)
+    for index, grade in enumerate(grades):
+        endpoint = {'ipAddress': '10.0.0.{}'.format(index), 'grade': grade}
+        if notAfter is not None:
+            endpoint['details'] = {'cert': {'subject': 'CN=example.com', 'notAfter': int(notAfter * 1000)}}
+        data['endpoints'].append(endpoint)
+    return Host(data)
+
+@pytest.fixture
+def staleness():
+    return Staleness(maxAge=timedelta(days=7), failing=timedelta(days=1), grade='A-', expiry=timedelta(days=14), error=timedelta(hours=2))
+
+def test_error_due_at_cache_expiry(staleness):
+    assert staleness.due(result((), status='ERROR', cacheExpiryTime=NOW + 600), NOW) == NOW + 600
+    # Never due in the past
+    assert staleness.due(result((), status='ERROR', cacheExpiryTime=NOW - 600), NOW) == NOW
+
+def test_error_due_after_error_time(staleness):
+    assert staleness.due(result((), status='ERROR'), NOW) == NOW + 7200
+    assert staleness.due(errors.ServiceNotAvailable('down'), NOW) == NOW + 7200
+
+def test_failing_grade_due_sooner(staleness):
+    assert staleness.due(result(('A',)), NOW + 60) == NOW + 7 * DAY
+    assert staleness.due(result(('A-',)), NOW + 60) == NOW + 7 * DAY
+    # The worst endpoint decides
+    assert staleness.due(result(('A', 'B')), NOW + 60) == NOW + DAY
+
+def test_expiring_certificate_due_sooner(staleness):
+    # Due as the certificate comes within the window
+    assert staleness.due(result(notAfter=NOW + 20 * DAY), NOW) == NOW + 6 * DAY
+    # Already within it when tested, due once it has expired, to find
+    # whether it was renewed
+    assert staleness.due(result(notAfter=NOW + 3 * DAY), NOW) == NOW + 3 * DAY
+    # Far off, the grade decides
+    assert staleness.due(result(notAfter=NOW + 90 * DAY), NOW) == NOW + 7 * DAY
+
+def test_expired_certificate_does_not_hurry(staleness):
+    # Expired before the test, so another one right away wouldn't tell
+    # anything new
+    assert staleness.due(result(notAfter=NOW - DAY), NOW) == NOW + 7 * DAY
+    assert staleness.due(result(('F',), notAfter=NOW - DAY), NOW) == NOW + DAY
+
+def test_queue_order_and_moves():
+    clock = Clock()
+    queue = _Queue(clock)
+    queue.push('a', NOW)
+    queue.push('b', NOW + 5)
+    queue.push('c', NOW + 10)
+    # Moving a host leaves its old item behind, to be skipped
+    queue.push('a', NOW + 20)
+    assert len(queue) == 3
+    assert queue.next() == NOW + 5
+    assert not queue
+    clock.sleep(5)
+    assert queue
+    assert queue.popleft() == 'b'
+    assert queue.due('b') == NOW + 5
+    assert 'b' in queue and len(queue) == 2
+
+def test_queue_move_while_taken():
+    clock = Clock()
+    queue = _Queue(clock)
+    queue.push('a', NOW)
+    assert queue.popleft() == 'a'
+    assert queue.taken == {'a': NOW}
+    # Moved by hand while its assessment runs, so that the rescanner
+    # doesn't put it back by its result
+    queue.push('a', NOW + 100)
+    assert 'a' not in queue.taken
+    assert queue.due('a') == NOW + 100
+    assert not queue
+    clock.sleep(100)
+    assert queue.popleft() == 'a'
+
+def test_queue_remove_while_taken():
+    clock = Clock()
+    queue = _Queue(clock)
+    queue.push('a', NOW)
+    queue.push('b', NOW)
+    assert queue.popleft() == 'a'
+    queue.remove('a')
+    assert 'a' not in queue
+    assert queue.due('a') is None
+    assert queue.popleft() == 'b'
+    assert not queue and queue.next() is None
+    # Handing a refused start back puts it where it was
+    queue.appendleft('b')
+    assert queue.due('b') == NOW
+
+def test_throughput():
+    # The stub and the rescanner share a clock that moves only as the
+    # rescanner sleeps, so that the timing doesn't depend on the machine
+    clock = Clock()
+    stub = Stub(maxAssessments=5, cooloff=0.05, dns=0, duration=1.0, endpoints=1, suites=2, sims=2, clock=clock).start()
+    try:
+        rescanner = Rescanner(Client(stub.url), polling=Polling(interval=0.1, dnsinterval=0.1), sleep=clock.sleep, clock=clock)
+        for name in HOSTS:
+            rescanner.add(name)
+        results = {}
+        for name, result in rescanner.run():
+            results[name] = result
+            if len(results) == len(HOSTS):
+                rescanner.stop()
+    finally:
+        stub.stop()
+    assert sorted(results) == sorted(HOSTS)
+    assert all(not isinstance(result, Exception) and result.status == 'READY' for result in results.values())
+    # Three rounds of five, a second each, with nothing held up by refused
+    # starts
+    assert clock.now - NOW < 5
+    # Every host is back in the queue, due again much later
+    assert len(rescanner) == len(HOSTS)
+    assert all(rescanner.due(name) > clock.now + 3600 for name in HOSTS)
+
+def test_library_does_not_import_the_program():
+    # A fresh interpreter, as the program may have been imported by others
+    code = "import sys, ssllabs.rescan; print('ssllabs.__main__' in sys.modules, 'tqdm' in sys.modules)"
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.split() == [b'False', b'False']
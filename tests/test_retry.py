@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import pytest
+
+from ssllabs import errors
+from ssllabs.client import Client
+from ssllabs.polling import Polling
+from ssllabs.retry import Backoff, Retry, Wait
+from ssllabs.scheduler import Scheduler
+from ssllabs.transport import SessionTransport
+
+def test_backoff_limits():
+    backoff = Backoff(tries=4, base=5, factor=2, cap=30, jitter=0)
+    assert [backoff.delay(attempt) for attempt in range(5)] == [5, 10, 20, 30, None]
+
+def test_backoff_jitter():
+    backoff = Backoff(tries=3, base=10, factor=1, cap=10, jitter=0.5)
+    assert backoff.delay(0, random=lambda: 0) == 10
+    assert backoff.delay(0, random=lambda: 1) == 5
+
+def test_retry_only_known_errors():
+    retry = Retry({errors.ServerError: Backoff(tries=2, base=1, jitter=0)})
+    # Subclasses take the backoff of their base class
+    assert retry.backoff(errors.ServiceNotAvailable('down'), 0) == 1
+    assert retry.backoff(errors.ServiceOverloaded('busy'), 1) == 2
+    assert retry.backoff(errors.ServiceOverloaded('busy'), 2) is None
+    assert retry.backoff(errors.RequestRate('slow down'), 0) is None
+    assert retry.backoff(ValueError(), 0) is None
+    assert retry.retries == 2
+    assert retry.counts == {errors.ServerError: 2}
+
+def quick(*classes):
+    return Retry({cls: Backoff(tries=20, base=0.01, factor=1, jitter=0) for cls in classes})
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0.2, endpoints=1, suites=2, sims=2)
+def test_unretried_errors_are_raised(stub):
+    retry = quick(errors.ServiceNotAvailable)
+    client = Client(stub.url, retry=retry)
+    with pytest.raises(errors.InvocationError):
+        list(client.analyze(''))
+    assert retry.retries == 0
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0.2, endpoints=1, suites=2, sims=2, unavailable=0.3, seed=2)
+def test_deferred_waits_are_yielded(stub):
+    retry = quick(errors.ServiceNotAvailable)
+    client = Client(stub.url, retry=retry)
+    waits = []
+    for data in client.analyze('example.com', polling=Polling(interval=0.05, dnsinterval=0.05), defer=True):
+        if isinstance(data, Wait):
+            assert isinstance(data.error, errors.ServiceNotAvailable)
+            waits.append(data.seconds)
+    assert client.host.status == 'READY'
+    assert waits and len(waits) == retry.retries
+
+@pytest.mark.stubargs(maxAssessments=10, cooloff=0.01, dns=0, duration=0.3, endpoints=1, suites=2, sims=2, unavailable=0.2, seed=0)
+def test_scheduler_keeps_the_retry_waits(stub):
+    retry = Retry({errors.ServiceNotAvailable: Backoff(tries=20, base=0.5, factor=1, jitter=0)})
+    hosts = ['host{}.example.com'.format(index) for index in range(6)]
+    results = dict(Scheduler(Client(stub.url, retry=retry), polling=Polling(interval=0.05, dnsinterval=0.05)).run(hosts))
+    assert sorted(results) == hosts
+    assert all(not isinstance(result, Exception) and result.status == 'READY' for result in results.values())
+    assert retry.retries > 0
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0.2, endpoints=1, suites=2, sims=2)
+def test_failed_start_is_retried_as_poll(stub):
+    sent = []
+
+    class Failing(SessionTransport):
+        def get(self, url, **kwargs):
+            sent.append(url)
+            if len(sent) == 1:
+                # The start is taken, but its answer is lost
+                SessionTransport.get(self, url, **kwargs).close()
+                raise errors.ServiceNotAvailable('lost')
+            return SessionTransport.get(self, url, **kwargs)
+
+    client = Client(stub.url, retry=quick(errors.ServiceNotAvailable), transport=Failing())
+    for data in client.analyze('example.com', polling=Polling(interval=0.05, dnsinterval=0.05)):
+        pass
+    assert client.host.status == 'READY'
+    assert 'startNew=on' in sent[0]
+    assert not any('startNew' in url for url in sent[1:])
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import time
+
+import pytest
+
+from ssllabs.client import Client
+from ssllabs.polling import Polling
+from ssllabs.scheduler import Scheduler
+
+HOSTS = ['host{}.example.com'.format(index) for index in range(5)]
+
+@pytest.mark.stubargs(maxAssessments=3, cooloff=0.01, dns=0, duration=0.3, endpoints=1, suites=2, sims=2)
+def test_cooloff_does_not_stall(stub):
+    scheduler = Scheduler(Client(stub.url), polling=Polling(interval=0.05, dnsinterval=0.05))
+    begin = time.time()
+    finished = {}
+    for host, result in scheduler.run(HOSTS):
+        assert not isinstance(result, Exception), result
+        assert result.status == 'READY'
+        finished[host] = time.time() - begin
+    assert sorted(finished) == HOSTS
+    # Two rounds of 0.3s, with no wait of ratewait in between
+    assert max(finished.values()) < 3
+
+@pytest.mark.stubargs(maxAssessments=2, cooloff=0.01, dns=0, duration=0.3, endpoints=1, suites=2, sims=2)
+def test_concurrency_is_bounded(stub):
+    client = Client(stub.url)
+    scheduler = Scheduler(client, polling=Polling(interval=0.05, dnsinterval=0.05))
+    peak = 0
+    for host, result in scheduler.run(HOSTS):
+        assert not isinstance(result, Exception), result
+        peak = max(peak, client.currentAssessments)
+    assert peak <= 2
+
+@pytest.mark.stubargs(maxAssessments=10, cooloff=0.2, dns=0, duration=0.1, endpoints=1, suites=2, sims=2)
+def test_starts_are_spaced_by_cooloff(stub):
+    starts = []
+
+    class Recording(Client):
+        def analyze(self, host, **kwargs):
+            starts.append(time.time())
+            return Client.analyze(self, host, **kwargs)
+
+    scheduler = Scheduler(Recording(stub.url), polling=Polling(interval=0.05, dnsinterval=0.05), ratewait=60)
+    results = list(scheduler.run(HOSTS[:3]))
+    assert all(not isinstance(result, Exception) for host, result in results)
+    # Every start was accepted, so none was refused and tried again
+    assert len(starts) == 3
+    assert all(later - earlier >= 0.2 for earlier, later in zip(starts, starts[1:]))
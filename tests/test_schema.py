@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+'''Checks the model classes built from the schema against the hand-written
+ones they replaced.
+
+Each file in fixtures/schema holds a raw payload and the value of every
+property of the object the hand-written classes built from it, recorded
+before they were replaced, with datetimes, timedeltas and bytes tagged as
+``$datetime``, ``$timedelta`` and ``$hex``.  The properties whose values
+were fixed along with the schema are left out of the recordings, and
+checked on their own below.'''
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import datetime, timedelta
+import binascii
+import io
+import json
+import os
+
+import pytest
+
+from ssllabs.chaincert import ChainCert
+from ssllabs.endpointdetails import EndpointDetails
+from ssllabs.host import Host
+from ssllabs.info import Info
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'schema')
+
+CLASSES = {'Host': Host, 'Info': Info}
+
+def load(name):
+    with io.open(os.path.join(FIXTURES, name + '.json'), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def compare(expected, value, path):
+    '''Asserts that a value matches its recording.'''
+    if isinstance(expected, list):
+        assert isinstance(value, list) and len(expected) == len(value), path
+        for index, (item, valueitem) in enumerate(zip(expected, value)):
+            compare(item, valueitem, '{}[{}]'.format(path, index))
+    elif isinstance(expected, dict) and '$object' in expected:
+        assert type(value).__name__ == expected['$object'], path
+        for name, item in sorted(expected['properties'].items()):
+            compare(item, getattr(value, name), '{}.{}'.format(path, name))
+    elif isinstance(expected, dict) and '$datetime' in expected:
+        assert isinstance(value, datetime) and value.isoformat() == expected['$datetime'], path
+    elif isinstance(expected, dict) and '$timedelta' in expected:
+        assert isinstance(value, timedelta) and value.total_seconds() == expected['$timedelta'], path
+    elif isinstance(expected, dict) and '$hex' in expected:
+        assert isinstance(value, bytes) and binascii.hexlify(value).decode('ascii') == expected['$hex'], path
+    else:
+        assert expected == value, path
+
+@pytest.mark.parametrize('name', ['host0', 'host1', 'error', 'empty-details', 'info'])
+def test_matches_recording(name):
+    fixture = load(name)
+    compare(fixture['expected'], CLASSES[fixture['class']](fixture['raw']), fixture['class'])
+
+def test_compacted_host_matches_recording():
+    fixture = load('compact')
+    compare(fixture['expected'], Host(fixture['raw']).compact(), 'Host')
+
+def test_chaincert_key_size_and_strength():
+    # Both used to return keyAlg
+    cert = ChainCert({'keyAlg': 'RSA', 'keySize': 2048, 'keyStrength': 2048})
+    assert cert.keyAlg == 'RSA'
+    assert cert.keySize == 2048
+    assert cert.keyStrength == 2048
+
+def test_missing_npn_protocols():
+    # A missing list used to be split into ['']
+    assert EndpointDetails({}).npnProtocols == []
+    assert EndpointDetails({'npnProtocols': 'h2 http/1.1'}).npnProtocols == ['h2', 'http/1.1']
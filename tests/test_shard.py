@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+
+import pytest
+
+from ssllabs import errors
+from ssllabs.shard import ShardedClient
+from ssllabs.stub import Stub
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def stubs(request):
+    '''Builds running stubs of finished-at-once assessments, stopping them
+    after the test.'''
+    started = []
+
+    def build(**kwargs):
+        arguments = dict(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2)
+        arguments.update(kwargs)
+        stub = Stub(**arguments).start()
+        started.append(stub)
+        return stub
+
+    yield build
+    for stub in started:
+        stub.stop()
+
+def analyze(client, host, **kwargs):
+    list(client.analyze(host, **kwargs))
+    return client.host
+
+def test_failover(stubs):
+    down = stubs(unavailable=1.0)
+    up = stubs()
+    client = ShardedClient([down.url, up.url])
+    assert analyze(client, 'example.com').status == 'READY'
+    assert down.requests == 1
+    assert up.requests == 1
+    assert not client.available(0)
+    assert client.available(1)
+
+def test_every_shard_down(stubs):
+    client = ShardedClient([stubs(unavailable=1.0).url, stubs(unavailable=1.0).url])
+    with pytest.raises(errors.ServiceNotAvailable):
+        analyze(client, 'example.com')
+    with pytest.raises(errors.ServiceNotAvailable):
+        client.info()
+
+def test_downtime(stubs):
+    down = stubs(unavailable=1.0)
+    up = stubs()
+    clock = Clock()
+    client = ShardedClient([down.url, up.url], downtime=60, clock=clock)
+    analyze(client, 'a.example.com')
+    # Left out while down
+    analyze(client, 'b.example.com')
+    assert down.requests == 1
+    clock.now += 60
+    assert client.available(0)
+    # Tried again once the downtime is over, and failed over
+    assert analyze(client, 'c.example.com').status == 'READY'
+    assert down.requests == 2
+    assert up.requests == 3
+
+def test_affinity(stubs):
+    small = stubs(maxAssessments=1)
+    large = stubs(maxAssessments=10)
+    client = ShardedClient([small.url, large.url])
+    # Nothing is known of either, so the first is used
+    analyze(client, 'a.example.com')
+    assert small.requests == 1
+    client.info()
+    # The second has more room
+    analyze(client, 'b.example.com')
+    assert (small.requests, large.requests) == (2, 2)
+    # Following the earlier assessment of a, where it was run
+    analyze(client, 'a.example.com', mode='cache')
+    assert (small.requests, large.requests) == (3, 2)
+    # A new assessment goes where there is room
+    analyze(client, 'a.example.com', mode='new')
+    assert (small.requests, large.requests) == (3, 3)
+
+def test_affinity_is_bounded(stubs):
+    small = stubs(maxAssessments=1)
+    large = stubs(maxAssessments=10)
+    client = ShardedClient([small.url, large.url], remember=1)
+    analyze(client, 'a.example.com')
+    client.info()
+    analyze(client, 'b.example.com')
+    # a was forgotten, so it goes where there is room
+    analyze(client, 'a.example.com', mode='cache')
+    assert (small.requests, large.requests) == (2, 3)
+
+def test_info(stubs):
+    first = stubs(maxAssessments=3, cooloff=1.0)
+    second = stubs(maxAssessments=5, cooloff=2.0)
+    down = stubs(unavailable=1.0)
+    client = ShardedClient([first.url, second.url, down.url])
+    info = client.info()
+    assert info.maxAssessments == 8
+    assert info.currentAssessments == 0
+    # The shortest cool-off, spread over the shards that answered
+    assert info.newAssessmentCoolOff == timedelta(seconds=0.5)
+    assert len(info.messages) == 2
+    assert not client.available(2)
+    assert client.maxAssessments == 8
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+from datetime import timedelta
+import math
+import os
+
+import pytest
+
+from ssllabs.host import Host
+from ssllabs.store import COLUMNS, Store
+from ssllabs.stub import host
+
+def hosts(count):
+    found = [Host(host(index, endpoints=2, suites=2, sims=2)) for index in range(count)]
+    # A host without details, so that every kind of column has missing values
+    found.append(Host({'host': 'bare.example.com', 'endpoints': [{'ipAddress': '10.9.9.9', 'statusMessage': 'Unable to connect to the server'}]}))
+    return found
+
+def rows(store):
+    return [store.row(index) for index in range(len(store))]
+
+def same(first, second):
+    '''Compares rows, as NaN never equals itself.'''
+    assert len(first) == len(second)
+    for a, b in zip(first, second):
+        assert a == b
+
+def test_rows():
+    store = Store(hosts(3))
+    assert len(store) == 7
+    row = store.row(6)
+    assert row['host'] == 'bare.example.com'
+    assert row['grade'] is None and row['notAfter'] is None and row['keySize'] is None
+    data = host(0, endpoints=2, suites=2, sims=2)
+    row = store.row(0)
+    assert row['ipAddress'] == data['endpoints'][0]['ipAddress']
+    assert row['grade'] == data['endpoints'][0]['grade']
+    assert row['keySize'] == 2048
+    assert store.supports('TLS 1.2') == list(range(6))
+    assert store.where('host', lambda value: value == 'host1.example.com') == [2, 3]
+
+def test_round_trip(tmpdir):
+    store = Store(hosts(5))
+    path = os.path.join(str(tmpdir), 'hosts.store')
+    store.save(path)
+
+    loaded = Store.load(path)
+    assert len(loaded) == len(store)
+    same(rows(loaded), rows(store))
+    for name, kind in COLUMNS:
+        assert loaded.column(name) == store.column(name), name
+    now = store.row(0)['testTime']
+    assert loaded.expiring(timedelta(days=400), now=now) == store.expiring(timedelta(days=400), now=now)
+    assert loaded.gradebelow('A') == store.gradebelow('A')
+    assert loaded.vulnerable('vulnBeast') == store.vulnerable('vulnBeast')
+    # Missing times are read back as NaN
+    assert loaded.where('notAfter', math.isnan) == [len(store) - 1]
+
+def test_append_after_load(tmpdir):
+    path = os.path.join(str(tmpdir), 'hosts.store')
+    Store(hosts(2)).save(path)
+    loaded = Store.load(path)
+    # The mapped columns are copied in before anything is added
+    loaded.append(Host(host(10, endpoints=1, suites=2, sims=2)))
+    expected = Store(hosts(2))
+    expected.append(Host(host(10, endpoints=1, suites=2, sims=2)))
+    same(rows(loaded), rows(expected))
+
+    # Saving over the file it was mapped from
+    loaded.save(path)
+    same(rows(Store.load(path)), rows(expected))
+
+def test_empty_round_trip(tmpdir):
+    path = os.path.join(str(tmpdir), 'empty.store')
+    Store().save(path)
+    loaded = Store.load(path)
+    assert len(loaded) == 0
+    assert loaded.column('grade') == []
+
+def test_load_rejects_other_files(tmpdir):
+    path = os.path.join(str(tmpdir), 'other')
+    with open(path, 'wb') as file:
+        file.write(b'not a store at all, but long enough')
+    with pytest.raises(ValueError):
+        Store.load(path)
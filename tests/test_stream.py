@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import json
+
+import pytest
+
+from ssllabs import stream
+from ssllabs.client import Client
+from ssllabs.schema import projection
+from ssllabs.stub import host
+
+KEEP = ['ipAddress', 'grade', 'details.cert.notAfter', 'details.chain.certs.subject', 'details.protocols', 'details.hstsPolicy.status']
+
+def project(value, node):
+    '''The parts of a decoded value along a projection tree, as the stream
+    should decode them.'''
+    if node is True:
+        return value
+    if isinstance(value, list):
+        return [project(item, node) for item in value]
+    if isinstance(value, dict):
+        return {key: project(item, node[key]) for key, item in value.items() if key in node}
+    return value
+
+def drop(value, path):
+    '''A copy of the decoded endpoints with a dotted path left out.'''
+    if isinstance(value, list):
+        return [drop(item, path) for item in value]
+    if not isinstance(value, dict):
+        return value
+    key, _, rest = path.partition('.')
+    if key not in value:
+        return value
+    value = dict(value)
+    if rest:
+        value[key] = drop(value[key], rest)
+    else:
+        del value[key]
+    return value
+
+@pytest.fixture(params=[1, 7, 4096, None])
+def chunks(request):
+    '''Splits a body into chunks of one size, or gives it whole.'''
+    size = request.param
+    def split(body):
+        if size is None:
+            return [body]
+        return [body[pos:pos + size] for pos in range(0, len(body), size)]
+    return split
+
+def body(index=3):
+    return json.dumps(host(index, endpoints=3, suites=4, sims=4)).encode('utf-8')
+
+def decode(chunks, skip=(), fields=None):
+    decoder = stream.Stream(chunks, skip, fields)
+    endpoints = list(decoder)
+    assert decoder.data['endpoints'] == endpoints
+    return decoder.data
+
+def test_whole_matches_json(chunks):
+    assert decode(chunks(body())) == json.loads(body().decode('utf-8'))
+
+def test_keep_matches_projected_json(chunks):
+    expected = json.loads(body().decode('utf-8'))
+    expected['endpoints'] = project(expected['endpoints'], projection(KEEP))
+    assert decode(chunks(body()), fields=KEEP) == expected
+
+def test_skip_matches_json_without(chunks):
+    skip = ['details.sims', 'details.chain.certs.raw']
+    expected = json.loads(body().decode('utf-8'))
+    for path in skip:
+        expected['endpoints'] = drop(expected['endpoints'], path)
+    assert decode(chunks(body()), skip=skip) == expected
+    assert stream.loads(body(), skip) == expected
+
+def test_multibyte_text_across_chunks():
+    data = host(1, endpoints=1, suites=1, sims=1)
+    data['endpoints'][0]['serverName'] = 'exämple-☃.example'
+    encoded = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    assert decode([encoded[pos:pos + 1] for pos in range(len(encoded))]) == data
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0, endpoints=2, suites=4, sims=4)
+def test_client_projection_is_the_same_streamed_or_not(stub):
+    fields = ['ipAddress', 'grade', 'details.cert.notAfter']
+    results = []
+    for streamed in (False, True):
+        client = Client(stub.url)
+        list(client.analyze('example.com', mode='cache', fields=fields, stream=streamed))
+        results.append([(endpoint.ipAddress, endpoint.grade, endpoint.details.cert.notAfter) for endpoint in client.host.endpoints])
+    assert results[0] == results[1]
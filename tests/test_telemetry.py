@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright © 2016 Taylor C. Richberger <taywee@gmx.com>
+# This code is released under the license described in the LICENSE file
+
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import pytest
+
+from ssllabs import errors
+from ssllabs.cache import Cache
+from ssllabs.client import Client
+from ssllabs.polling import Polling
+from ssllabs.retry import Backoff, Retry
+from ssllabs.stub import Stub
+from ssllabs.telemetry import Hooks
+
+POLLING = Polling(interval=0.05, dnsinterval=0.05)
+
+class Recording(Hooks):
+    '''Hooks keeping every event they are told about.'''
+
+    def __init__(self):
+        self.requests = []
+        self.analyses = []
+
+    def request(self, endpoint, start, status, latency, size, retries, decode, error):
+        self.requests.append(dict(endpoint=endpoint, start=start, status=status, latency=latency, size=size, retries=retries, decode=decode, error=error))
+
+    def analyze(self, host, start, end, polls, phases, status, error):
+        self.analyses.append(dict(host=host, start=start, end=end, polls=polls, phases=phases, status=status, error=error))
+
+class Failing(Stub):
+    '''A stub answering the requests numbered in failures with 503.'''
+
+    def __init__(self, failures, **kwargs):
+        Stub.__init__(self, **kwargs)
+        self.__failures = set(failures)
+        self.__count = 0
+
+    def respond(self, endpoint, query):
+        self.__count += 1
+        if self.__count in self.__failures:
+            return 503, {'errors': [{'message': 'Service is not available'}]}
+        return Stub.respond(self, endpoint, query)
+
+@pytest.fixture
+def failing():
+    stubs = []
+
+    def build(failures, **kwargs):
+        stub = Failing(failures, cooloff=0, dns=0.1, duration=0.3, endpoints=1, suites=2, sims=2, **kwargs).start()
+        stubs.append(stub)
+        return stub
+
+    yield build
+    for stub in stubs:
+        stub.stop()
+
+@pytest.mark.stubargs(cooloff=0, dns=0.1, duration=0.3, endpoints=1, suites=2, sims=2)
+def test_analyze_events(stub):
+    hooks = Recording()
+    client = Client(stub.url, hooks=hooks)
+    client.info()
+    list(client.analyze('example.com', polling=POLLING))
+
+    info = hooks.requests[0]
+    assert info['endpoint'] == 'info' and info['status'] == 200 and info['error'] is None
+    polls = hooks.requests[1:]
+    assert polls and all(event['endpoint'] == 'analyze' and event['status'] == 200 for event in polls)
+    assert all(event['retries'] == 0 and event['size'] > 0 and event['decode'] is not None for event in polls)
+
+    analysis, = hooks.analyses
+    assert analysis['host'] == 'example.com'
+    assert analysis['status'] == 'READY' and analysis['error'] is None
+    assert analysis['polls'] == len(polls)
+    assert [phase[0] for phase in analysis['phases']] == ['DNS', 'IN_PROGRESS']
+    assert all(seconds > 0 for status, begin, seconds in analysis['phases'])
+    assert analysis['start'] <= analysis['phases'][0][1] <= analysis['end']
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2)
+def test_streamed_events(stub):
+    hooks = Recording()
+    client = Client(stub.url, hooks=hooks)
+    list(client.analyze('example.com', stream=True))
+    event, = hooks.requests
+    assert event['endpoint'] == 'analyze' and event['status'] == 200
+    assert event['size'] > 0 and event['decode'] is not None
+
+def test_retry_events(failing):
+    # The start fails, and is retried as a poll
+    stub = failing({1})
+    hooks = Recording()
+    retry = Retry({errors.ServiceNotAvailable: Backoff(tries=3, base=0.01, factor=1, jitter=0)})
+    client = Client(stub.url, retry=retry, hooks=hooks)
+    list(client.analyze('example.com', polling=POLLING))
+    # The failed attempt is only counted in the retries of the call
+    assert hooks.requests[0]['retries'] == 1
+    assert hooks.requests[0]['status'] == 200
+    assert all(event['retries'] == 0 for event in hooks.requests[1:])
+    analysis, = hooks.analyses
+    assert analysis['status'] == 'READY' and analysis['polls'] == len(hooks.requests)
+
+def test_failure_events(failing):
+    # A poll fails after the start, and isn't retried
+    stub = failing({2})
+    hooks = Recording()
+    client = Client(stub.url, hooks=hooks)
+    with pytest.raises(errors.ServiceNotAvailable):
+        list(client.analyze('example.com', polling=POLLING))
+    start, failed = hooks.requests
+    assert start['status'] == 200 and start['error'] is None
+    assert failed['status'] == 503 and isinstance(failed['error'], errors.ServiceNotAvailable)
+    assert failed['decode'] is None
+    analysis, = hooks.analyses
+    assert isinstance(analysis['error'], errors.ServiceNotAvailable)
+    assert analysis['polls'] == 1
+    assert analysis['status'] == 'DNS'
+
+@pytest.mark.stubargs(cooloff=0, dns=0, duration=0, endpoints=1, suites=2, sims=2)
+def test_cached_events(stub, tmpdir):
+    hooks = Recording()
+    client = Client(stub.url, cache=Cache(str(tmpdir)), hooks=hooks)
+    list(client.analyze('example.com'))
+    del hooks.requests[:]
+    list(client.analyze('example.com', mode='cache'))
+    assert hooks.requests == []
+    assert hooks.analyses[-1]['polls'] == 0
+    assert hooks.analyses[-1]['status'] == 'READY'